@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Benchmark the backend hot paths on seeded synthetic data.
+
+For each scale, a fresh SQLite database is seeded by benchmarks/datagen.py
+and the endpoints are timed through the Flask test client:
+upload_team_members (xlsx), save_team_members, get_team_members,
+get_team_performance, get_dashboard (cold and warm snapshot) and the template
+download (cold and warm cache).
+
+Results are written as JSON with the git commit and environment, so runs can
+be compared across commits with --compare.
+
+Usage:
+    python benchmarks/bench_hot_paths.py [--scales 1000 10000 100000] [--repeat 3]
+                                         [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import datagen  # noqa: E402
+import excel_templates  # noqa: E402
+from app import create_app  # noqa: E402
+from endpoints.dashboard_endpoints import dashboard_snapshot  # noqa: E402
+
+RESULTS_SCHEMA_VERSION = 1
+
+
+def git_revision():
+    """Current commit and whether the tree has local changes"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=BACKEND_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=BACKEND_DIR,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def measure(name, scale, request, repeat, setup=None):
+    """Time request() `repeat` times; setup() runs untimed before each call"""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        response = request()
+        timings.append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            raise RuntimeError(f'{name} at scale {scale} returned {response.status_code}: {response.get_data(as_text=True)[:200]}')
+
+    result = {
+        'name': name,
+        'scale': scale,
+        'median_ms': round(statistics.median(timings) * 1000, 3),
+        'min_ms': round(min(timings) * 1000, 3),
+        'max_ms': round(max(timings) * 1000, 3),
+        'runs_ms': [round(t * 1000, 3) for t in timings],
+        'status': response.status_code,
+        'bytes': len(response.get_data())
+    }
+    print(f"{name:<28} {scale:>8} {result['median_ms']:>12.1f} {result['min_ms']:>10.1f} {result['bytes']:>12,}")
+    return result
+
+
+def run_scale(scale, repeat, seed, workdir):
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(workdir, f'bench_{scale}.db')}"})
+    client = app.test_client()
+    results = []
+
+    with app.app_context():
+        start = time.perf_counter()
+        team_ids = datagen.seed_database(scale, seed)
+        print(f'-- seeded scale {scale} in {time.perf_counter() - start:.1f}s')
+
+        workbook = datagen.upload_workbook('servicing', scale, seed)
+        save_payload = datagen.save_members_payload(scale, seed)
+
+    servicing = team_ids['servicing']
+    period = f'quarter={datagen.QUARTER}&year={datagen.YEAR}'
+
+    def upload():
+        return client.post(f'/api/teams/{servicing}/upload-members',
+                           data={'file': (io.BytesIO(workbook), 'members.xlsx')})
+
+    results.append(measure('upload_team_members', scale, upload, repeat))
+    results.append(measure('save_team_members', scale,
+                           lambda: client.post(f'/api/teams/{servicing}/save-members', json=save_payload), repeat))
+    results.append(measure('get_team_members', scale,
+                           lambda: client.get(f'/api/teams/{servicing}/members?{period}'), repeat))
+    results.append(measure('get_team_performance', scale,
+                           lambda: client.get(f'/api/performance/team/{servicing}?{period}'), repeat))
+    results.append(measure('get_dashboard_cold', scale,
+                           lambda: client.get('/api/dashboard'), repeat, setup=dashboard_snapshot.invalidate))
+    results.append(measure('get_dashboard_warm', scale, lambda: client.get('/api/dashboard'), repeat))
+    results.append(measure('download_template_cold', scale,
+                           lambda: client.get(f'/api/teams/{servicing}/download-template'), repeat,
+                           setup=excel_templates.clear_template_cache))
+    results.append(measure('download_template_warm', scale,
+                           lambda: client.get(f'/api/teams/{servicing}/download-template'), repeat))
+    return results
+
+
+def compare(results, baseline_path):
+    """Print median ratios against a previous results file"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(r['name'], r['scale']): r for r in baseline['results']}
+
+    print(f"\nCompared with {baseline_path} ({(baseline.get('commit') or 'unknown')[:10]})")
+    print(f"{'benchmark':<28} {'scale':>8} {'before ms':>12} {'after ms':>12} {'ratio':>8}")
+    for result in results:
+        before = previous.get((result['name'], result['scale']))
+        if before is None:
+            continue
+        ratio = result['median_ms'] / before['median_ms'] if before['median_ms'] else float('inf')
+        print(f"{result['name']:<28} {result['scale']:>8} {before['median_ms']:>12.1f} "
+              f"{result['median_ms']:>12.1f} {ratio:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write results JSON to this file')
+    parser.add_argument('--compare', help='results JSON from an earlier run to compare against')
+    args = parser.parse_args()
+
+    print(f"{'benchmark':<28} {'scale':>8} {'median ms':>12} {'min ms':>10} {'bytes':>12}")
+    print('-' * 74)
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in args.scales:
+            results.extend(run_scale(scale, args.repeat, args.seed, workdir))
+
+    commit, dirty = git_revision()
+    report = {
+        'schema_version': RESULTS_SCHEMA_VERSION,
+        'commit': commit,
+        'dirty': dirty,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'\nWrote {args.output}')
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON encoding and compression for get_team_members.
+
+Seeds an in-memory SQLite database with N fully populated team members and
+compares the stdlib JSON provider against orjson, and identity against gzip
+and brotli, reporting encode time and bytes on the wire.
+
+Usage:
+    python benchmarks/bench_responses.py [--sizes 1000 10000] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+import response_layer  # noqa: E402
+from app import create_app  # noqa: E402
+from models import Team, TeamMemberData, db  # noqa: E402
+
+app = create_app()
+
+
+def seed_members(count):
+    """Create one team with `count` members, every float field populated"""
+    db.drop_all()
+    db.create_all()
+    team = Team(name='Servicing', description='Servicing Team')
+    db.session.add(team)
+    db.session.commit()
+
+    float_fields = [
+        column.name for column in TeamMemberData.__table__.columns
+        if isinstance(column.type, db.Float)
+    ]
+    rows = []
+    for i in range(count):
+        row = {field: (i * 37 % 1000) * 1.25 for field in float_fields}
+        row.update(
+            team_id=team.id, quarter='Q4', year=2024,
+            employee_name=f'Employee {i}', employee_code=f'EMP{i:06d}',
+            category='Analyst', team_leader='Team Lead', asset_sales_manager=f'Employee {i}',
+            employee_number=f'EMP{i:06d}', main_portfolio='Portfolio A'
+        )
+        rows.append(row)
+    db.session.bulk_insert_mappings(TeamMemberData, rows)
+    db.session.commit()
+    return team.id
+
+
+def time_request(client, url, headers, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.status_code
+    return statistics.median(timings), len(response.data)
+
+
+def time_encode(payload, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        app.json.response(payload)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    providers = [('stdlib', DefaultJSONProvider(app))]
+    if response_layer.ORJSON_AVAILABLE:
+        providers.append(('orjson', response_layer.OrjsonProvider(app)))
+
+    encodings = [('identity', None), ('gzip', 'gzip')]
+    if response_layer.BROTLI_AVAILABLE:
+        encodings.append(('br', 'br'))
+
+    print(f"{'members':>8} {'json':<8} {'encoding':<9} {'encode ms':>10} {'request ms':>11} {'bytes':>11}")
+    print('-' * 62)
+
+    with app.app_context():
+        for size in args.sizes:
+            team_id = seed_members(size)
+            url = f'/api/teams/{team_id}/members?quarter=Q4&year=2024'
+            client = app.test_client()
+
+            for provider_name, provider in providers:
+                app.json = provider
+                payload = client.get(url).get_json()
+                encode_time = time_encode(payload, args.repeat)
+
+                for encoding_name, accept in encodings:
+                    headers = {'Accept-Encoding': accept} if accept else {}
+                    request_time, wire_bytes = time_request(client, url, headers, args.repeat)
+                    print(f"{size:>8} {provider_name:<8} {encoding_name:<9} "
+                          f"{encode_time * 1000:>10.1f} {request_time * 1000:>11.1f} {wire_bytes:>11,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark SQLite readers running while a large upload commits.
+
+One writer thread replaces a quarter with N TeamMemberData rows in a single
+transaction, like upload_team_members. Meanwhile reader threads keep calling GET
+/api/teams/<id>/members (a different quarter) and GET /api/teams through the
+test client. The benchmark reports how many reads finished while the write
+transaction was open, and their latency, once per journal mode:
+
+- DELETE: SQLite's default rollback journal. Readers stall whenever the
+  writer holds the database lock (cache spill, commit).
+- WAL: the storage.py default. Readers see the last committed snapshot and
+  never wait for the writer.
+
+Usage:
+    python benchmarks/bench_storage_concurrency.py [--rows 200000] [--readers 4] [--modes DELETE WAL]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import datagen  # noqa: E402
+from app import create_app  # noqa: E402
+from models import TeamMemberData, db  # noqa: E402
+
+READ_URLS = ['/api/teams', '/api/teams/{team_id}/members?quarter=Q3&year=2024']
+
+
+def run_mode(journal_mode, rows, readers, workdir):
+    path = os.path.join(workdir, f'storage_{journal_mode.lower()}.db')
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}',
+        'SQLITE_JOURNAL_MODE': journal_mode,
+        'METRICS_ENABLED': False
+    })
+
+    with app.app_context():
+        team_ids = datagen.seed_database(1000)
+        team_id = team_ids['servicing']
+        # Readers query Q3 rows the upload does not touch
+        q3_rows = datagen.team_member_rows(team_id, 500)
+        for row in q3_rows:
+            row['quarter'] = 'Q3'
+        db.session.bulk_insert_mappings(TeamMemberData, q3_rows)
+        db.session.commit()
+        upload = datagen.team_member_rows(team_id, rows, seed=7)
+
+    urls = [url.format(team_id=team_id) for url in READ_URLS]
+    writing = threading.Event()
+    done = threading.Event()
+    window = {}
+    latencies = []  # reads that started while the write transaction was open
+    failures = []
+    lock = threading.Lock()
+
+    def writer():
+        insert = TeamMemberData.__table__.insert()
+        with app.app_context():
+            window['start'] = time.perf_counter()
+            writing.set()
+            # One transaction: replace the quarter, insert in batches, commit
+            TeamMemberData.query.filter_by(team_id=team_id, quarter='Q4', year=2024).delete()
+            for offset in range(0, len(upload), 10000):
+                db.session.execute(insert, upload[offset:offset + 10000])
+            db.session.commit()
+            window['end'] = time.perf_counter()
+        done.set()
+
+    def reader(index):
+        client = app.test_client()
+        writing.wait()
+        i = index
+        while not done.is_set():
+            url = urls[i % len(urls)]
+            i += 1
+            start = time.perf_counter()
+            response = client.get(url)
+            elapsed = time.perf_counter() - start
+            with lock:
+                if response.status_code != 200:
+                    failures.append(response.status_code)
+                elif not done.is_set():
+                    latencies.append(elapsed)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    writer_thread = threading.Thread(target=writer)
+    writer_thread.start()
+    writer_thread.join()
+    for thread in threads:
+        thread.join()
+
+    with app.app_context():
+        db.engine.dispose()
+
+    latencies.sort()
+    write_seconds = window['end'] - window['start']
+    return {
+        'mode': journal_mode,
+        'write_s': write_seconds,
+        'reads': len(latencies),
+        'reads_per_s': len(latencies) / write_seconds,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+        'max_ms': latencies[-1] * 1000 if latencies else 0.0,
+        'failures': len(failures)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=200000, help='rows in the upload transaction')
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--modes', nargs='+', default=['DELETE', 'WAL'])
+    args = parser.parse_args()
+
+    print(f"{'journal':<8} {'write s':>8} {'reads':>7} {'reads/s':>9} {'p50 ms':>8} {'max ms':>9} {'failed':>7}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode in args.modes:
+            result = run_mode(mode, args.rows, args.readers, workdir)
+            print(f"{result['mode']:<8} {result['write_s']:>8.2f} {result['reads']:>7} {result['reads_per_s']:>9.1f} "
+                  f"{result['p50_ms']:>8.1f} {result['max_ms']:>9.1f} {result['failures']:>7}")
+
+
+if __name__ == '__main__':
+    main()
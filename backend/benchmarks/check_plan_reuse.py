@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Check that the prepared SQL Server queries reuse one cached plan per query.
+
+Each query in queries.py runs for two quarters, twice over: once as the
+values-spliced SQL the endpoints used to send (ad hoc batches) and once
+through PreparedQuery (sp_executesql). Afterwards the plan cache
+(sys.dm_exec_cached_plans) is read for each statement. The spliced form
+should show one plan per quarter, each used once. The prepared form should
+show one plan with a use count of 2. Its compile count from
+sys.dm_exec_query_stats (plan_generation_num) should stay at 1.
+
+Needs the real server (not the SQLite stand-in) and VIEW SERVER STATE. Use
+counts are cumulative, so on a busy server compare two runs rather than
+reading one in isolation.
+
+Usage:
+    python benchmarks/check_plan_reuse.py [--queries servicing_team legal_team]
+                                          [--quarters 2024-07-01:2024-09-30 2024-10-01:2024-12-31]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import collection_categories  # noqa: E402
+import queries  # noqa: E402
+from sql_server import SQL_SERVER_BACKEND, connect_sql_server, quarter_date_params  # noqa: E402
+
+# Plans whose text contains the statement up to its first parameter
+PLAN_CACHE_SQL = """
+SELECT cp.objtype, cp.usecounts, MAX(qs.plan_generation_num)
+FROM sys.dm_exec_cached_plans AS cp
+CROSS APPLY sys.dm_exec_sql_text(cp.plan_handle) AS st
+LEFT JOIN sys.dm_exec_query_stats AS qs ON qs.plan_handle = cp.plan_handle
+WHERE CHARINDEX(%(key)s, st.text) > 0
+  AND st.text NOT LIKE '%%dm_exec_cached_plans%%'
+GROUP BY cp.plan_handle, cp.objtype, cp.usecounts
+"""
+
+# Values for the parameters other than the quarter dates
+OTHER_PARAMS = {
+    'asset_manager': 'lezama',
+    'legal_manager': 'lezama',
+    'version': collection_categories.CLASSIFICATION_VERSION
+}
+
+
+def prepared_queries():
+    return {q.name: q for q in vars(queries).values() if isinstance(q, queries.PreparedQuery)}
+
+
+def spliced_sql(query, values):
+    """The statement with its values pasted in, as before sp_executesql"""
+    sql = query.sql
+    for param in query.params:
+        sql = sql.replace(f'@{param}', "'" + str(values[param]).replace("'", "''") + "'")
+    return sql
+
+
+def plan_key(query):
+    sql = query.sql.strip()
+    return sql[:sql.index('@')]
+
+
+def cached_plans(cursor, query):
+    cursor.execute(PLAN_CACHE_SQL, {'key': plan_key(query)})
+    return cursor.fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--queries', nargs='+', default=['servicing_team', 'legal_team'])
+    parser.add_argument('--quarters', nargs=2, default=['2024-07-01:2024-09-30', '2024-10-01:2024-12-31'])
+    args = parser.parse_args()
+
+    if SQL_SERVER_BACKEND == 'standin':
+        sys.exit('Plan reuse can only be checked against the real SQL Server, not the stand-in')
+
+    available = prepared_queries()
+    quarters = [quarter_date_params(*quarter.split(':')) for quarter in args.quarters]
+    conn = connect_sql_server()
+    try:
+        cursor = conn.cursor()
+        print(f"{'query':<32} {'objtype':<9} {'plans':>5} {'uses':>5} {'compiles':>8}")
+        for name in args.queries:
+            query = available[name]
+            for params in quarters:
+                values = {**OTHER_PARAMS, **params}
+                cursor.execute(spliced_sql(query, values))
+                cursor.fetchall()
+                query.fetchall(cursor, **values)
+
+            by_type = {}
+            for objtype, usecounts, generations in cached_plans(cursor, query):
+                by_type.setdefault(objtype, []).append((usecounts, generations or 0))
+            for objtype, plans in sorted(by_type.items()):
+                print(f"{name:<32} {objtype:<9} {len(plans):>5} {sum(u for u, _ in plans):>5} "
+                      f"{max(g for _, g in plans):>8}")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
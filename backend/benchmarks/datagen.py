@@ -0,0 +1,162 @@
+"""
+Synthetic data generator for the backend benchmarks.
+
+Everything is derived from a seed, so two runs at the same scale produce the
+same teams, employees, performance records, team member data and upload
+workbooks. That keeps benchmark results comparable across commits.
+"""
+
+import io
+import random
+
+import team_schemas
+from models import BonusCalculation, Employee, PerformanceRecord, Team, TeamMemberData, db
+
+TEAMS = [
+    ('Legal Team', 'Legal and compliance team'),
+    ('Loan Team', 'Loan processing and underwriting team'),
+    ('Servicing Team', 'Customer service and loan servicing team')
+]
+
+FIRST_NAMES = ['Ana', 'Carlos', 'Lucia', 'Javier', 'Marta', 'Pablo', 'Elena', 'Diego', 'Sara', 'Hugo',
+               'Laura', 'Mario', 'Irene', 'Raul', 'Paula', 'Alvaro', 'Nuria', 'Sergio', 'Clara', 'Ivan']
+SURNAMES = ['Garcia', 'Lopez', 'Martinez', 'Sanchez', 'Perez', 'Gomez', 'Martin', 'Jimenez', 'Ruiz',
+            'Hernandez', 'Diaz', 'Moreno', 'Alvarez', 'Romero', 'Navarro', 'Torres', 'Dominguez', 'Vazquez']
+CATEGORIES = ['Analyst', 'Associate', 'Senior Analyst', 'Manager', 'Director']
+PORTFOLIOS = [f'Portfolio {letter}' for letter in 'ABCDEFGH']
+
+# Benchmarks read and write this period
+QUARTER = 'Q4'
+YEAR = 2024
+QUARTER_MONTHS = (10, 11, 12)
+
+
+def employee_name(rng):
+    return f'{rng.choice(FIRST_NAMES)} {rng.choice(SURNAMES)}'
+
+
+def employee_code(i):
+    return f'EMP{i:07d}'
+
+
+def team_member_rows(team_id, count, seed=42):
+    """TeamMemberData mappings with every field populated"""
+    rng = random.Random(seed)
+    float_fields = [
+        column.name for column in TeamMemberData.__table__.columns
+        if isinstance(column.type, db.Float)
+    ]
+    rows = []
+    for i in range(count):
+        name = employee_name(rng)
+        row = {field: round(rng.uniform(0, 150000), 2) for field in float_fields}
+        row.update(
+            team_id=team_id, quarter=QUARTER, year=YEAR,
+            employee_name=name, employee_code=employee_code(i),
+            category=rng.choice(CATEGORIES), team_leader=employee_name(rng),
+            legal_manager=name, employee_hash=f'H{i:07d}',
+            asset_sales_manager=name, employee_number=employee_code(i),
+            main_portfolio=rng.choice(PORTFOLIOS)
+        )
+        rows.append(row)
+    return rows
+
+
+def seed_database(scale, seed=42):
+    """Populate the app database at the given scale; returns {team type: team id}
+
+    scale employees are spread over the three teams, each with one
+    PerformanceRecord per month of the benchmark quarter. Every team gets
+    scale TeamMemberData rows, and scale // 10 bonus calculations exist.
+    """
+    rng = random.Random(seed)
+    db.drop_all()
+    db.create_all()
+
+    teams = [Team(name=name, description=description) for name, description in TEAMS]
+    db.session.add_all(teams)
+    db.session.commit()
+    team_ids = {team_schemas.normalize_team_type(team.name): team.id for team in teams}
+
+    db.session.bulk_insert_mappings(Employee, [
+        {
+            'id': i + 1,
+            'name': rng.choice(FIRST_NAMES),
+            'surname': rng.choice(SURNAMES),
+            'employee_code': employee_code(i),
+            'category': rng.choice(CATEGORIES),
+            'team_id': teams[i % len(teams)].id
+        } for i in range(scale)
+    ])
+
+    performance_rows = []
+    for employee_id in range(1, scale + 1):
+        for month in QUARTER_MONTHS:
+            productivity, quality, attendance = (round(rng.uniform(55, 100), 1) for _ in range(3))
+            performance_rows.append({
+                'employee_id': employee_id, 'month': month, 'year': YEAR,
+                'productivity_score': productivity, 'quality_score': quality,
+                'attendance_score': attendance,
+                'overall_score': round((productivity + quality + attendance) / 3, 1)
+            })
+    db.session.bulk_insert_mappings(PerformanceRecord, performance_rows)
+
+    db.session.bulk_insert_mappings(BonusCalculation, [
+        {
+            'employee_id': rng.randint(1, scale), 'month': rng.choice(QUARTER_MONTHS), 'year': YEAR,
+            'quarter': QUARTER, 'base_salary': 50000.0,
+            'performance_score': round(rng.uniform(55, 100), 1),
+            'bonus_amount': round(rng.uniform(0, 15000), 2)
+        } for _ in range(max(scale // 10, 1))
+    ])
+
+    for offset, team_id in enumerate(team_ids.values()):
+        db.session.bulk_insert_mappings(TeamMemberData, team_member_rows(team_id, scale, seed + offset))
+
+    db.session.commit()
+    return team_ids
+
+
+def upload_rows(team_type, count, seed=42):
+    """Rows for an upload file, as lists in schema header order"""
+    rng = random.Random(seed)
+    schema = team_schemas.SCHEMAS[team_type]
+    rows = []
+    for i in range(count):
+        row = []
+        for column in schema.columns:
+            if column.dtype == team_schemas.FLOAT:
+                sample = column.sample or 100
+                row.append(round(sample * rng.uniform(0.5, 1.3), 2))
+            elif column.key and column.field != schema.columns[0].field:
+                row.append(employee_code(i))
+            elif column.field == 'category':
+                row.append(rng.choice(CATEGORIES))
+            elif 'portfolio' in column.field:
+                row.append(rng.choice(PORTFOLIOS))
+            else:
+                row.append(employee_name(rng))
+        rows.append(row)
+    return rows
+
+
+def upload_workbook(team_type, count, seed=42):
+    """An .xlsx upload file for a team type, as bytes"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Members')
+    sheet.append(team_schemas.SCHEMAS[team_type].headers)
+    for row in upload_rows(team_type, count, seed):
+        sheet.append(row)
+
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
+def save_members_payload(count, seed=42):
+    """JSON body for save_team_members on the Servicing team"""
+    schema = team_schemas.SCHEMAS['servicing']
+    employees = [dict(zip(schema.fields, row)) for row in upload_rows('servicing', count, seed)]
+    return {'employees': employees, 'quarter': QUARTER, 'year': YEAR}
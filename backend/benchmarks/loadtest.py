@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+HTTP load test with per-route latency percentiles.
+
+Drives a weighted mix of dashboard, team listing, members, performance,
+template download and upload requests from concurrent keep-alive clients.
+Reports throughput and p50/p95/p99 latency per route.
+
+Either target a running instance with --url, or let the harness seed a SQLite
+database (benchmarks/datagen.py) and start the app itself under one or more
+worker models, so they can be compared on the same data:
+
+    python benchmarks/loadtest.py --serve threaded gunicorn --workers 4 --concurrency 16 --duration 30
+    python benchmarks/loadtest.py --url http://localhost:5001 --concurrency 8 --output load.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+PERIOD = 'quarter=Q4&year=2024'
+UPLOAD_ROWS = 200
+
+
+class Route:
+    """One kind of request in the workload mix"""
+
+    def __init__(self, name, method, path, weight, body=None, content_type=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.weight = weight
+        self.body = body
+        self.content_type = content_type
+
+
+def multipart_file(field, filename, payload):
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        'Content-Type: application/vnd.openxmlformats-officedocument.spreadsheetml.sheet\r\n\r\n'
+    ).encode() + payload + f'\r\n--{boundary}--\r\n'.encode()
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+def build_workload(team_ids, upload_weight=2):
+    """Weighted route mix; team ids as returned by datagen.seed_database"""
+    import datagen
+
+    servicing, legal = team_ids['servicing'], team_ids['legal']
+    routes = [
+        Route('dashboard', 'GET', '/api/dashboard', 30),
+        Route('teams', 'GET', '/api/teams', 20),
+        Route('team_members', 'GET', f'/api/teams/{servicing}/members?{PERIOD}', 15),
+        Route('team_performance', 'GET', f'/api/performance/team/{servicing}?{PERIOD}', 15),
+        Route('template', 'GET', f'/api/teams/{servicing}/download-template', 10)
+    ]
+    if upload_weight:
+        body, content_type = multipart_file('file', 'members.xlsx', datagen.upload_workbook('legal', UPLOAD_ROWS))
+        routes.append(Route('upload_members', 'POST', f'/api/teams/{legal}/upload-members',
+                            upload_weight, body, content_type))
+    return routes
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def run_load(base_url, routes, concurrency, duration, warmup, accept_encoding, seed):
+    """Run the mix for `duration` seconds; returns per-route samples"""
+    target = urlsplit(base_url)
+    weights = [route.weight for route in routes]
+    samples = {route.name: [] for route in routes}  # name -> [(latency, status)]
+    errors = {route.name: 0 for route in routes}
+    lock = threading.Lock()
+    start_at = time.monotonic() + warmup
+    stop_at = start_at + duration
+
+    def client(worker_id):
+        rng = random.Random(seed + worker_id)
+        conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=120)
+        local = {route.name: [] for route in routes}
+        local_errors = {route.name: 0 for route in routes}
+        while True:
+            now = time.monotonic()
+            if now >= stop_at:
+                break
+            route = rng.choices(routes, weights)[0]
+            headers = {'Accept-Encoding': accept_encoding} if accept_encoding else {}
+            if route.content_type:
+                headers['Content-Type'] = route.content_type
+            begin = time.perf_counter()
+            try:
+                conn.request(route.method, route.path, body=route.body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=120)
+                status = None
+            elapsed = time.perf_counter() - begin
+            if now < start_at:
+                continue  # Warm-up requests are not recorded
+            if status is None or status >= 500:
+                local_errors[route.name] += 1
+            local[route.name].append((elapsed, status))
+        conn.close()
+        with lock:
+            for name, values in local.items():
+                samples[name].extend(values)
+                errors[name] += local_errors[name]
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, errors
+
+
+def summarise(samples, errors, duration):
+    """Throughput and latency percentiles per route and overall"""
+    summary = []
+    all_latencies = []
+    for name, values in samples.items():
+        latencies = sorted(latency for latency, _ in values)
+        all_latencies.extend(latencies)
+        summary.append(route_summary(name, latencies, errors[name], duration))
+    summary.append(route_summary('ALL', sorted(all_latencies), sum(errors.values()), duration))
+    return summary
+
+
+def route_summary(name, latencies, error_count, duration):
+    return {
+        'route': name,
+        'requests': len(latencies),
+        'errors': error_count,
+        'rps': round(len(latencies) / duration, 2),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'max_ms': round((latencies[-1] if latencies else 0) * 1000, 2)
+    }
+
+
+def print_summary(label, summary):
+    print(f'\n== {label}')
+    print(f"{'route':<18} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for row in summary:
+        print(f"{row['route']:<18} {row['requests']:>9} {row['errors']:>7} {row['rps']:>8.1f} "
+              f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}")
+
+
+def server_command(server, host, port, workers):
+    """Command line that serves the app under a worker model"""
+    if server == 'threaded':
+        return [sys.executable, '-c',
+                f"from app import create_app; create_app().run(host='{host}', port={port}, threaded=True)"]
+    if server == 'gunicorn':
+        gunicorn = shutil.which('gunicorn')
+        if gunicorn is None:
+            raise SystemExit('gunicorn is not installed (pip install gunicorn)')
+        # The production configuration, with worker count and bind overridden
+        return [gunicorn, '--config', 'gunicorn.conf.py', '--workers', str(workers), '--bind', f'{host}:{port}',
+                '--log-level', 'warning', 'wsgi:app']
+    raise SystemExit(f'Unknown server model: {server}')
+
+
+def wait_until_ready(base_url, process, timeout=60):
+    target = urlsplit(base_url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f'Server exited with code {process.returncode}')
+        try:
+            conn = http.client.HTTPConnection(target.hostname, target.port, timeout=2)
+            conn.request('GET', '/api/teams')
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit('Server did not become ready in time')
+
+
+def seed_database(path, scale, seed):
+    """Create a seeded SQLite file; returns {team type: team id}"""
+    import datagen
+    from app import create_app
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}'})
+    with app.app_context():
+        return datagen.seed_database(scale, seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--url', help='base URL of a running instance (skips --serve)')
+    parser.add_argument('--serve', nargs='+', choices=['threaded', 'gunicorn'], default=['threaded'],
+                        help='worker models to start and compare')
+    parser.add_argument('--workers', type=int, default=4, help='processes for multi-process servers')
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--scale', type=int, default=1000, help='seeded employees/members for --serve')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=20.0, help='measured seconds per run')
+    parser.add_argument('--warmup', type=float, default=3.0)
+    parser.add_argument('--upload-weight', type=int, default=2, help='relative weight of uploads (0 disables)')
+    parser.add_argument('--accept-encoding', default='gzip, br')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write results JSON to this file')
+    args = parser.parse_args()
+
+    runs = []
+    settings = {key: getattr(args, key) for key in ('concurrency', 'duration', 'warmup', 'upload_weight', 'scale')}
+
+    if args.url:
+        # Team ids follow datagen's seeding order (Legal, Loan, Servicing)
+        routes = build_workload({'legal': 1, 'loan': 2, 'servicing': 3}, args.upload_weight)
+        samples, errors = run_load(args.url, routes, args.concurrency, args.duration, args.warmup,
+                                   args.accept_encoding, args.seed)
+        summary = summarise(samples, errors, args.duration)
+        print_summary(args.url, summary)
+        runs.append({'server': args.url, 'routes': summary})
+    else:
+        with tempfile.TemporaryDirectory() as workdir:
+            for server in args.serve:
+                # Fresh data per server model so uploads from one run do not skew the next
+                path = os.path.join(workdir, f'load_{server}.db')
+                team_ids = seed_database(path, args.scale, args.seed)
+                routes = build_workload(team_ids, args.upload_weight)
+
+                base_url = f'http://127.0.0.1:{args.port}'
+                env = dict(os.environ, DATABASE_URL=f'sqlite:///{path}')
+                process = subprocess.Popen(server_command(server, '127.0.0.1', args.port, args.workers),
+                                           cwd=BACKEND_DIR, env=env,
+                                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                try:
+                    wait_until_ready(base_url, process)
+                    samples, errors = run_load(base_url, routes, args.concurrency, args.duration, args.warmup,
+                                               args.accept_encoding, args.seed)
+                finally:
+                    process.terminate()
+                    process.wait(timeout=30)
+
+                label = server if server == 'threaded' else f'{server} x{args.workers}'
+                summary = summarise(samples, errors, args.duration)
+                print_summary(label, summary)
+                runs.append({'server': label, 'routes': summary})
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'settings': settings, 'runs': runs}, f, indent=2)
+        print(f'\nWrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
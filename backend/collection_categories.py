@@ -0,0 +1,116 @@
+"""
+Collection Categories
+=====================
+
+Versioned classification of CollectionDetail.CollectionCategory into CF types
+and category groups.
+
+This list is the single source of truth. The SQL Server lookup table
+(CollectionCategoryClassification) is generated from it, and the servicing
+queries join it instead of evaluating long CASE/IN lists per row. Python code
+classifies raw rows with the same mapping through classify().
+
+Bump CLASSIFICATION_VERSION whenever the mapping changes and re-run
+`flask sync-collection-categories`.
+"""
+
+CLASSIFICATION_VERSION = 1
+
+LOOKUP_TABLE = 'CollectionCategoryClassification'
+
+# CF types (integer keys used by the aggregate queries)
+CF = 1
+SSA = 2
+LEGAL = 3
+NON_CF = 4
+
+CF_TYPES = {
+    CF: 'CF',
+    SSA: 'SSA',
+    LEGAL: 'Legal',
+    NON_CF: 'Non-CF'
+}
+
+# Category groups
+AMICABLE_DEBTOR_RESOLUTION = 1
+REAL_ESTATE = 2
+THIRD_PARTY_RESOLUTION = 3
+
+CATEGORY_GROUPS = {
+    AMICABLE_DEBTOR_RESOLUTION: 'Amicable Debtor Resolution',
+    REAL_ESTATE: 'Real Estate',
+    THIRD_PARTY_RESOLUTION: 'Third Part Resolution'
+}
+
+# (CategoryID, CollectionCategory, CFTypeID, CategoryGroupID)
+CLASSIFICATIONS = [
+    (1, 'Discounted Payoff  - Unsecured', CF, AMICABLE_DEBTOR_RESOLUTION),
+    (2, 'Discounted Payoff  - Secured', CF, AMICABLE_DEBTOR_RESOLUTION),
+    (3, 'Installment', CF, AMICABLE_DEBTOR_RESOLUTION),
+    (4, 'Workout', CF, AMICABLE_DEBTOR_RESOLUTION),
+    (5, 'Prepayment Full', CF, AMICABLE_DEBTOR_RESOLUTION),
+    (6, 'Prepayment Partial', CF, AMICABLE_DEBTOR_RESOLUTION),
+    (7, 'Consensual Sale Agreement', NON_CF, AMICABLE_DEBTOR_RESOLUTION),
+    (8, 'Rent', CF, REAL_ESTATE),
+    (9, 'Pspa', CF, REAL_ESTATE),
+    (10, 'Sale Deed', CF, REAL_ESTATE),
+    # Both spellings (hyphen and en dash) occur in CollectionDetail
+    (11, 'Assignment Of Award - Sale Third Party', SSA, THIRD_PARTY_RESOLUTION),
+    (12, 'Assignment Of Award – Sale Third Party', SSA, THIRD_PARTY_RESOLUTION),
+    (13, 'Collateral Sale', CF, THIRD_PARTY_RESOLUTION),
+    (14, 'Loan Sale', CF, THIRD_PARTY_RESOLUTION),
+    (15, 'Cash In Court Third Party - Sale At Auction', SSA, None),
+    (16, 'Cash In Court Third Party - Servicing', SSA, None),
+    (17, 'Cash In Court', LEGAL, None),
+    (18, 'Cash In Court Third Party - Secured', LEGAL, None),
+    (19, 'Cash In Court Third Party - Unsecured', LEGAL, None),
+    (20, 'Deed In Lieu', NON_CF, None),
+]
+
+_BY_CATEGORY = {
+    category: (CF_TYPES[cf_type_id], CATEGORY_GROUPS.get(group_id))
+    for _, category, cf_type_id, group_id in CLASSIFICATIONS
+}
+
+
+def classify(collection_category):
+    """Return (cf_type, category_group) for a CollectionCategory value"""
+    if collection_category is None:
+        return CF_TYPES[NON_CF], None
+    return _BY_CATEGORY.get(collection_category, (None, None))
+
+
+def lookup_rows():
+    """Rows for the lookup table, tagged with the current version"""
+    return [
+        (category_id, category, cf_type_id, group_id, CLASSIFICATION_VERSION)
+        for category_id, category, cf_type_id, group_id in CLASSIFICATIONS
+    ]
+
+
+# SQL Server DDL for the lookup table
+SQL_SERVER_LOOKUP_DDL = f"""
+IF OBJECT_ID(N'dbo.{LOOKUP_TABLE}', N'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.{LOOKUP_TABLE} (
+        CategoryID INT NOT NULL,
+        CollectionCategory NVARCHAR(200) NOT NULL,
+        CFTypeID INT NOT NULL,
+        CategoryGroupID INT NULL,
+        Version INT NOT NULL,
+        CONSTRAINT PK_{LOOKUP_TABLE} PRIMARY KEY (Version, CategoryID),
+        CONSTRAINT UQ_{LOOKUP_TABLE}_Category UNIQUE (Version, CollectionCategory)
+    )
+END
+"""
+
+
+def sync_sql_server(cursor):
+    """Create the lookup table on SQL Server and load the current version"""
+    cursor.execute(SQL_SERVER_LOOKUP_DDL)
+    cursor.execute(f"DELETE FROM dbo.{LOOKUP_TABLE} WHERE Version = %s", (CLASSIFICATION_VERSION,))
+    cursor.executemany(
+        f"INSERT INTO dbo.{LOOKUP_TABLE} (CategoryID, CollectionCategory, CFTypeID, CategoryGroupID, Version) "
+        "VALUES (%s, %s, %s, %s, %s)",
+        lookup_rows()
+    )
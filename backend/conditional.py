@@ -0,0 +1,52 @@
+"""
+Conditional Requests
+====================
+
+ETag support for read endpoints.
+
+A resource's version stamp comes from one aggregate query over the rows the
+endpoint would serialise: row count, id checksum and newest
+created_at/updated_at. If the client's If-None-Match matches, the endpoint
+answers 304 without loading or serialising any rows.
+
+There is no Last-Modified: deleting any row but the newest leaves the newest
+timestamp where it was, so If-Modified-Since would confirm a stale copy. The
+row count and id checksum in the ETag do change on deletes.
+"""
+
+import hashlib
+
+from flask import Response
+from sqlalchemy import func
+
+
+class VersionStamp:
+    """ETag for one resource representation"""
+
+    def __init__(self, parts):
+        encoded = repr(parts).encode('utf-8')
+        self.etag = hashlib.sha1(encoded).hexdigest()
+
+    def is_fresh(self, request):
+        """True when the client's cached copy is still current"""
+        if request.if_none_match:
+            # Weak match: compressed responses carry a weak copy of the ETag
+            return request.if_none_match.contains_weak(self.etag)
+        return False
+
+    def apply(self, response):
+        """Attach validators to a response; clients must revalidate before reuse"""
+        response.set_etag(self.etag)
+        response.cache_control.no_cache = True
+        return response
+
+    def not_modified(self):
+        return self.apply(Response(status=304))
+
+
+def stamp_query(query, id_column, timestamp_columns, *extra):
+    """Build a VersionStamp from aggregates over the rows of a query"""
+    aggregates = [func.count(id_column), func.sum(id_column)]
+    aggregates += [func.max(column) for column in timestamp_columns]
+    row = query.with_entities(*aggregates).one()
+    return VersionStamp((tuple(row), extra))
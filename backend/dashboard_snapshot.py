@@ -0,0 +1,79 @@
+"""
+Dashboard Snapshot
+==================
+
+Precomputed dashboard payload with event-driven invalidation.
+
+The dashboard is built once and kept as encoded JSON, so serving it is a single
+dictionary lookup. SQLAlchemy session events mark the snapshot stale when a
+commit writes any of the watched models (employees, performance records,
+bonus calculations, ...). The next read rebuilds it. A TTL bounds staleness
+for writes made by other processes.
+"""
+
+import threading
+import time
+
+from sqlalchemy import event
+
+
+class DashboardSnapshot:
+    """Cache of encoded dashboard payloads keyed by period"""
+
+    def __init__(self, build, encode, ttl=60):
+        self._build = build  # key -> dict
+        self._encode = encode  # dict -> str
+        self._ttl = ttl
+        self._entries = {}  # key -> (built_at, version, body)
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the encoded payload for key, rebuilding it if stale"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] == self._version and time.monotonic() - entry[0] < self._ttl:
+            return entry[2]
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] != self._version or time.monotonic() - entry[0] >= self._ttl:
+                version = self._version
+                body = self._encode(self._build(key))
+                entry = (time.monotonic(), version, body)
+                self._entries = {key: entry}  # Only the current period is worth keeping
+
+        return entry[2]
+
+    def invalidate(self):
+        """Mark every cached payload stale"""
+        self._version += 1
+
+    def watch(self, session, models):
+        """Invalidate after any commit that wrote one of the given models"""
+        models = tuple(models)
+
+        def touches_watched_model(instances):
+            return any(isinstance(instance, models) for instance in instances)
+
+        @event.listens_for(session, 'after_flush')
+        def _after_flush(sess, flush_context):
+            if (touches_watched_model(sess.new) or touches_watched_model(sess.dirty)
+                    or touches_watched_model(sess.deleted)):
+                sess.info['dashboard_stale'] = True
+
+        @event.listens_for(session, 'do_orm_execute')
+        def _do_orm_execute(orm_execute_state):
+            # Bulk Query.update()/delete() bypass the flush
+            if orm_execute_state.is_update or orm_execute_state.is_delete:
+                mapper = orm_execute_state.bind_mapper
+                if mapper is not None and issubclass(mapper.class_, models):
+                    orm_execute_state.session.info['dashboard_stale'] = True
+
+        @event.listens_for(session, 'after_commit')
+        def _after_commit(sess):
+            if sess.info.pop('dashboard_stale', False):
+                self.invalidate()
+
+        @event.listens_for(session, 'after_rollback')
+        def _after_rollback(sess):
+            sess.info.pop('dashboard_stale', None)
@@ -0,0 +1,192 @@
+"""
+Employee Cache
+==============
+
+In-process cache of the employee dimension: id and employee_code to name,
+surname, team and category.
+
+- Lookups for many employees load every miss with one query (chunked IN
+  lists), so hot paths never issue a query per employee.
+- The cache is an LRU bounded to EMPLOYEE_CACHE_SIZE entries.
+- SQLAlchemy session events drop the entries a commit wrote (inserts,
+  updates, deletes of Employee), and everything after a Team write or a bulk
+  update without primary keys. A TTL bounds staleness for writes made by
+  other processes.
+"""
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from sqlalchemy import event
+
+from models import db, Employee, Team
+
+EMPLOYEE_CACHE_SIZE = 10000
+EMPLOYEE_CACHE_TTL = 300
+LOAD_CHUNK_SIZE = 500
+
+
+class EmployeeInfo(namedtuple('EmployeeInfo', 'id employee_code name surname team_id team_name category')):
+    """Read-only employee dimension row"""
+    __slots__ = ()
+
+    @property
+    def full_name(self):
+        return f'{self.name} {self.surname}'
+
+
+class EmployeeCache:
+    """Size-bounded LRU of EmployeeInfo keyed by id, with an employee_code index"""
+
+    def __init__(self, max_size=EMPLOYEE_CACHE_SIZE, ttl=EMPLOYEE_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # id -> (loaded_at, EmployeeInfo)
+        self._ids_by_code = {}
+        self._generation = 0  # Bumped by invalidate()
+        self._lock = threading.Lock()
+
+    def get(self, employee_id):
+        """EmployeeInfo for an id, or None if there is no such employee"""
+        return self.get_many([employee_id]).get(employee_id)
+
+    def get_by_code(self, employee_code):
+        """EmployeeInfo for an employee_code, or None"""
+        return self.get_many_by_code([employee_code]).get(employee_code)
+
+    def get_many(self, employee_ids):
+        """{id: EmployeeInfo} for the ids that exist; misses load in one query"""
+        found, missing = {}, set()
+        with self._lock:
+            for employee_id in set(employee_ids):
+                info = self._lookup(employee_id)
+                if info is None:
+                    missing.add(employee_id)
+                else:
+                    found[employee_id] = info
+        if missing:
+            found.update((info.id, info) for info in self._load(Employee.id, missing))
+        return found
+
+    def get_many_by_code(self, employee_codes, refresh=False):
+        """{employee_code: EmployeeInfo} for the codes that exist; refresh=True reloads them all"""
+        found, missing = {}, set()
+        if refresh:
+            missing.update(employee_codes)
+        with self._lock:
+            for code in set(employee_codes) - missing:
+                employee_id = self._ids_by_code.get(code)
+                info = self._lookup(employee_id) if employee_id is not None else None
+                if info is None:
+                    missing.add(code)
+                else:
+                    found[code] = info
+        if missing:
+            found.update((info.employee_code, info) for info in self._load(Employee.employee_code, missing))
+        return found
+
+    def invalidate(self, employee_ids=None):
+        """Drop some employees, or everything when no ids are given"""
+        with self._lock:
+            self._generation += 1
+            if employee_ids is None:
+                self._entries.clear()
+                self._ids_by_code.clear()
+                return
+            for employee_id in employee_ids:
+                self._drop(employee_id)
+
+    def _lookup(self, employee_id):
+        # Caller holds the lock
+        entry = self._entries.get(employee_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.ttl:
+            self._drop(employee_id)
+            return None
+        self._entries.move_to_end(employee_id)
+        return entry[1]
+
+    def _drop(self, employee_id):
+        # Caller holds the lock
+        entry = self._entries.pop(employee_id, None)
+        if entry is not None and self._ids_by_code.get(entry[1].employee_code) == employee_id:
+            del self._ids_by_code[entry[1].employee_code]
+
+    def _load(self, column, keys):
+        """Query employees whose column is in keys, and cache them"""
+        keys = list(keys)
+        generation = self._generation
+        infos = []
+        for start in range(0, len(keys), LOAD_CHUNK_SIZE):
+            rows = db.session.query(
+                Employee.id, Employee.employee_code, Employee.name, Employee.surname,
+                Employee.team_id, Team.name, Employee.category
+            ).outerjoin(Team, Employee.team_id == Team.id).filter(
+                column.in_(keys[start:start + LOAD_CHUNK_SIZE])
+            ).all()
+            infos.extend(EmployeeInfo(*row) for row in rows)
+
+        now = time.monotonic()
+        with self._lock:
+            if generation != self._generation:
+                return infos  # A commit invalidated entries while we were reading
+            for info in infos:
+                self._drop(info.id)
+                self._entries[info.id] = (now, info)
+                self._ids_by_code[info.employee_code] = info.id
+            while len(self._entries) > self.max_size:
+                self._drop(next(iter(self._entries)))
+        return infos
+
+    def watch(self, session):
+        """Invalidate employees written by each commit"""
+
+        def written_ids(sess):
+            return sess.info.setdefault('employee_cache_ids', set())
+
+        @event.listens_for(session, 'after_flush')
+        def _after_flush(sess, flush_context):
+            for instance in list(sess.new) + list(sess.dirty) + list(sess.deleted):
+                if isinstance(instance, Employee):
+                    written_ids(sess).add(instance.id)
+                elif isinstance(instance, Team):
+                    sess.info['employee_cache_clear'] = True  # Team names are denormalised
+
+        @event.listens_for(session, 'do_orm_execute')
+        def _do_orm_execute(orm_execute_state):
+            # Bulk updates/deletes bypass the flush
+            if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+                return
+            mapper = orm_execute_state.bind_mapper
+            if mapper is None or not issubclass(mapper.class_, (Employee, Team)):
+                return
+            params = orm_execute_state.parameters
+            if mapper.class_ is Employee and isinstance(params, list) and all('id' in p for p in params):
+                written_ids(orm_execute_state.session).update(p['id'] for p in params)  # Bulk update by primary key
+            else:
+                orm_execute_state.session.info['employee_cache_clear'] = True
+
+        # On rollback too: a lookup after the flush may have cached rows that
+        # were never committed
+        @event.listens_for(session, 'after_commit')
+        @event.listens_for(session, 'after_rollback')
+        def _after_transaction(sess):
+            ids = sess.info.pop('employee_cache_ids', None)
+            if sess.info.pop('employee_cache_clear', False):
+                self.invalidate()
+            elif ids:
+                self.invalidate(ids)
+
+
+employee_cache = EmployeeCache()
+employee_cache.watch(db.session)
+
+
+def init_employee_cache(app):
+    """Size the employee cache from the app config and start it empty"""
+    employee_cache.max_size = app.config.get('EMPLOYEE_CACHE_SIZE', employee_cache.max_size)
+    employee_cache.ttl = app.config.get('EMPLOYEE_CACHE_TTL', employee_cache.ttl)
+    employee_cache.invalidate()
+    return app
@@ -0,0 +1,30 @@
+"""
+API Endpoints
+=============
+
+Blueprints for every API area, registered by the application factory.
+"""
+
+from endpoints import (
+    admin_endpoints,
+    dashboard_endpoints,
+    incentives_endpoints,
+    performance_endpoints,
+    sql_server_endpoints,
+    teams_endpoints,
+)
+
+BLUEPRINTS = [
+    dashboard_endpoints.bp,
+    teams_endpoints.bp,
+    performance_endpoints.bp,
+    incentives_endpoints.bp,
+    sql_server_endpoints.bp,
+    admin_endpoints.bp,
+]
+
+
+def register_blueprints(app):
+    """Register all API blueprints on an app"""
+    for blueprint in BLUEPRINTS:
+        app.register_blueprint(blueprint)
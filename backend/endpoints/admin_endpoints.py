@@ -0,0 +1,173 @@
+"""
+Admin API Endpoints
+===================
+
+This file contains development seeding, database diagnostics, metrics,
+slow-query log and request profile endpoints.
+"""
+
+import json
+import os
+
+from flask import Blueprint, Response, current_app, jsonify, request, send_file
+
+import metrics
+import profiling
+import slow_queries
+from models import db, Team, Employee, IncentiveParameter, SlowQuery, TeamMemberData
+
+bp = Blueprint('admin', __name__)
+
+@bp.route('/api/seed-data', methods=['POST'])
+def seed_data():
+    """Seed initial data for development"""
+    try:
+        # Create teams
+        teams_data = [
+            {'name': 'Legal Team', 'description': 'Legal and compliance team'},
+            {'name': 'Loan Team', 'description': 'Loan processing and underwriting team'},
+            {'name': 'Servicing Team', 'description': 'Customer service and loan servicing team'}
+        ]
+        
+        for team_data in teams_data:
+            team = Team(**team_data)
+            db.session.add(team)
+        
+        db.session.commit()
+        
+        # Get team references
+        legal_team = Team.query.filter_by(name='Legal Team').first()
+        loan_team = Team.query.filter_by(name='Loan Team').first()
+        servicing_team = Team.query.filter_by(name='Servicing Team').first()
+        
+        # Create employees
+        employees_data = [
+            {'name': 'John', 'surname': 'Smith', 'employee_code': 'EMP001', 'category': 'Director', 'team_id': legal_team.id},
+            {'name': 'Sarah', 'surname': 'Johnson', 'employee_code': 'EMP002', 'category': 'Associate', 'team_id': legal_team.id},
+            {'name': 'Michael', 'surname': 'Wilson', 'employee_code': 'EMP003', 'category': 'Director', 'team_id': loan_team.id},
+            {'name': 'Lisa', 'surname': 'Davis', 'employee_code': 'EMP004', 'category': 'Associate', 'team_id': loan_team.id},
+            {'name': 'Tom', 'surname': 'Brown', 'employee_code': 'EMP005', 'category': 'Director', 'team_id': servicing_team.id},
+            {'name': 'Emily', 'surname': 'Chen', 'employee_code': 'EMP006', 'category': 'Associate', 'team_id': servicing_team.id}
+        ]
+        
+        for emp_data in employees_data:
+            employee = Employee(**emp_data)
+            db.session.add(employee)
+        
+        db.session.commit()
+        
+        # Create incentive parameters
+        incentive_params = [
+            {'team_id': legal_team.id, 'parameter_name': 'performance_multiplier', 'base_value': 1.0, 'multiplier': 1.2, 'min_threshold': 0, 'max_threshold': 100},
+            {'team_id': loan_team.id, 'parameter_name': 'performance_multiplier', 'base_value': 1.0, 'multiplier': 1.3, 'min_threshold': 0, 'max_threshold': 100},
+            {'team_id': servicing_team.id, 'parameter_name': 'performance_multiplier', 'base_value': 1.0, 'multiplier': 1.1, 'min_threshold': 0, 'max_threshold': 100}
+        ]
+        
+        for param_data in incentive_params:
+            param = IncentiveParameter(**param_data)
+            db.session.add(param)
+        
+        db.session.commit()
+        
+        return jsonify({'message': 'Successfully seeded initial data'}), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/test-db', methods=['GET'])
+def test_database():
+    """Test database connection and models"""
+    try:
+        # Test if we can query the database
+        team_count = Team.query.count()
+        employee_count = Employee.query.count()
+        team_member_data_count = TeamMemberData.query.count()
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Database connection successful',
+            'team_count': team_count,
+            'employee_count': employee_count,
+            'team_member_data_count': team_member_data_count,
+            'database_url': current_app.config['SQLALCHEMY_DATABASE_URI']
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Database connection failed: {str(e)}',
+            'database_url': current_app.config['SQLALCHEMY_DATABASE_URI']
+        }), 500
+
+@bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Request, database and SQL Server metrics in Prometheus text format"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@bp.route('/api/slow-queries', methods=['GET'])
+def get_slow_queries():
+    """Most recent slow SQL Server queries, optionally filtered by query name"""
+    if not slow_queries.is_authorized():
+        return jsonify({'error': 'SLOW_QUERY_TOKEN is not set or the admin token is missing'}), 403
+    try:
+        limit = min(int(request.args.get('limit', 50)), 500)
+        query_name = request.args.get('query')
+        
+        query = SlowQuery.query
+        if query_name:
+            query = query.filter_by(query_name=query_name)
+        records = query.order_by(SlowQuery.created_at.desc(), SlowQuery.id.desc()).limit(limit).all()
+        
+        return jsonify([{
+            'id': slow_query.id,
+            'query_name': slow_query.query_name,
+            'parameters': json.loads(slow_query.parameters) if slow_query.parameters else {},
+            'duration_ms': slow_query.duration_ms,
+            'row_count': slow_query.row_count,
+            'byte_count': slow_query.byte_count,
+            'has_showplan': slow_query.showplan is not None,
+            'created_at': slow_query.created_at.isoformat()
+        } for slow_query in records]), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/slow-queries/<int:slow_query_id>/showplan', methods=['GET'])
+def get_slow_query_showplan(slow_query_id):
+    """Captured SHOWPLAN_XML for one slow query"""
+    if not slow_queries.is_authorized():
+        return jsonify({'error': 'SLOW_QUERY_TOKEN is not set or the admin token is missing'}), 403
+    slow_query = SlowQuery.query.get_or_404(slow_query_id)
+    if slow_query.showplan is None:
+        return jsonify({'error': 'No plan was captured for this query'}), 404
+    return Response(slow_query.showplan, mimetype='application/xml')
+
+@bp.route('/api/profiles', methods=['GET'])
+def get_profiles():
+    """Stored ?__profile=1 request profiles, newest first"""
+    if not profiling.is_authorized():
+        return jsonify({'error': 'Profiling is disabled or the admin token is missing'}), 403
+    return jsonify({'profiles': profiling.list_profiles()}), 200
+
+@bp.route('/api/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """Call tree of one stored profile as text, or the raw pstats file"""
+    if not profiling.is_authorized():
+        return jsonify({'error': 'Profiling is disabled or the admin token is missing'}), 403
+    
+    path = profiling.profile_path(profile_id)
+    if path is None or not os.path.exists(path):
+        return jsonify({'error': 'Profile not found'}), 404
+    
+    if request.args.get('format') == 'pstats':
+        # Loadable with pstats, snakeviz or gprof2dot
+        return send_file(path, mimetype='application/octet-stream', as_attachment=True,
+                         download_name=f'{profile_id}.prof')
+    
+    sort = request.args.get('sort', 'cumulative')
+    if sort not in profiling.SORT_KEYS:
+        return jsonify({'error': f'sort must be one of: {", ".join(profiling.SORT_KEYS)}'}), 400
+    limit = min(int(request.args.get('limit', 60)), 500)
+    
+    return Response(profiling.render_profile(path, sort, limit), mimetype='text/plain')
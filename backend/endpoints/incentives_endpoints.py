@@ -0,0 +1,183 @@
+"""
+Incentives API Endpoints
+========================
+
+This file contains incentive parameter management and bonus calculation
+endpoints.
+"""
+
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify
+
+from conditional import stamp_query
+from employee_cache import employee_cache
+from models import db, PerformanceRecord, IncentiveParameter, BonusCalculation
+
+bp = Blueprint('incentives', __name__)
+
+@bp.route('/api/incentives', methods=['GET'])
+def get_incentive_parameters():
+    """Get all incentive parameters"""
+    try:
+        stamp = stamp_query(IncentiveParameter.query, IncentiveParameter.id, [IncentiveParameter.created_at])
+        if stamp.is_fresh(request):
+            return stamp.not_modified()
+        
+        parameters = IncentiveParameter.query.all()
+        return stamp.apply(jsonify([{
+            'id': p.id,
+            'team': p.team,
+            'category': p.category,
+            'base_salary': p.base_salary,
+            'quarter': p.quarter,
+            'year': p.year
+        } for p in parameters]))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/incentives', methods=['POST'])
+def create_incentive_parameter():
+    """Create a new incentive parameter"""
+    try:
+        data = request.json
+        
+        # Validate required fields
+        required_fields = ['team', 'category', 'base_salary', 'quarter', 'year']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({'error': f'Missing required field: {field}'}), 400
+        
+        # Validate team
+        if data['team'] not in ['Legal', 'Loan', 'Servicing']:
+            return jsonify({'error': 'Invalid team. Must be Legal, Loan, or Servicing'}), 400
+        
+        # Validate category
+        if data['category'] not in ['Analyst', 'Associate']:
+            return jsonify({'error': 'Invalid category. Must be either Analyst or Associate'}), 400
+        
+        # Validate quarter
+        if data['quarter'] not in ['Q1', 'Q2', 'Q3', 'Q4']:
+            return jsonify({'error': 'Invalid quarter. Must be Q1, Q2, Q3, or Q4'}), 400
+        
+        # Validate base salary
+        try:
+            base_salary = float(data['base_salary'])
+            if base_salary <= 0:
+                return jsonify({'error': 'Base salary must be greater than 0'}), 400
+        except ValueError:
+            return jsonify({'error': 'Invalid base salary value'}), 400
+        
+        # Create new parameter
+        parameter = IncentiveParameter(
+            team=data['team'],
+            category=data['category'],
+            base_salary=base_salary,
+            quarter=data['quarter'],
+            year=int(data['year'])
+        )
+        
+        db.session.add(parameter)
+        db.session.commit()
+        
+        return jsonify({
+            'id': parameter.id,
+            'team': parameter.team,
+            'category': parameter.category,
+            'base_salary': parameter.base_salary,
+            'quarter': parameter.quarter,
+            'year': parameter.year
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/incentives/<int:param_id>', methods=['DELETE'])
+def delete_incentive_parameter(param_id):
+    """Delete an incentive parameter"""
+    try:
+        parameter = IncentiveParameter.query.get(param_id)
+        if not parameter:
+            return jsonify({'error': 'Parameter not found'}), 404
+            
+        db.session.delete(parameter)
+        db.session.commit()
+        
+        return '', 204
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/calculate-bonus', methods=['POST'])
+def calculate_bonus():
+    """Calculate bonus for an employee"""
+    try:
+        data = request.get_json()
+        employee_id = data.get('employee_id')
+        month = data.get('month', datetime.now().month)
+        year = data.get('year', datetime.now().year)
+        quarter = f"Q{(month - 1) // 3 + 1}"  # Calculate quarter from month
+        
+        employee = employee_cache.get(employee_id)
+        if employee is None:
+            return jsonify({'error': 'Employee not found'}), 404
+        performance = PerformanceRecord.query.filter_by(
+            employee_id=employee_id,
+            month=month,
+            year=year
+        ).first()
+        
+        if not performance:
+            return jsonify({'error': 'Performance record not found'}), 404
+        
+        # Get team incentive parameters for the specific quarter and year
+        team_params = IncentiveParameter.query.filter_by(
+            team=employee.team_name,
+            is_active=True,
+            quarter=quarter,
+            year=year
+        ).all()
+        
+        if not team_params:
+            return jsonify({'error': f'No incentive parameters found for {quarter} {year}'}), 404
+        
+        # Calculate bonus based on performance and parameters
+        base_bonus = employee.salary * 0.1  # 10% base bonus
+        performance_multiplier = performance.overall_score / 100
+        
+        # Apply team-specific parameters
+        for param in team_params:
+            if param.parameter_name == 'performance_multiplier':
+                performance_multiplier *= param.multiplier
+            elif param.parameter_name == 'base_bonus_percentage':
+                base_bonus = employee.salary * (param.base_value / 100)
+        
+        final_bonus = base_bonus * performance_multiplier
+        
+        # Save calculation with quarter information
+        bonus_calc = BonusCalculation(
+            employee_id=employee_id,
+            month=month,
+            year=year,
+            quarter=quarter,
+            base_salary=employee.salary,
+            performance_score=performance.overall_score,
+            bonus_amount=final_bonus
+        )
+        
+        db.session.add(bonus_calc)
+        db.session.commit()
+        
+        return jsonify({
+            'employee_id': employee_id,
+            'quarter': quarter,
+            'year': year,
+            'base_salary': employee.salary,
+            'performance_score': performance.overall_score,
+            'bonus_amount': final_bonus
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,364 @@
+"""
+Performance API Endpoints
+=========================
+
+This file contains performance data endpoints, including the refreshes that
+query the external SQL Server.
+"""
+
+from collections import Counter
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify
+
+import collection_categories
+from employee_cache import employee_cache
+from models import db, Team, Employee, PerformanceRecord, QUARTER_DATES
+from queries import SERVICING_BREAKDOWN_QUERY, SERVICING_TEAM_QUERY, LEGAL_TEAM_COUNTS_QUERY
+from read_replica import read_replica
+from sql_server import SQL_SERVER_AVAILABLE, connect_sql_server, quarter_date_params, sql_server_executor
+from streaming import STREAM_BATCH_SIZE, json_array_chunks, stream_response
+
+bp = Blueprint('performance', __name__)
+
+@bp.route('/api/performance', methods=['GET'])
+@read_replica
+def get_performance_data():
+    """Get performance data, streamed as a JSON array"""
+    try:
+        # Plain columns instead of entities: no per-row employee/team lazy loads
+        rows = db.session.query(
+            PerformanceRecord.id,
+            Employee.name,
+            Employee.surname,
+            Team.name,
+            PerformanceRecord.month,
+            PerformanceRecord.year,
+            PerformanceRecord.productivity_score,
+            PerformanceRecord.quality_score,
+            PerformanceRecord.attendance_score,
+            PerformanceRecord.overall_score
+        ).join(Employee, PerformanceRecord.employee_id == Employee.id).join(
+            Team, Employee.team_id == Team.id
+        ).order_by(PerformanceRecord.id).yield_per(STREAM_BATCH_SIZE)
+        
+        def serialize(row):
+            return {
+                'id': row[0],
+                'employee_name': f"{row[1]} {row[2]}",
+                'team_name': row[3],
+                'month': row[4],
+                'year': row[5],
+                'productivity_score': row[6],
+                'quality_score': row[7],
+                'attendance_score': row[8],
+                'overall_score': row[9]
+            }
+        
+        return stream_response(json_array_chunks(rows, serialize)), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/performance/team/<int:team_id>', methods=['GET'])
+def get_team_performance(team_id):
+    """Get performance data for a specific team"""
+    try:
+        team = Team.query.get_or_404(team_id)
+        
+        # Get quarter and year from request
+        quarter = request.args.get('quarter', 'Q4')
+        year = int(request.args.get('year', datetime.now().year))
+        
+        # Get quarter date range
+        quarter_range = QUARTER_DATES.get(quarter, QUARTER_DATES['Q4'])
+        start_date = f"{year}-{quarter_range['start']}"
+        end_date = f"{year}-{quarter_range['end']}"
+        
+        # Count employees in this team
+        total_employees = Employee.query.filter_by(team_id=team_id).count()
+        
+        # Get performance records for this team in the specified quarter
+        start_month = (int(quarter[1]) - 1) * 3 + 1
+        end_month = start_month + 2
+        
+        performance_records = PerformanceRecord.query.join(Employee).filter(
+            Employee.team_id == team_id,
+            PerformanceRecord.year == year,
+            PerformanceRecord.month.between(start_month, end_month)
+        ).all()
+        
+        # Calculate averages
+        if performance_records:
+            avg_productivity = sum(r.productivity_score for r in performance_records) / len(performance_records)
+            avg_quality = sum(r.quality_score for r in performance_records) / len(performance_records)
+            avg_attendance = sum(r.attendance_score for r in performance_records) / len(performance_records)
+            avg_overall = sum(r.overall_score for r in performance_records) / len(performance_records)
+            
+            # Get top performers
+            employees = employee_cache.get_many({record.employee_id for record in performance_records})
+            employee_scores = {}
+            for record in performance_records:
+                emp_id = record.employee_id
+                if emp_id not in employee_scores:
+                    employee_scores[emp_id] = {
+                        'employee_name': employees[emp_id].full_name,
+                        'scores': []
+                    }
+                employee_scores[emp_id]['scores'].append(record.overall_score)
+            
+            # Calculate average score for each employee
+            top_performers = []
+            for emp_id, data in employee_scores.items():
+                avg_score = sum(data['scores']) / len(data['scores'])
+                top_performers.append({
+                    'employee_name': data['employee_name'],
+                    'overall_score': round(avg_score, 2)
+                })
+            
+            # Sort and get top 3
+            top_performers = sorted(top_performers, key=lambda x: x['overall_score'], reverse=True)[:3]
+            
+            # Calculate monthly trends
+            monthly_trends = []
+            for month in range(start_month, end_month + 1):
+                month_records = [r for r in performance_records if r.month == month]
+                if month_records:
+                    avg_score = sum(r.overall_score for r in month_records) / len(month_records)
+                    monthly_trends.append({
+                        'month': datetime(year, month, 1).strftime('%b'),
+                        'avg_score': round(avg_score, 2)
+                    })
+            
+            # Calculate score distribution
+            score_ranges = {
+                '90-100%': 0,
+                '80-89%': 0,
+                '70-79%': 0,
+                '60-69%': 0
+            }
+            
+            for record in performance_records:
+                score = record.overall_score
+                if score >= 90:
+                    score_ranges['90-100%'] += 1
+                elif score >= 80:
+                    score_ranges['80-89%'] += 1
+                elif score >= 70:
+                    score_ranges['70-79%'] += 1
+                elif score >= 60:
+                    score_ranges['60-69%'] += 1
+            
+            performance_distribution = [
+                {'range': range_key, 'count': count}
+                for range_key, count in score_ranges.items()
+            ]
+        else:
+            # No performance records found
+            avg_productivity = 0
+            avg_quality = 0
+            avg_attendance = 0
+            avg_overall = 0
+            top_performers = []
+            monthly_trends = []
+            performance_distribution = []
+        
+        performance_data = {
+            'team_id': team_id,
+            'team_name': team.name,
+            'quarter': f'{quarter} {year}',
+            'total_employees': total_employees,
+            'avg_productivity': round(avg_productivity, 2),
+            'avg_quality': round(avg_quality, 2),
+            'avg_attendance': round(avg_attendance, 2),
+            'avg_overall': round(avg_overall, 2),
+            'top_performers': top_performers,
+            'quarterly_trend': monthly_trends,
+            'performance_distribution': performance_distribution,
+            'query_period': f'{start_date} to {end_date}'
+        }
+        
+        return jsonify(performance_data), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def query_team_performance(team_id, team_name, quarter, year):
+    """Query the external SQL Server for a team's quarterly performance (own connection, thread-safe)"""
+    conn = connect_sql_server()
+    try:
+        cursor = conn.cursor()
+        
+        if team_id == 1:  # Legal Team - Actual Query
+            # Get quarter date range
+            quarter_range = QUARTER_DATES.get(quarter, QUARTER_DATES['Q4'])
+            start_date = f"{year}-{quarter_range['start']}"
+            end_date = f"{year}-{quarter_range['end']}"
+            
+            # Fetch only the aggregated columns and fold each batch into the
+            # counts, so no more than one batch of rows is held at a time
+            total_acts = 0
+            total_amount = 0
+            bucket_distribution = Counter()
+            lawyer_distribution = Counter()
+            legal_stages = Counter()
+            acts_per_month = Counter()
+            
+            params = quarter_date_params(start_date, end_date)
+            for batch in LEGAL_TEAM_COUNTS_QUERY.iter_batches(cursor, **params):
+                lawyers, stages, buckets, amounts, act_dates = zip(*batch)
+                total_acts += len(batch)
+                total_amount += sum(amount for amount in amounts if amount is not None)
+                lawyer_distribution.update([lawyer or 'Unknown' for lawyer in lawyers])
+                bucket_distribution.update([bucket or 'Unknown' for bucket in buckets])
+                legal_stages.update([stage or 'Unknown' for stage in stages])
+                acts_per_month.update([act_date.month for act_date in act_dates if act_date])
+            
+            # Get top lawyers by number of acts
+            top_lawyers = sorted(lawyer_distribution.items(), key=lambda x: x[1], reverse=True)[:3]
+            
+            performance_data = {
+                'team_id': team_id,
+                'team_name': team_name,
+                'quarter': f'{quarter} {year}',
+                'total_legal_acts': total_acts,
+                'total_amount': round(total_amount, 2),
+                'avg_amount_per_act': round(total_amount / total_acts, 2) if total_acts > 0 else 0,
+                'bucket_distribution': dict(bucket_distribution),
+                'lawyer_distribution': dict(lawyer_distribution),
+                'legal_stages': dict(legal_stages),
+                'data_source': 'SQL Server - LegalActActivity',
+                'query_period': f'{start_date} to {end_date}',
+                'country_id': 2,
+                'top_performers': [
+                    {'employee_name': lawyer, 'legal_acts': count}
+                    for lawyer, count in top_lawyers
+                ],
+                'quarterly_trend': [
+                    {'month': datetime(year, month, 1).strftime('%b'), 'legal_acts': acts_per_month[month]}
+                    for month in range(int(quarter_range['start'].split('-')[0]), int(quarter_range['end'].split('-')[0]) + 1)
+                ]
+            }
+            
+        elif team_id == 3:  # Servicing Team - Actual Query
+            # Get quarter date range
+            quarter_range = QUARTER_DATES.get(quarter, QUARTER_DATES['Q4'])
+            start_date = f"{year}-{quarter_range['start']}"
+            end_date = f"{year}-{quarter_range['end']}"
+            
+            # Execute the actual Servicing Team query
+            params = quarter_date_params(start_date, end_date)
+            results = SERVICING_TEAM_QUERY.fetchall(cursor, **params)
+            
+            # One aggregated row per Asset Manager
+            total_collections = sum(row[1] for row in results)
+            total_amount = sum(row[2] for row in results if row[2] is not None)
+            
+            # Collections per category group and per month
+            category_groups = Counter()
+            collections_per_month = Counter()
+            for group_id, month, count in SERVICING_BREAKDOWN_QUERY.fetchall(cursor, **params):
+                category_groups[collection_categories.CATEGORY_GROUPS.get(group_id, 'Unknown')] += count
+                collections_per_month[month] += count
+            
+            # Collections per Asset Manager and per CF type
+            asset_managers = {row[0] or 'Unknown': row[1] for row in results}
+            cf_types = {
+                'CF': sum(row[9] for row in results),
+                'SSA': sum(row[10] for row in results),
+                'Legal': sum(row[11] for row in results),
+                'Non-CF': sum(row[12] for row in results)
+            }
+            
+            performance_data = {
+                'team_id': team_id,
+                'team_name': team_name,
+                'quarter': f'{quarter} {year}',
+                'total_collections': total_collections,
+                'total_amount': round(total_amount, 2),
+                'avg_amount_per_collection': round(total_amount / total_collections, 2) if total_collections > 0 else 0,
+                'category_distribution': dict(category_groups),
+                'cf_type_distribution': cf_types,
+                'asset_manager_distribution': asset_managers,
+                'data_source': 'SQL Server - CollectionDetail',
+                'query_period': f'{start_date} to {end_date}',
+                'country': 'ESPANA',
+                'top_performers': sorted(
+                    [{'employee_name': row[0], 'collections': row[1]} for row in results],
+                    key=lambda x: x['collections'],
+                    reverse=True
+                )[:3],
+                'quarterly_trend': [
+                    {'month': datetime(year, month, 1).strftime('%b'), 'collections': collections_per_month[month]}
+                    for month in range(int(quarter_range['start'].split('-')[0]), int(quarter_range['end'].split('-')[0]) + 1)
+                ]
+            }
+            
+        else:  # Loan Team - Placeholder
+            # Similar structure for Loan Team
+            performance_data = {
+                'team_id': team_id,
+                'team_name': team_name,
+                'quarter': f'{quarter} {year}',
+                'data_source': 'SQL Server - Placeholder'
+            }
+        
+        cursor.close()
+    finally:
+        conn.close()
+    
+    return performance_data
+
+@bp.route('/api/performance/team/<int:team_id>/refresh', methods=['GET'])
+def refresh_team_performance(team_id):
+    """Refresh performance data for a specific team from external SQL server"""
+    try:
+        team = Team.query.get_or_404(team_id)
+        
+        # Get quarter parameter from request (default to Q4 2024)
+        quarter = request.args.get('quarter', 'Q4')
+        year = int(request.args.get('year', 2024))
+        
+        if not SQL_SERVER_AVAILABLE:
+            return jsonify({'error': 'SQL Server connection not available. Please install pymssql.'}), 500
+        
+        performance_data = query_team_performance(team.id, team.name, quarter, year)
+        
+        return jsonify(performance_data), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/performance/refresh-all', methods=['GET'])
+def refresh_all_team_performance():
+    """Refresh performance data for every team, querying SQL Server concurrently"""
+    try:
+        quarter = request.args.get('quarter', 'Q4')
+        year = int(request.args.get('year', 2024))
+        
+        if not SQL_SERVER_AVAILABLE:
+            return jsonify({'error': 'SQL Server connection not available. Please install pymssql.'}), 500
+        
+        teams = Team.query.order_by(Team.id).all()
+        
+        # Total latency is the slowest team query rather than the sum
+        futures = {
+            team.id: sql_server_executor().submit(query_team_performance, team.id, team.name, quarter, year)
+            for team in teams
+        }
+        
+        teams_data = []
+        errors = {}
+        for team in teams:
+            try:
+                teams_data.append(futures[team.id].result())
+            except Exception as e:
+                errors[team.name] = str(e)
+        
+        return jsonify({
+            'quarter': f'{quarter} {year}',
+            'teams': teams_data,
+            'errors': errors
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,238 @@
+"""
+SQL Server API Endpoints
+========================
+
+This file contains per-manager aggregates read from the external SQL Server,
+and NDJSON exports of the raw legal acts and collections behind them.
+"""
+
+from itertools import chain
+
+from flask import Blueprint, request, jsonify
+from werkzeug.utils import secure_filename
+
+from models import QUARTER_DATES
+from queries import (
+    SERVICING_MANAGER_QUERY, LEGAL_MANAGER_PERFORMANCE_QUERY, LEGAL_TEAM_QUERY,
+    SERVICING_COLLECTIONS_QUERY, SERVICING_MANAGER_COLLECTIONS_QUERY
+)
+from sql_server import SQL_SERVER_AVAILABLE, connect_sql_server, quarter_date_params
+from streaming import ndjson_chunks, stream_response
+
+bp = Blueprint('sql_server', __name__)
+
+def stream_sql_server_rows(query, filename, **params):
+    """NDJSON response fed from fetchmany batches of a SQL Server query"""
+    conn = connect_sql_server()
+    try:
+        cursor = conn.cursor()
+        batches = query.iter_batches(cursor, **params)
+        # Fetch the first batch now, so query errors still get a JSON 500
+        first = next(batches, [])
+        columns = [column[0] for column in cursor.description]
+    except Exception:
+        conn.close()
+        raise
+    
+    response = stream_response(ndjson_chunks(chain([first], batches), columns), mimetype='application/x-ndjson')
+    response.headers['Content-Disposition'] = f'attachment; filename="{secure_filename(filename)}"'
+    # Close the batches first: that records the query, even for an abandoned stream
+    response.call_on_close(batches.close)
+    response.call_on_close(conn.close)
+    return response
+
+@bp.route('/api/servicing/cash-flow/<asset_manager>', methods=['GET'])
+def get_asset_manager_cash_flow(asset_manager):
+    """Get aggregated Cash Flow data for a specific Asset Manager from SQL Server"""
+    try:
+        if not SQL_SERVER_AVAILABLE:
+            return jsonify({'error': 'SQL Server connection not available. Please install pymssql.'}), 500
+            
+        # Get quarter parameter from request
+        quarter = request.args.get('quarter', 'Q4')
+        year = request.args.get('year', '2024')
+        
+        # Get quarter date range
+        quarter_range = QUARTER_DATES.get(quarter, QUARTER_DATES['Q4'])
+        start_date = f"{year}-{quarter_range['start']}"
+        end_date = f"{year}-{quarter_range['end']}"
+        
+        # Connect to SQL Server
+        conn = connect_sql_server()
+        
+        cursor = conn.cursor()
+        
+        # Execute the aggregated query for the specific Asset Manager
+        result = SERVICING_MANAGER_QUERY.fetchone(
+            cursor,
+            asset_manager=asset_manager,
+            **quarter_date_params(start_date, end_date)
+        )
+        
+        if result:
+            cash_flow_data = {
+                'asset_manager': result[0],
+                'total_collections': result[1],
+                'total_amount': round(float(result[2]), 2),
+                'cash_flow_amount': round(float(result[3]), 2),
+                'cf_amount': round(float(result[4]), 2),
+                'ssa_amount': round(float(result[5]), 2),
+                'legal_amount': round(float(result[6]), 2),
+                'non_cf_amount': round(float(result[7]), 2),
+                'cf_collections_count': result[8],
+                'cf_count': result[9],
+                'ssa_count': result[10],
+                'legal_count': result[11],
+                'non_cf_count': result[12],
+                'ncf_count': result[13],
+                'quarter': f'{quarter} {year}',
+                'query_period': f'{start_date} to {end_date}'
+            }
+        else:
+            cash_flow_data = {
+                'asset_manager': asset_manager,
+                'total_collections': 0,
+                'total_amount': 0,
+                'cash_flow_amount': 0,
+                'cf_amount': 0,
+                'ssa_amount': 0,
+                'legal_amount': 0,
+                'non_cf_amount': 0,
+                'cf_collections_count': 0,
+                'cf_count': 0,
+                'ssa_count': 0,
+                'legal_count': 0,
+                'non_cf_count': 0,
+                'ncf_count': 0,
+                'quarter': f'{quarter} {year}',
+                'query_period': f'{start_date} to {end_date}',
+                'note': 'No data found for this Asset Manager'
+            }
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify(cash_flow_data), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/legal/performance/<legal_manager>', methods=['GET'])
+def get_legal_manager_performance(legal_manager):
+    """Get aggregated Legal performance data for a specific Legal Manager from SQL Server"""
+    try:
+        if not SQL_SERVER_AVAILABLE:
+            return jsonify({'error': 'SQL Server connection not available. Please install pymssql.'}), 500
+            
+        # Get quarter parameter from request
+        quarter = request.args.get('quarter', 'Q4')
+        year = request.args.get('year', '2024')
+        
+        # Get quarter date range
+        quarter_range = QUARTER_DATES.get(quarter, QUARTER_DATES['Q4'])
+        start_date = f"{year}-{quarter_range['start']}"
+        end_date = f"{year}-{quarter_range['end']}"
+        
+        # Connect to SQL Server
+        conn = connect_sql_server()
+        
+        cursor = conn.cursor()
+        
+        # Execute the aggregated query for the specific Legal Manager
+        result = LEGAL_MANAGER_PERFORMANCE_QUERY.fetchone(
+            cursor,
+            legal_manager=legal_manager,
+            **quarter_date_params(start_date, end_date)
+        )
+        
+        if result:
+            legal_performance_data = {
+                'legal_manager': result[0],
+                'lawsuit_presentation_count': result[1] or 0,
+                'auction_amount': round(float(result[2]), 2) if result[2] else 0,
+                'cdr_amount': round(float(result[3]), 2) if result[3] else 0,
+                'testimonies_amount': round(float(result[4]), 2) if result[4] else 0,
+                'possessions_amount': round(float(result[5]), 2) if result[5] else 0,
+                'cic_amount': round(float(result[6]), 2) if result[6] else 0,
+                'total_legal_acts': result[7] or 0,
+                'quarter': f'{quarter} {year}',
+                'query_period': f'{start_date} to {end_date}'
+            }
+        else:
+            legal_performance_data = {
+                'legal_manager': legal_manager,
+                'lawsuit_presentation_count': 0,
+                'auction_amount': 0,
+                'cdr_amount': 0,
+                'testimonies_amount': 0,
+                'possessions_amount': 0,
+                'cic_amount': 0,
+                'total_legal_acts': 0,
+                'quarter': f'{quarter} {year}',
+                'query_period': f'{start_date} to {end_date}',
+                'note': 'No data found for this Legal Manager'
+            }
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify(legal_performance_data), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/legal/acts', methods=['GET'])
+def export_legal_acts():
+    """Stream the legal acts behind the Legal Team aggregates as NDJSON"""
+    try:
+        if not SQL_SERVER_AVAILABLE:
+            return jsonify({'error': 'SQL Server connection not available. Please install pymssql.'}), 500
+        
+        quarter = request.args.get('quarter', 'Q4')
+        year = request.args.get('year', '2024')
+        
+        quarter_range = QUARTER_DATES.get(quarter, QUARTER_DATES['Q4'])
+        start_date = f"{year}-{quarter_range['start']}"
+        end_date = f"{year}-{quarter_range['end']}"
+        
+        return stream_sql_server_rows(
+            LEGAL_TEAM_QUERY,
+            f'legal_acts_{quarter}_{year}.ndjson',
+            **quarter_date_params(start_date, end_date)
+        ), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/servicing/collections', methods=['GET'])
+def export_servicing_collections():
+    """Stream the collections behind the Servicing aggregates as NDJSON (optionally one Asset Manager)"""
+    try:
+        if not SQL_SERVER_AVAILABLE:
+            return jsonify({'error': 'SQL Server connection not available. Please install pymssql.'}), 500
+        
+        quarter = request.args.get('quarter', 'Q4')
+        year = request.args.get('year', '2024')
+        asset_manager = request.args.get('asset_manager')
+        
+        quarter_range = QUARTER_DATES.get(quarter, QUARTER_DATES['Q4'])
+        start_date = f"{year}-{quarter_range['start']}"
+        end_date = f"{year}-{quarter_range['end']}"
+        params = quarter_date_params(start_date, end_date)
+        
+        if asset_manager:
+            return stream_sql_server_rows(
+                SERVICING_MANAGER_COLLECTIONS_QUERY,
+                f'collections_{asset_manager}_{quarter}_{year}.ndjson',
+                asset_manager=asset_manager,
+                **params
+            ), 200
+        
+        return stream_sql_server_rows(
+            SERVICING_COLLECTIONS_QUERY,
+            f'collections_{quarter}_{year}.ndjson',
+            **params
+        ), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
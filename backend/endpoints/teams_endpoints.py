@@ -1,32 +1,50 @@
 """
 Teams API Endpoints
-==================
+===================
 
 This file contains all team-related API endpoints including:
-- Team CRUD operations
+- Team listing and details
 - Team member management
-- Excel template download/upload
+- Excel template download, results export and member uploads
 - Team data retrieval
 """
 
-import os
-from flask import request, jsonify, send_file
+import importlib.util
 from datetime import datetime
 from io import BytesIO
-from models import db, Team, Employee, TeamMemberData, LegalTeamData, ServicingTeamData, LoanTeamData
 
-# Check if pandas is available for Excel operations
-try:
-    import pandas as pd
-    import openpyxl
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
+from flask import Blueprint, Response, request, jsonify, send_file
+from sqlalchemy import update
 
+import team_schemas
+from conditional import stamp_query
+from employee_cache import employee_cache
+from models import db, Team, Employee, TeamMemberData, TEAM_DATA_MODELS
+from read_replica import read_replica
+from streaming import STREAM_BATCH_SIZE, json_object_chunks, stream_response
 
+# Excel support is optional. The excel_* and upload_formats modules pull in
+# pandas/openpyxl, so handlers import them on first use rather than at startup
+PANDAS_AVAILABLE = (
+    importlib.util.find_spec('pandas') is not None
+    and importlib.util.find_spec('openpyxl') is not None
+)
+
+bp = Blueprint('teams', __name__)
+
+@bp.route('/api/teams', methods=['GET'])
+@read_replica
 def get_teams():
     """Get all teams"""
     try:
+        # Employee counts per team feed both the version stamp and the body
+        employee_counts = dict(
+            db.session.query(Employee.team_id, db.func.count(Employee.id)).group_by(Employee.team_id).all()
+        )
+        stamp = stamp_query(Team.query, Team.id, [Team.created_at], sorted(employee_counts.items()))
+        if stamp.is_fresh(request):
+            return stamp.not_modified()
+        
         teams = Team.query.all()
         teams_data = []
         
@@ -35,36 +53,43 @@ def get_teams():
                 'id': team.id,
                 'name': team.name,
                 'description': team.description,
-                'created_at': team.created_at.isoformat() if team.created_at else None,
-                'employee_count': len(team.employees)
+                'employee_count': employee_counts.get(team.id, 0),
+                'created_at': team.created_at.isoformat()
             }
             teams_data.append(team_data)
         
-        return jsonify(teams_data), 200
+        return stamp.apply(jsonify(teams_data)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-
+@bp.route('/api/teams/<int:team_id>', methods=['GET'])
 def get_team(team_id):
     """Get specific team details"""
     try:
         team = Team.query.get_or_404(team_id)
-        
         team_data = {
             'id': team.id,
             'name': team.name,
             'description': team.description,
-            'created_at': team.created_at.isoformat() if team.created_at else None,
-            'employee_count': len(team.employees),
             'employees': [
                 {
                     'id': emp.id,
-                    'name': f"{emp.name} {emp.surname}",
+                    'name': emp.name,
+                    'surname': emp.surname,
                     'employee_code': emp.employee_code,
-                    'category': emp.category,
-                    'created_at': emp.created_at.isoformat() if emp.created_at else None
-                }
-                for emp in team.employees
+                    'category': emp.category
+                } for emp in team.employees
+            ],
+            'incentive_parameters': [
+                {
+                    'id': param.id,
+                    'parameter_name': param.parameter_name,
+                    'base_value': param.base_value,
+                    'multiplier': param.multiplier,
+                    'min_threshold': param.min_threshold,
+                    'max_threshold': param.max_threshold,
+                    'is_active': param.is_active
+                } for param in team.incentive_parameters
             ]
         }
         
@@ -72,108 +97,86 @@ def get_team(team_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-
+@bp.route('/api/teams/<int:team_id>/download-template', methods=['GET'])
 def download_team_template(team_id):
-    """Download Excel template for team member data"""
-    if not PANDAS_AVAILABLE:
-        return jsonify({'error': 'Excel functionality not available. Please install pandas and openpyxl.'}), 500
-        
+    """Download Excel template for team members"""
     try:
+        if not PANDAS_AVAILABLE:
+            return jsonify({'error': 'Excel processing not available. Please install pandas and openpyxl.'}), 500
+        
+        import excel_templates
+        
         team = Team.query.get_or_404(team_id)
+        team_name = team_schemas.normalize_team_type(team.name)
         
-        # Create team-specific templates
-        if team_id == 1:  # Legal Team
-            template_data = {
-                'Legal Manager': ['John Smith', 'Jane Doe'],
-                'Employee #': ['EMP001', 'EMP002'],
-                'Category': ['Associate', 'Analyst'],
-                'Quarterly Incentive': [5000.0, 3000.0],
-                'Team Leader': ['Team Lead 1', 'Team Lead 2'],
-                'Lawsuit Presentation Target (#)': [10, 8],
-                'Auction Target (€)': [50000.0, 40000.0],
-                'CDR Target (€)': [30000.0, 25000.0],
-                'Testimonies Target (€)': [20000.0, 15000.0],
-                'Possessions Target (€)': [40000.0, 35000.0],
-                'CIC Target (€)': [25000.0, 20000.0]
-            }
-        elif team_id == 3:  # Servicing Team
-            template_data = {
-                'Asset/Sales Manager': ['Manager A', 'Manager B'],
-                'Employee #': ['EMP003', 'EMP004'],
-                'Category': ['Associate', 'Analyst'],
-                'Quarter Incentive Base': [4000.0, 2500.0],
-                'Team Leader': ['Team Lead 3', 'Team Lead 4'],
-                'Main Portfolio': ['Portfolio A', 'Portfolio B'],
-                'Cash Flow': [100000.0, 80000.0],
-                'Cash Flow Target': [120000.0, 100000.0],
-                'NCF': [50000.0, 40000.0],
-                'NCF Target': [60000.0, 50000.0]
-            }
-        elif team_id == 2:  # Loan Team
-            template_data = {
-                'Loan Manager': ['Manager C', 'Manager D'],
-                'Employee #': ['EMP005', 'EMP006'],
-                'Category': ['Associate', 'Analyst'],
-                'Quarter Incentive Base': [3500.0, 2200.0],
-                'Team Leader': ['Team Lead 5', 'Team Lead 6'],
-                'Portfolio': ['Loan Portfolio A', 'Loan Portfolio B'],
-                'Loan Amount': [500000.0, 400000.0],
-                'Loan Target': [600000.0, 500000.0],
-                'NPL Amount': [50000.0, 40000.0],
-                'NPL Target': [45000.0, 35000.0],
-                'Recovery Rate': [0.85, 0.80],
-                'Recovery Target': [0.90, 0.85]
-            }
-        else:
-            return jsonify({'error': 'Invalid team ID'}), 400
+        if team_name not in team_schemas.SCHEMAS:
+            return jsonify({'error': f'Invalid team type: {team_name}'}), 400
         
-        # Create DataFrame and Excel file
-        df = pd.DataFrame(template_data)
+        # Templates are prebuilt once per team type; repeat downloads get a 304
+        payload, etag = excel_templates.get_template(team_name, f"{team.name} Members")
         
-        # Create Excel file in memory
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name=f'{team.name} Template', index=False)
-            
-            # Format the worksheet
-            workbook = writer.book
-            worksheet = writer.sheets[f'{team.name} Template']
-            
-            # Auto-adjust column widths
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 30)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-        
-        output.seek(0)
-        
-        filename = f"{team.name}_Members_Template.xlsx"
-        
-        return send_file(
-            output,
+        response = send_file(
+            BytesIO(payload),
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
             as_attachment=True,
-            download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            download_name=f'{team.name}_Members_Template.xlsx',
+            etag=etag
         )
+        response.cache_control.no_cache = True
+        return response
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@bp.route('/api/teams/<int:team_id>/export', methods=['GET'])
+def export_team_results(team_id):
+    """Export a team's quarterly results (inputs and calculated incentives) as Excel"""
+    try:
+        if not PANDAS_AVAILABLE:
+            return jsonify({'error': 'Excel processing not available. Please install pandas and openpyxl.'}), 500
+        
+        import excel_export
+        
+        team = Team.query.get_or_404(team_id)
+        team_name = team_schemas.normalize_team_type(team.name)
+        
+        if team_name not in team_schemas.SCHEMAS:
+            return jsonify({'error': f'Invalid team type: {team_name}'}), 400
+        
+        quarter = request.args.get('quarter', 'Q4')
+        year = int(request.args.get('year', 2024))
+        
+        # Stream rows from the database instead of loading them all at once
+        team_members = TeamMemberData.query.filter_by(
+            team_id=team_id,
+            quarter=quarter,
+            year=year
+        ).order_by(TeamMemberData.id).yield_per(500)
+        
+        output = excel_export.write_team_export(f"{team.name} {quarter} {year}", team_name, team_members)
+        
+        return Response(
+            excel_export.iter_file_chunks(output),
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            headers={'Content-Disposition': f'attachment; filename="{team.name}_{quarter}_{year}_Results.xlsx"'}
+        )
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
+@bp.route('/api/teams/<int:team_id>/upload-members', methods=['POST'])
 def upload_team_members(team_id):
-    """Upload team member data from Excel file"""
-    if not PANDAS_AVAILABLE:
-        return jsonify({'error': 'Excel functionality not available. Please install pandas and openpyxl.'}), 500
-        
+    """Upload team members from an Excel, CSV or Parquet file"""
     try:
+        if not PANDAS_AVAILABLE:
+            return jsonify({'error': 'Excel processing not available. Please install pandas and openpyxl.'}), 500
+        
+        import upload_formats
+        
         team = Team.query.get_or_404(team_id)
+        schema = team_schemas.get_schema(team.name)
+        if schema is None:
+            return jsonify({'error': f'Invalid team type: {team_schemas.normalize_team_type(team.name)}'}), 400
         
         if 'file' not in request.files:
             return jsonify({'error': 'No file provided'}), 400
@@ -182,367 +185,232 @@ def upload_team_members(team_id):
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
-        if not file.filename.lower().endswith(('.xlsx', '.xls')):
-            return jsonify({'error': 'Invalid file format. Please upload an Excel file.'}), 400
-        
-        # Read the Excel file
+        # Read the file into a DataFrame (.xlsx, .csv or .parquet)
         try:
-            df = pd.read_excel(file)
-        except Exception as e:
-            return jsonify({'error': f'Error reading Excel file: {str(e)}'}), 400
+            df = upload_formats.read_upload(file, schema)
+        except upload_formats.UnsupportedUploadFormat as e:
+            return jsonify({'error': str(e)}), 400
         
         # Get current quarter and year
         current_date = datetime.now()
-        current_quarter = f"Q{(current_date.month - 1) // 3 + 1}"
         current_year = current_date.year
+        current_month = current_date.month
+        current_quarter = f'Q{(current_month - 1) // 3 + 1}'
         
-        # Clear existing data for this team/quarter/year
-        TeamMemberData.query.filter_by(
-            team_id=team_id,
-            quarter=current_quarter,
-            year=current_year
-        ).delete()
+        # Check for missing required columns
+        missing_columns = schema.missing_headers(df.columns)
+        if missing_columns:
+            return jsonify({'error': f'Missing required columns: {", ".join(missing_columns)}'}), 400
+        
+        # Validate and coerce every row through the schema's precomputed plan
+        rows = schema.decode_frame(df)
+        for row in rows:
+            row['quarter'] = current_quarter
+            row['year'] = current_year
+        
+        # Clear existing data for this quarter/year
+        model = TEAM_DATA_MODELS[schema.team_type]
+        model.query.filter_by(quarter=current_quarter, year=current_year).delete()
         
-        # Process data based on team type
-        processed_count = 0
-        
-        for index, row in df.iterrows():
-            try:
-                if team_id == 1:  # Legal Team
-                    member_data = TeamMemberData(
-                        team_id=team_id,
-                        quarter=current_quarter,
-                        year=current_year,
-                        employee_name=str(row.get('Legal Manager', '')),
-                        employee_code=str(row.get('Employee #', '')),
-                        category=str(row.get('Category', '')),
-                        team_leader=str(row.get('Team Leader', '')),
-                        legal_manager=str(row.get('Legal Manager', '')),
-                        quarterly_incentive=float(row.get('Quarterly Incentive', 0)),
-                        lawsuit_presentation_target=float(row.get('Lawsuit Presentation Target (#)', 0)),
-                        auction_target=float(row.get('Auction Target (€)', 0)),
-                        cdr_target=float(row.get('CDR Target (€)', 0)),
-                        testimonies_target=float(row.get('Testimonies Target (€)', 0)),
-                        possessions_target=float(row.get('Possessions Target (€)', 0)),
-                        cic_target=float(row.get('CIC Target (€)', 0))
-                    )
-                elif team_id == 3:  # Servicing Team
-                    member_data = TeamMemberData(
-                        team_id=team_id,
-                        quarter=current_quarter,
-                        year=current_year,
-                        employee_name=str(row.get('Asset/Sales Manager', '')),
-                        employee_code=str(row.get('Employee #', '')),
-                        category=str(row.get('Category', '')),
-                        team_leader=str(row.get('Team Leader', '')),
-                        asset_sales_manager=str(row.get('Asset/Sales Manager', '')),
-                        quarter_incentive_base=float(row.get('Quarter Incentive Base', 0)),
-                        main_portfolio=str(row.get('Main Portfolio', '')),
-                        cash_flow=float(row.get('Cash Flow', 0)),
-                        cash_flow_target=float(row.get('Cash Flow Target', 0)),
-                        ncf=float(row.get('NCF', 0)),
-                        ncf_target=float(row.get('NCF Target', 0))
-                    )
-                elif team_id == 2:  # Loan Team
-                    member_data = TeamMemberData(
-                        team_id=team_id,
-                        quarter=current_quarter,
-                        year=current_year,
-                        employee_name=str(row.get('Loan Manager', '')),
-                        employee_code=str(row.get('Employee #', '')),
-                        category=str(row.get('Category', '')),
-                        team_leader=str(row.get('Team Leader', ''))
-                    )
-                
-                db.session.add(member_data)
-                processed_count += 1
-                
-            except Exception as row_error:
-                print(f"Error processing row {index + 1}: {str(row_error)}")
-                continue
+        db.session.bulk_insert_mappings(model, rows)
         
+        # Commit all changes
         db.session.commit()
         
         return jsonify({
-            'message': f'Successfully uploaded {processed_count} team members',
-            'team_name': team.name,
+            'message': 'Data uploaded successfully',
+            'team': team.name,
             'quarter': current_quarter,
             'year': current_year,
-            'processed_count': processed_count
+            'processed_count': len(rows)
         }), 200
         
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
-
+@bp.route('/api/teams/<int:team_id>/save-members', methods=['POST'])
 def save_team_members(team_id):
-    """Save team member data (alternative to upload)"""
+    """Save uploaded team members to database"""
     try:
         team = Team.query.get_or_404(team_id)
         data = request.get_json()
         
-        if not data or 'members' not in data:
-            return jsonify({'error': 'No member data provided'}), 400
+        if 'employees' not in data:
+            return jsonify({'error': 'No employees data provided'}), 400
         
-        current_date = datetime.now()
-        current_quarter = f"Q{(current_date.month - 1) // 3 + 1}"
-        current_year = current_date.year
+        employees_data = data['employees']
+        quarter = data.get('quarter', 'Q4')
+        year = data.get('year', 2024)
+        saved_count = 0
         
-        # Clear existing data for this team/quarter/year
+        # Clear existing data for this team, quarter, and year
         TeamMemberData.query.filter_by(
-            team_id=team_id,
-            quarter=current_quarter,
-            year=current_year
+            team_id=team_id, 
+            quarter=quarter, 
+            year=year
         ).delete()
         
-        # Save new data
-        saved_count = 0
-        for member_data in data['members']:
-            new_member = TeamMemberData(
-                team_id=team_id,
-                quarter=current_quarter,
-                year=current_year,
-                **member_data
-            )
-            db.session.add(new_member)
+        # Get employee name and code based on team type ('Legal' and 'Legal Team' alike)
+        if team_schemas.normalize_team_type(team.name) == 'legal':
+            name_field, code_field = team_schemas.SCHEMAS['legal'].member_key_fields
+        else:  # Servicing team
+            name_field, code_field = team_schemas.SCHEMAS['servicing'].member_key_fields
+        
+        # Current state of every employee in the payload, in one query (this
+        # also refreshes the employee cache for the reads that follow)
+        known_employees = employee_cache.get_many_by_code(
+            [emp_data[code_field] for emp_data in employees_data if emp_data.get(code_field)], refresh=True
+        )
+        new_employees = {}  # employee_code -> Employee
+        employee_updates = {}  # id -> changed values
+        
+        for emp_data in employees_data:
+            employee_name = emp_data.get(name_field, '')
+            employee_code = emp_data.get(code_field, '')
+            
+            # Split name into first and last name
+            name_parts = employee_name.split(' ', 1)
+            first_name = name_parts[0] if name_parts else ''
+            last_name = name_parts[1] if len(name_parts) > 1 else ''
+            values = {
+                'name': first_name,
+                'surname': last_name,
+                'category': emp_data.get('category', 'Associate'),
+                'team_id': team_id
+            }
+            
+            # Create or update employee record; unchanged employees are not written.
+            # A row without a code is still saved below, just without an employee
+            if employee_code:
+                known = known_employees.get(employee_code)
+                if known is not None:
+                    if any(getattr(known, key) != value for key, value in values.items()):
+                        employee_updates[known.id] = {'id': known.id, **values}
+                    else:
+                        employee_updates.pop(known.id, None)  # The last row for a code wins
+                elif employee_code in new_employees:
+                    for key, value in values.items():
+                        setattr(new_employees[employee_code], key, value)
+                else:
+                    new_employees[employee_code] = Employee(employee_code=employee_code, **values)
+                    db.session.add(new_employees[employee_code])
+            
+            # Create team member data record
+            team_member = TeamMemberData(**{
+                **team_schemas.member_values(emp_data),
+                'team_id': team_id,
+                'quarter': quarter,
+                'year': year,
+                'employee_name': employee_name,
+                'employee_code': employee_code
+            })
+            
+            db.session.add(team_member)
             saved_count += 1
         
+        if employee_updates:
+            # Bulk UPDATE by primary key, one executemany
+            db.session.execute(update(Employee), list(employee_updates.values()))
         db.session.commit()
         
         return jsonify({
             'message': f'Successfully saved {saved_count} team members',
-            'team_name': team.name,
-            'quarter': current_quarter,
-            'year': current_year
+            'saved_count': saved_count,
+            'team': team.name,
+            'quarter': quarter,
+            'year': year
         }), 200
         
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
-
+@bp.route('/api/teams/<int:team_id>/members', methods=['GET'])
+@read_replica
 def get_team_members(team_id):
-    """Get team members"""
+    """Get saved team members from local database"""
     try:
         team = Team.query.get_or_404(team_id)
+        quarter = request.args.get('quarter', 'Q4')
+        year = int(request.args.get('year', 2024))
         
-        # Get quarter and year from request
-        quarter = request.args.get('quarter', f"Q{(datetime.now().month - 1) // 3 + 1}")
-        year = int(request.args.get('year', datetime.now().year))
-        
-        members = TeamMemberData.query.filter_by(
+        # Get team members from local database
+        query = TeamMemberData.query.filter_by(
             team_id=team_id,
             quarter=quarter,
             year=year
-        ).all()
-        
-        members_data = []
-        for member in members:
-            member_dict = {
-                'id': member.id,
-                'employee_name': member.employee_name,
-                'employee_code': member.employee_code,
-                'category': member.category,
-                'team_leader': member.team_leader,
-                'quarter': member.quarter,
-                'year': member.year,
-                'created_at': member.created_at.isoformat() if member.created_at else None
-            }
-            
-            # Add team-specific fields
-            if team_id == 1:  # Legal Team
-                member_dict.update({
-                    'legal_manager': member.legal_manager,
-                    'quarterly_incentive': member.quarterly_incentive,
-                    'lawsuit_presentation_target': member.lawsuit_presentation_target,
-                    'auction_target': member.auction_target,
-                    'cdr_target': member.cdr_target,
-                    'testimonies_target': member.testimonies_target,
-                    'possessions_target': member.possessions_target,
-                    'cic_target': member.cic_target
-                })
-            elif team_id == 3:  # Servicing Team
-                member_dict.update({
-                    'asset_sales_manager': member.asset_sales_manager,
-                    'quarter_incentive_base': member.quarter_incentive_base,
-                    'main_portfolio': member.main_portfolio,
-                    'cash_flow': member.cash_flow,
-                    'cash_flow_target': member.cash_flow_target,
-                    'ncf': member.ncf,
-                    'ncf_target': member.ncf_target
-                })
-            
-            members_data.append(member_dict)
+        )
         
-        return jsonify({
-            'team_id': team_id,
-            'team_name': team.name,
-            'quarter': quarter,
-            'year': year,
-            'members_count': len(members_data),
-            'members': members_data
-        }), 200
+        stamp = stamp_query(query, TeamMemberData.id, [TeamMemberData.created_at, TeamMemberData.updated_at], team.name)
+        if stamp.is_fresh(request):
+            return stamp.not_modified()
+        
+        # Streamed straight from the cursor; the envelope keys come first
+        team_members = query.order_by(TeamMemberData.id).yield_per(STREAM_BATCH_SIZE)
+        fields = {'team_id': team_id, 'team_name': team.name, 'quarter': quarter, 'year': year}
+        chunks = json_object_chunks(fields, 'members', team_members, team_schemas.encode_member, count_key='count')
+        
+        return stamp.apply(stream_response(chunks)), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-
+@bp.route('/api/teams/<int:team_id>/uploaded-data', methods=['GET'])
+@read_replica
 def get_uploaded_team_data(team_id):
-    """Get uploaded team data for display"""
+    """Get uploaded data for a specific team"""
     try:
         team = Team.query.get_or_404(team_id)
         
-        # Get the most recent uploaded data for this team
-        latest_data = TeamMemberData.query.filter_by(team_id=team_id).order_by(
-            TeamMemberData.year.desc(),
-            TeamMemberData.quarter.desc(),
-            TeamMemberData.created_at.desc()
-        ).all()
+        # Get quarter and year from query params (default to current)
+        current_date = datetime.now()
+        quarter = request.args.get('quarter', f'Q{(current_date.month - 1) // 3 + 1}')
+        year = request.args.get('year', str(current_date.year))
         
-        if not latest_data:
-            return jsonify({
-                'team_id': team_id,
-                'team_name': team.name,
-                'data': [],
-                'message': 'No data uploaded yet'
-            }), 200
-        
-        # Convert to list of dictionaries
-        data_list = []
-        for item in latest_data:
-            # Create a dictionary with all non-null fields
-            item_dict = {}
-            
-            # Add common fields
-            if item.employee_name:
-                item_dict['Employee Name'] = item.employee_name
-            if item.employee_code:
-                item_dict['Employee Code'] = item.employee_code
-            if item.category:
-                item_dict['Category'] = item.category
-            if item.team_leader:
-                item_dict['Team Leader'] = item.team_leader
-            
-            # Add team-specific fields based on team type
-            if team_id == 1:  # Legal Team
-                if item.legal_manager:
-                    item_dict['Legal Manager'] = item.legal_manager
-                if item.quarterly_incentive:
-                    item_dict['Quarterly Incentive'] = item.quarterly_incentive
-                if item.lawsuit_presentation_target:
-                    item_dict['Lawsuit Presentation Target'] = item.lawsuit_presentation_target
-                if item.auction_target:
-                    item_dict['Auction Target'] = item.auction_target
-                if item.cdr_target:
-                    item_dict['CDR Target'] = item.cdr_target
-                if item.testimonies_target:
-                    item_dict['Testimonies Target'] = item.testimonies_target
-                if item.possessions_target:
-                    item_dict['Possessions Target'] = item.possessions_target
-                if item.cic_target:
-                    item_dict['CIC Target'] = item.cic_target
-                    
-            elif team_id == 3:  # Servicing Team
-                if item.asset_sales_manager:
-                    item_dict['Asset/Sales Manager'] = item.asset_sales_manager
-                if item.quarter_incentive_base:
-                    item_dict['Quarter Incentive Base'] = item.quarter_incentive_base
-                if item.main_portfolio:
-                    item_dict['Main Portfolio'] = item.main_portfolio
-                if item.cash_flow:
-                    item_dict['Cash Flow'] = item.cash_flow
-                if item.cash_flow_target:
-                    item_dict['Cash Flow Target'] = item.cash_flow_target
-                if item.ncf:
-                    item_dict['NCF'] = item.ncf
-                if item.ncf_target:
-                    item_dict['NCF Target'] = item.ncf_target
-            
-            # Add quarter and year
-            item_dict['Quarter'] = item.quarter
-            item_dict['Year'] = item.year
-            
-            data_list.append(item_dict)
+        schema = team_schemas.get_schema(team.name)
+        if schema is None:
+            return jsonify({'error': f'Invalid team type: {team_schemas.normalize_team_type(team.name)}'}), 400
         
-        return jsonify({
-            'team_id': team_id,
-            'team_name': team.name,
-            'data': data_list,
-            'count': len(data_list)
-        }), 200
+        model = TEAM_DATA_MODELS[schema.team_type]
+        query = model.query.filter_by(quarter=quarter, year=year)
+        
+        stamp = stamp_query(query, model.id, [model.created_at, model.updated_at], team.name)
+        if stamp.is_fresh(request):
+            return stamp.not_modified()
+        
+        team_data = [schema.encode(d) for d in query.all()]
+        
+        return stamp.apply(jsonify({
+            'team': team.name,
+            'quarter': quarter,
+            'year': year,
+            'data': team_data
+        })), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-
+@bp.route('/api/seed-teams', methods=['POST'])
 def seed_teams():
-    """Seed initial team data"""
+    """Seed initial teams"""
     try:
         # Check if teams already exist
         if Team.query.count() > 0:
-            return jsonify({'message': 'Teams already exist'}), 200
-        
-        # Create default teams
-        teams_data = [
-            {'name': 'Legal', 'description': 'Legal team responsible for lawsuit presentations, auctions, and legal processes'},
-            {'name': 'Loan', 'description': 'Loan team handling loan management and NPL recovery'},
-            {'name': 'Servicing', 'description': 'Servicing team managing cash flow and asset collections'}
+            return jsonify({'message': 'Teams already seeded'}), 200
+
+        # Create teams
+        teams = [
+            Team(name='Legal', description='Legal Team'),
+            Team(name='Loan', description='Loan Team'),
+            Team(name='Servicing', description='Servicing Team')
         ]
         
-        created_teams = []
-        for team_data in teams_data:
-            team = Team(
-                name=team_data['name'],
-                description=team_data['description']
-            )
-            db.session.add(team)
-            created_teams.append(team_data['name'])
-        
+        db.session.add_all(teams)
         db.session.commit()
         
-        return jsonify({
-            'message': 'Successfully created teams',
-            'teams': created_teams
-        }), 201
+        return jsonify({'message': 'Teams seeded successfully'}), 201
         
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
-
-
-# Export the route handlers
-teams_routes = {
-    '/api/teams': {
-        'handler': get_teams,
-        'methods': ['GET']
-    },
-    '/api/teams/<int:team_id>': {
-        'handler': get_team,
-        'methods': ['GET']
-    },
-    '/api/teams/<int:team_id>/download-template': {
-        'handler': download_team_template,
-        'methods': ['GET']
-    },
-    '/api/teams/<int:team_id>/upload-members': {
-        'handler': upload_team_members,
-        'methods': ['POST']
-    },
-    '/api/teams/<int:team_id>/save-members': {
-        'handler': save_team_members,
-        'methods': ['POST']
-    },
-    '/api/teams/<int:team_id>/members': {
-        'handler': get_team_members,
-        'methods': ['GET']
-    },
-    '/api/teams/<int:team_id>/uploaded-data': {
-        'handler': get_uploaded_team_data,
-        'methods': ['GET']
-    },
-    '/api/seed-teams': {
-        'handler': seed_teams,
-        'methods': ['POST']
-    }
-} 
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Excel Export
+============
+
+Streaming Excel export of team member data and calculated incentives.
+
+Rows are written through an openpyxl write-only workbook so memory use stays
+constant no matter how many team members are exported. The columns are the
+member columns of the team schema registry: inputs first, then calculated
+incentives.
+"""
+
+import pickle
+import tempfile
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+from team_schemas import SCHEMAS
+
+# Size of the chunks sent to the client
+CHUNK_SIZE = 64 * 1024
+
+# Column width limits (in characters)
+MIN_COLUMN_WIDTH = 8
+MAX_COLUMN_WIDTH = 50
+
+HEADER_FONT = Font(color="FFFFFF", bold=True)
+HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+
+
+def _spool_rows(records, attributes, spool):
+    """Pickle each row into the spool file and return per-column max lengths"""
+    max_lengths = [0] * len(attributes)
+    row_count = 0
+
+    for record in records:
+        values = [getattr(record, attribute) for attribute in attributes]
+        for index, value in enumerate(values):
+            if value is not None:
+                length = len(str(value))
+                if length > max_lengths[index]:
+                    max_lengths[index] = length
+        pickle.dump(values, spool, pickle.HIGHEST_PROTOCOL)
+        row_count += 1
+
+    return max_lengths, row_count
+
+
+def _replay_rows(spool, row_count):
+    """Read back the rows written by _spool_rows"""
+    spool.seek(0)
+    for _ in range(row_count):
+        yield pickle.load(spool)
+
+
+def write_team_export(sheet_title, team_type, records):
+    """
+    Write team member records to an .xlsx file and return it, rewound.
+
+    Rows are spooled to a temporary file on the first pass so column widths can
+    be tracked while writing. The write-only worksheet needs them before its
+    first row, so the rows are then replayed into the workbook.
+    """
+    schema = SCHEMAS[team_type]
+    headers = schema.export_headers
+    attributes = schema.export_fields
+
+    with tempfile.TemporaryFile() as spool:
+        max_lengths, row_count = _spool_rows(records, attributes, spool)
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title=sheet_title[:31])
+
+        # Column widths must be set before the first row is appended
+        for index, header in enumerate(headers):
+            width = max(max_lengths[index], len(header), MIN_COLUMN_WIDTH) + 2
+            ws.column_dimensions[get_column_letter(index + 1)].width = min(width, MAX_COLUMN_WIDTH)
+
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = HEADER_FONT
+            cell.fill = HEADER_FILL
+            header_cells.append(cell)
+        ws.append(header_cells)
+
+        for values in _replay_rows(spool, row_count):
+            ws.append(values)
+
+        output = tempfile.TemporaryFile()
+        wb.save(output)
+
+    output.seek(0)
+    return output
+
+
+def iter_file_chunks(fileobj, chunk_size=CHUNK_SIZE):
+    """Yield the contents of a file in chunks and close it afterwards"""
+    try:
+        while True:
+            chunk = fileobj.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        fileobj.close()
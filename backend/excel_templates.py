@@ -0,0 +1,126 @@
+"""
+Excel Templates
+===============
+
+Prebuilt Excel upload templates per team type.
+
+A template only depends on the team type, so each one is built once and kept
+as bytes. The cache entry is keyed by a fingerprint of the template
+definition taken from the team schema registry, which doubles as the ETag:
+changing the headers, sample data or instructions produces a new fingerprint
+and the stale entry is rebuilt.
+"""
+
+import hashlib
+import json
+import threading
+from io import BytesIO
+
+import openpyxl
+
+from team_schemas import SCHEMAS
+
+INSTRUCTIONS = [
+    "1. Fill in the FIXED columns (white background) with actual data",
+    "2. CALCULATED columns (blue background) will be computed automatically",
+    "3. Do not modify calculated columns - they will be overwritten",
+    "4. Save as .xlsx format before uploading",
+    "5. Ensure Employee # is unique for each team member"
+]
+
+# (team_type, sheet_title) -> (fingerprint, payload)
+_template_cache = {}
+_template_cache_lock = threading.Lock()
+
+
+def template_definition(team_type):
+    """Template headers, sample row and calculated columns from the team schema"""
+    schema = SCHEMAS[team_type]
+    return {
+        'headers': schema.headers,
+        'sample_data': schema.sample_data,
+        'calculated_columns': schema.template_calculated_columns
+    }
+
+
+def template_fingerprint(team_type, sheet_title):
+    """Hash of everything that ends up in the template"""
+    definition = {
+        'team_type': team_type,
+        'sheet_title': sheet_title,
+        'instructions': INSTRUCTIONS,
+        **template_definition(team_type)
+    }
+    encoded = json.dumps(definition, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+def build_template(team_type, sheet_title):
+    """Build the template workbook and return it as bytes"""
+    definition = template_definition(team_type)
+    headers = definition['headers']
+    sample_data = definition['sample_data']
+    calculated_columns = definition['calculated_columns']
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = sheet_title
+
+    # Add headers
+    header_font = openpyxl.styles.Font(color="FFFFFF", bold=True)
+    header_fill = openpyxl.styles.PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=1, column=col, value=header)
+        cell.font = header_font
+        cell.fill = header_fill
+
+    # Add sample data row
+    for col, value in enumerate(sample_data, 1):
+        cell = ws.cell(row=2, column=col, value=value)
+        if col in calculated_columns:  # Calculated columns
+            cell.fill = openpyxl.styles.PatternFill(start_color="E6F3FF", end_color="E6F3FF", fill_type="solid")
+            cell.font = openpyxl.styles.Font(italic=True, color="666666")
+
+    # Add instructions
+    ws.cell(row=4, column=1, value="INSTRUCTIONS:")
+    ws.cell(row=4, column=1).font = openpyxl.styles.Font(bold=True)
+
+    for i, instruction in enumerate(INSTRUCTIONS, 5):
+        ws.cell(row=i, column=1, value=instruction)
+
+    # Column widths come straight from the definition instead of a cell scan
+    for col, header in enumerate(headers, 1):
+        max_length = len(str(header))
+        if col <= len(sample_data):
+            max_length = max(max_length, len(str(sample_data[col - 1])))
+        if col == 1:
+            max_length = max([max_length] + [len(instruction) for instruction in INSTRUCTIONS])
+        ws.column_dimensions[openpyxl.utils.get_column_letter(col)].width = min(max_length + 2, 50)
+
+    output = BytesIO()
+    wb.save(output)
+    return output.getvalue()
+
+
+def get_template(team_type, sheet_title):
+    """Return (payload, etag) for a team template, building it on first use"""
+    fingerprint = template_fingerprint(team_type, sheet_title)
+    key = (team_type, sheet_title)
+
+    cached = _template_cache.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1], fingerprint
+
+    with _template_cache_lock:
+        cached = _template_cache.get(key)
+        if cached is None or cached[0] != fingerprint:
+            cached = (fingerprint, build_template(team_type, sheet_title))
+            _template_cache[key] = cached
+
+    return cached[1], fingerprint
+
+
+def clear_template_cache():
+    """Drop all prebuilt templates"""
+    with _template_cache_lock:
+        _template_cache.clear()
@@ -0,0 +1,90 @@
+"""
+Gunicorn configuration for serving the API in production.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+- The app is imported once in the master (preload_app) and the workers are
+  forked from it, so startup cost and read-only module state (schemas,
+  queries, templates) are paid once and pages are shared copy-on-write.
+- Each worker gets its own database connection pool and SQL Server thread
+  pool after fork. Nothing opened in the master is shared.
+- Workers are recycled after max_requests (with jitter) to bound memory
+  growth.
+- Metrics are summed across workers through METRICS_MULTIPROC_DIR (see
+  metrics.py), so /metrics shows the whole server whichever worker answers.
+- The dashboard snapshot and the employee cache are per worker. A commit
+  invalidates them only in the worker that handled it. Other workers can
+  serve the old values for up to DASHBOARD_SNAPSHOT_TTL (60 s) and
+  EMPLOYEE_CACHE_TTL (300 s). Lower those, or set WEB_CONCURRENCY=1 and
+  scale with GUNICORN_THREADS, where that matters.
+- Graceful reload: `kill -HUP <master>` replaces workers one by one without
+  dropping in-flight requests. With preload_app, HUP reuses the code already
+  loaded in the master. To deploy new code, send USR2 to start a new master,
+  then WINCH and QUIT to the old one.
+
+Every setting can be overridden with environment variables.
+"""
+
+import multiprocessing
+import os
+import tempfile
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '5001')}")
+
+# Shared by the workers; set before the app is loaded so create_app sees it
+metrics_dir = os.environ.setdefault(
+    'METRICS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), f"bonus-api-metrics-{bind.rsplit(':', 1)[-1]}")
+)
+
+# Throughput scales with cores: one process per core plus one, each with a
+# few threads to overlap database and SQL Server waits
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() + 1))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+
+preload_app = True
+
+# Worker recycling
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '2000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '200'))
+
+# Uploads and SQL Server refreshes can take a while
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    """Drop metric files left by a previous server"""
+    import metrics
+    metrics.clear_multiprocess_dir(metrics_dir)
+
+
+def post_fork(server, worker):
+    """Give each worker its own connection pools"""
+    from models import db
+    from wsgi import app
+
+    with app.app_context():
+        for engine in db.engines.values():
+            # Drop connections inherited from the master without closing
+            # them, since closing would affect the master's sockets too
+            engine.dispose(close=False)
+
+    # The SQL Server pool is created lazily per process (sql_server.sql_server_executor)
+    server.log.info('Worker %s initialised database pools', worker.pid)
+
+
+def worker_exit(server, worker):
+    """Write the exiting worker's last metric values"""
+    import metrics
+    metrics.flush()
+
+
+def child_exit(server, worker):
+    """Fold an exited worker's metrics into the archive so totals never drop"""
+    import metrics
+    metrics.mark_process_dead(metrics_dir, worker.pid)
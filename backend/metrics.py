@@ -0,0 +1,356 @@
+"""
+Metrics
+=======
+
+In-process request and query instrumentation, exposed in Prometheus text
+format at /metrics.
+
+- Per-route latency histograms (route = URL rule, so ids do not explode the
+  label space) and request counts by status.
+- SQLAlchemy statements and ORM rows per request, counted by engine and
+  mapper event hooks.
+- External SQL Server query latency and rows by query template name.
+
+Nothing runs between requests: the hooks only add a timer and a few counter
+increments to work that is happening anyway.
+
+Under a multi-process server (gunicorn.conf.py), each worker keeps its own
+values. With METRICS_MULTIPROC_DIR set, every process writes its values to a
+file in that directory about once a second. /metrics then renders the sum of
+all files, so a scrape answered by any worker shows the whole server.
+Counters never jump backwards when a scrape lands on another worker or a
+worker is recycled. The master folds the files of exited workers into one
+archive file.
+"""
+
+import fcntl
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 1000, 10000, 100000)
+
+
+def _format_labels(labelnames, labelvalues, extra=None):
+    pairs = list(zip(labelnames, labelvalues))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def empty(self):
+        return Counter(self.name, self.documentation, self.labelnames)
+
+    def state(self):
+        """JSON-serialisable values, for the multi-process files"""
+        with self._lock:
+            return [[list(labelvalues), value] for labelvalues, value in self._values.items()]
+
+    def merge(self, state):
+        """Add the values of another process"""
+        for labelvalues, value in state:
+            self.inc(*labelvalues, amount=value)
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labelvalues, value in sorted(values.items()):
+            yield f'{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}'
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # labelvalues -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def empty(self):
+        return Histogram(self.name, self.documentation, self.labelnames, self.buckets)
+
+    def state(self):
+        """JSON-serialisable values, for the multi-process files"""
+        with self._lock:
+            return [[list(labelvalues), list(series)] for labelvalues, series in self._series.items()]
+
+    def merge(self, state):
+        """Add the values of another process"""
+        with self._lock:
+            for labelvalues, other in state:
+                series = self._series.setdefault(tuple(labelvalues), [0] * (len(self.buckets) + 2))
+                for index, value in enumerate(other):
+                    series[index] += value
+
+    def samples(self):
+        with self._lock:
+            snapshot = {labelvalues: list(series) for labelvalues, series in self._series.items()}
+        for labelvalues, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series):
+                cumulative += count
+                labels = _format_labels(self.labelnames, labelvalues, ('le', bound))
+                yield f'{self.name}_bucket{labels} {cumulative}'
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f'{self.name}_sum{labels} {_format_value(float(series[-1]))}'
+            yield f'{self.name}_count{labels} {cumulative}'
+
+
+class Registry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def snapshot(self):
+        """Every metric's values, keyed by metric name"""
+        return {metric.name: metric.state() for metric in self._metrics}
+
+    def merged(self, snapshots):
+        """A registry holding the sum of several snapshots"""
+        total = Registry()
+        for metric in self._metrics:
+            metric = total.register(metric.empty())
+            for snapshot in snapshots:
+                metric.merge(snapshot.get(metric.name, ()))
+        return total
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'http_request_duration_seconds', 'Request latency by route.', ('method', 'route')))
+REQUESTS_TOTAL = REGISTRY.register(Counter(
+    'http_requests_total', 'Requests by route and status code.', ('method', 'route', 'status')))
+DB_QUERIES_PER_REQUEST = REGISTRY.register(Histogram(
+    'db_queries_per_request', 'SQLAlchemy statements executed per request.', ('route',), COUNT_BUCKETS))
+DB_ROWS_PER_REQUEST = REGISTRY.register(Histogram(
+    'db_rows_per_request', 'ORM rows loaded per request.', ('route',), COUNT_BUCKETS))
+SQL_SERVER_QUERY_SECONDS = REGISTRY.register(Histogram(
+    'sql_server_query_duration_seconds', 'External SQL Server query latency (execute + fetch) by template.', ('query',)))
+SQL_SERVER_ROWS_TOTAL = REGISTRY.register(Counter(
+    'sql_server_rows_total', 'Rows fetched from the external SQL Server by template.', ('query',)))
+
+# Multi-process mode: per-process files summed at scrape time
+
+FLUSH_INTERVAL = 1.0
+ARCHIVE_FILE = 'archive.json'
+_multiproc = {'dir': None, 'pid': None}
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _write_json(path, data):
+    # Readers never see a partial file
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _process_files(path):
+    return glob.glob(os.path.join(path, 'process_*.json'))
+
+
+class _DirectoryLock:
+    """flock on the directory's lock file: shared for scrapes, exclusive for compaction"""
+
+    def __init__(self, path, mode):
+        self.path = os.path.join(path, '.lock')
+        self.mode = mode
+
+    def __enter__(self):
+        self.file = open(self.path, 'a')
+        fcntl.flock(self.file, self.mode)
+
+    def __exit__(self, *exc):
+        fcntl.flock(self.file, fcntl.LOCK_UN)
+        self.file.close()
+
+
+def flush():
+    """Write this process's values to the shared directory (multi-process mode only)"""
+    path = _multiproc['dir']
+    if path:
+        _write_json(os.path.join(path, f'process_{os.getpid()}.json'), REGISTRY.snapshot())
+
+
+def _flush_periodically():
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        flush()
+
+
+def _start_flushing():
+    # Threads do not survive fork, so each worker starts its own
+    if _multiproc['dir'] and _multiproc['pid'] != os.getpid():
+        _multiproc['pid'] = os.getpid()
+        threading.Thread(target=_flush_periodically, name='metrics-flush', daemon=True).start()
+
+
+def render():
+    """/metrics body: this process's metrics, or every process's in multi-process mode"""
+    path = _multiproc['dir']
+    if not path:
+        return REGISTRY.render()
+    flush()
+    with _DirectoryLock(path, fcntl.LOCK_SH):
+        snapshots = [_read_json(os.path.join(path, ARCHIVE_FILE))]
+        snapshots += [_read_json(process_file) for process_file in _process_files(path)]
+    return REGISTRY.merged(snapshots).render()
+
+
+def clear_multiprocess_dir(path):
+    """Start a server with an empty metrics directory (gunicorn master, on start)"""
+    os.makedirs(path, exist_ok=True)
+    for stale in _process_files(path) + [os.path.join(path, ARCHIVE_FILE)]:
+        if os.path.exists(stale):
+            os.remove(stale)
+
+
+def mark_process_dead(path, pid):
+    """Fold an exited worker's file into the archive (gunicorn master, child_exit)"""
+    process_file = os.path.join(path, f'process_{pid}.json')
+    if not os.path.exists(process_file):
+        return
+    with _DirectoryLock(path, fcntl.LOCK_EX):
+        archive_path = os.path.join(path, ARCHIVE_FILE)
+        archive = REGISTRY.merged([_read_json(archive_path), _read_json(process_file)])
+        _write_json(archive_path, archive.snapshot())
+        os.remove(process_file)
+
+
+# Per-request statement and row counts; only set while a request is running
+_request_stats = threading.local()
+
+
+def _on_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = getattr(_request_stats, 'value', None)
+    if stats is not None:
+        stats[0] += 1
+
+
+def _on_orm_load(target, context):
+    stats = getattr(_request_stats, 'value', None)
+    if stats is not None:
+        stats[1] += 1
+
+
+def observe_sql_server_query(name, seconds, rows):
+    """Record one external SQL Server query"""
+    SQL_SERVER_QUERY_SECONDS.observe(seconds, name)
+    SQL_SERVER_ROWS_TOTAL.inc(name, amount=rows)
+
+
+def init_metrics(app, model_base):
+    """Install request timing and SQLAlchemy counting hooks on an app"""
+    if not event.contains(Engine, 'after_cursor_execute', _on_cursor_execute):
+        event.listen(Engine, 'after_cursor_execute', _on_cursor_execute)
+    if not event.contains(model_base, 'load', _on_orm_load):
+        event.listen(model_base, 'load', _on_orm_load, propagate=True)
+
+    multiproc_dir = app.config.get('METRICS_MULTIPROC_DIR')
+    if multiproc_dir:
+        os.makedirs(multiproc_dir, exist_ok=True)
+        _multiproc['dir'] = multiproc_dir
+
+    @app.before_request
+    def _start_request_metrics():
+        _start_flushing()
+        g.metrics_start = time.perf_counter()
+        _request_stats.value = [0, 0]
+
+    @app.after_request
+    def _record_request_metrics(response):
+        start = g.pop('metrics_start', None)
+        if start is None:
+            return response
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        method = request.method
+        stats = _request_stats.value  # Still counted into while a body streams
+
+        def record(status_code):
+            REQUEST_SECONDS.observe(time.perf_counter() - start, method, route)
+            REQUESTS_TOTAL.inc(method, route, str(status_code))
+            DB_QUERIES_PER_REQUEST.observe(stats[0], route)
+            DB_ROWS_PER_REQUEST.observe(stats[1], route)
+
+        if response.is_streamed:
+            # The body is produced after this hook; record once it is closed
+            request_globals = g._get_current_object()
+            response.call_on_close(
+                lambda: record(500 if request_globals.get('stream_failed') else response.status_code)
+            )
+        else:
+            record(response.status_code)
+        return response
+
+    @app.teardown_request
+    def _clear_request_metrics(exc):
+        _request_stats.value = None
+
+    return app
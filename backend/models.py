@@ -0,0 +1,235 @@
+"""
+Database Models
+===============
+
+SQLAlchemy extension and models for the local application database.
+"""
+
+from datetime import datetime
+from flask_sqlalchemy import SQLAlchemy
+
+from read_replica import RoutingSession
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+# Quarter date ranges for local calculations
+QUARTER_DATES = {
+    'Q1': {'start': '01-01', 'end': '03-31'},
+    'Q2': {'start': '04-01', 'end': '06-30'},
+    'Q3': {'start': '07-01', 'end': '09-30'},
+    'Q4': {'start': '10-01', 'end': '12-31'}
+}
+
+# Database Models
+class Team(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    employees = db.relationship('Employee', backref='team', lazy=True)
+    team_member_data = db.relationship('TeamMemberData', backref='team', lazy=True)
+
+class Employee(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    surname = db.Column(db.String(100), nullable=False)
+    employee_code = db.Column(db.String(50), unique=True, nullable=False)
+    category = db.Column(db.String(50), nullable=False)  # Associate, Director, etc.
+    team_id = db.Column(db.Integer, db.ForeignKey('team.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    performance_records = db.relationship('PerformanceRecord', backref='employee', lazy=True)
+    bonus_calculations = db.relationship('BonusCalculation', backref='employee', lazy=True)
+
+class PerformanceRecord(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False)
+    month = db.Column(db.Integer, nullable=False)
+    year = db.Column(db.Integer, nullable=False)
+    productivity_score = db.Column(db.Float, default=0.0)
+    quality_score = db.Column(db.Float, default=0.0)
+    attendance_score = db.Column(db.Float, default=0.0)
+    overall_score = db.Column(db.Float, default=0.0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class IncentiveParameter(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    team = db.Column(db.String(50), nullable=False)  # 'Legal', 'Loan', or 'Servicing'
+    category = db.Column(db.String(50), nullable=False)  # 'Analyst' or 'Associate'
+    base_salary = db.Column(db.Float, nullable=False)
+    quarter = db.Column(db.String(2), nullable=False)  # Q1, Q2, Q3, Q4
+    year = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class BonusCalculation(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False)
+    month = db.Column(db.Integer, nullable=False)
+    year = db.Column(db.Integer, nullable=False)
+    quarter = db.Column(db.String(2), nullable=False)  # Q1, Q2, Q3, Q4
+    base_salary = db.Column(db.Float, nullable=False)
+    performance_score = db.Column(db.Float, nullable=False)
+    bonus_amount = db.Column(db.Float, nullable=False)
+    calculation_date = db.Column(db.DateTime, default=datetime.utcnow)
+
+class TeamMemberData(db.Model):
+    """Model to store detailed team member data from Excel uploads"""
+    id = db.Column(db.Integer, primary_key=True)
+    team_id = db.Column(db.Integer, db.ForeignKey('team.id'), nullable=False)
+    quarter = db.Column(db.String(10), nullable=False)  # Q1, Q2, Q3, Q4
+    year = db.Column(db.Integer, nullable=False)
+    
+    # Employee identification
+    employee_name = db.Column(db.String(200), nullable=False)
+    employee_code = db.Column(db.String(100), nullable=False)
+    category = db.Column(db.String(100))
+    team_leader = db.Column(db.String(200))
+    
+    # Legal Team specific fields
+    legal_manager = db.Column(db.String(200))
+    employee_hash = db.Column(db.String(100))
+    quarterly_incentive = db.Column(db.Float)
+    lawsuit_presentation_target = db.Column(db.Float)
+    auction_target = db.Column(db.Float)
+    cdr_target = db.Column(db.Float)
+    testimonies_target = db.Column(db.Float)
+    possessions_target = db.Column(db.Float)
+    cic_target = db.Column(db.Float)
+    
+    # Servicing Team specific fields
+    asset_sales_manager = db.Column(db.String(200))
+    employee_number = db.Column(db.String(100))
+    quarter_incentive_base = db.Column(db.Float)
+    main_portfolio = db.Column(db.String(200))
+    cash_flow = db.Column(db.Float)
+    cash_flow_target = db.Column(db.Float)
+    ncf = db.Column(db.Float)
+    ncf_target = db.Column(db.Float)
+    
+    # Calculated fields
+    cash_flow_percentage = db.Column(db.Float)
+    ncf_percentage = db.Column(db.Float)
+    incentive_cf = db.Column(db.Float)
+    total_incentive = db.Column(db.Float)
+    q1_incentive = db.Column(db.Float)
+    
+    # Legal team calculated fields
+    lawsuit_presentation = db.Column(db.Float)
+    lawsuit_presentation_percentage = db.Column(db.Float)
+    lawsuit_weight = db.Column(db.Float)
+    auction = db.Column(db.Float)
+    auction_percentage = db.Column(db.Float)
+    auction_weight = db.Column(db.Float)
+    cdr = db.Column(db.Float)
+    cdr_percentage = db.Column(db.Float)
+    cdr_weight = db.Column(db.Float)
+    testimonies = db.Column(db.Float)
+    testimonies_percentage = db.Column(db.Float)
+    testimonies_weight = db.Column(db.Float)
+    possessions = db.Column(db.Float)
+    possessions_percentage = db.Column(db.Float)
+    possessions_weight = db.Column(db.Float)
+    cic = db.Column(db.Float)
+    cic_percentage = db.Column(db.Float)
+    cic_weight = db.Column(db.Float)
+    targets_fulfillment = db.Column(db.Float)
+    incentive_percentage = db.Column(db.Float)
+    data_quality = db.Column(db.Float)
+    q4_incentive = db.Column(db.Float)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class LegalTeamData(db.Model):
+    """Model to store Legal team data from Excel uploads"""
+    id = db.Column(db.Integer, primary_key=True)
+    quarter = db.Column(db.String(2), nullable=False)  # Q1, Q2, Q3, Q4
+    year = db.Column(db.Integer, nullable=False)
+    
+    # Excel columns (exact names)
+    legal_manager = db.Column(db.String(200), nullable=False)
+    employee_number = db.Column(db.String(100), nullable=False)  # 'Employee #' in Excel
+    category = db.Column(db.String(100), nullable=False)
+    quarterly_incentive = db.Column(db.Float, nullable=False)
+    team_leader = db.Column(db.String(200), nullable=False)
+    lawsuit_presentation_target = db.Column(db.Float, nullable=False)  # 'Lawsuit Presentation Target (#)'
+    auction_target = db.Column(db.Float, nullable=False)  # 'Auction Target (€)'
+    cdr_target = db.Column(db.Float, nullable=False)  # 'CDR Target (€)'
+    testimonies_target = db.Column(db.Float, nullable=False)  # 'Testimonies Target (€)'
+    possessions_target = db.Column(db.Float, nullable=False)  # 'Possessions Target (€)'
+    cic_target = db.Column(db.Float, nullable=False)  # 'CIC Target (€)'
+    
+    # Metadata
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ServicingTeamData(db.Model):
+    """Model to store Servicing team data from Excel uploads"""
+    id = db.Column(db.Integer, primary_key=True)
+    quarter = db.Column(db.String(2), nullable=False)  # Q1, Q2, Q3, Q4
+    year = db.Column(db.Integer, nullable=False)
+    
+    # Excel columns (exact names)
+    asset_sales_manager = db.Column(db.String(200), nullable=False)  # 'Asset/Sales Manager'
+    employee_number = db.Column(db.String(100), nullable=False)
+    category = db.Column(db.String(100), nullable=False)
+    quarter_incentive_base = db.Column(db.Float, nullable=False)  # 'Quarter Incentive Base'
+    team_leader = db.Column(db.String(200), nullable=False)
+    main_portfolio = db.Column(db.String(200), nullable=False)
+    cash_flow = db.Column(db.Float, nullable=False)
+    cash_flow_target = db.Column(db.Float, nullable=False)
+    ncf = db.Column(db.Float, nullable=False)
+    ncf_target = db.Column(db.Float, nullable=False)
+    
+    # Metadata
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class LoanTeamData(db.Model):
+    """Model to store Loan team data from Excel uploads"""
+    id = db.Column(db.Integer, primary_key=True)
+    quarter = db.Column(db.String(2), nullable=False)  # Q1, Q2, Q3, Q4
+    year = db.Column(db.Integer, nullable=False)
+    
+    # Excel columns (exact names)
+    loan_manager = db.Column(db.String(200), nullable=False)
+    employee_number = db.Column(db.String(100), nullable=False)
+    category = db.Column(db.String(100), nullable=False)
+    quarter_incentive_base = db.Column(db.Float, nullable=False)
+    team_leader = db.Column(db.String(200), nullable=False)
+    portfolio = db.Column(db.String(200), nullable=False)
+    loan_amount = db.Column(db.Float, nullable=False)
+    loan_target = db.Column(db.Float, nullable=False)
+    npl_amount = db.Column(db.Float, nullable=False)
+    npl_target = db.Column(db.Float, nullable=False)
+    recovery_rate = db.Column(db.Float, nullable=False)
+    recovery_target = db.Column(db.Float, nullable=False)
+    
+    # Calculated fields
+    loan_target_percentage = db.Column(db.Float)
+    npl_target_percentage = db.Column(db.Float)
+    recovery_target_percentage = db.Column(db.Float)
+    data_quality = db.Column(db.Float)
+    total_incentive = db.Column(db.Float)
+    q4_incentive = db.Column(db.Float)
+    
+    # Metadata
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class SlowQuery(db.Model):
+    """External SQL Server query that exceeded the slow-query threshold"""
+    id = db.Column(db.Integer, primary_key=True)
+    query_name = db.Column(db.String(100), nullable=False, index=True)
+    parameters = db.Column(db.Text)  # JSON
+    duration_ms = db.Column(db.Float, nullable=False)
+    row_count = db.Column(db.Integer)
+    byte_count = db.Column(db.Integer)
+    showplan = db.Column(db.Text)  # SHOWPLAN_XML, when captured
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+# Per-team upload models, keyed like team_schemas.SCHEMAS
+TEAM_DATA_MODELS = {
+    'legal': LegalTeamData,
+    'loan': LoanTeamData,
+    'servicing': ServicingTeamData
+}
@@ -0,0 +1,132 @@
+"""
+Request Profiling
+=================
+
+On-demand cProfile capture for a single live request.
+
+Add ?__profile=1 to any API call. Profiling has to be enabled with
+PROFILING_ENABLED. If PROFILING_TOKEN is set, the request must also send it
+in the X-Admin-Token header. The handler then runs under cProfile, covering
+ORM queries, pandas parsing, openpyxl writes and JSON encoding. The stats
+are saved as a .prof file under the instance folder. The response is
+returned unchanged except for an X-Profile-Id header, and the call tree can
+be read at /api/profiles/<id>.
+
+Only the request thread is profiled: work submitted to the SQL Server thread
+pool shows up as time waiting on its futures. Streamed responses stay under
+the profiler until the response is closed, so row encoding is included. One request is profiled at a
+time. A concurrent ?__profile=1 request is served normally with
+X-Profile-Skipped.
+"""
+
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import re
+import threading
+import time
+import uuid
+
+from flask import current_app, g, request
+
+PROFILE_ID_PATTERN = re.compile(r'^[0-9]{8}T[0-9]{6}-[a-z0-9_.]+-[0-9a-f]{8}$')
+SORT_KEYS = ('cumulative', 'tottime', 'ncalls')
+
+_profiler_lock = threading.Lock()
+
+
+def is_authorized(req=None):
+    """True when profiling is enabled and the request carries the admin token"""
+    req = req or request
+    config = current_app.config
+    if not config.get('PROFILING_ENABLED'):
+        return False
+    token = config.get('PROFILING_TOKEN')
+    if not token:
+        return True
+    return hmac.compare_digest(req.headers.get('X-Admin-Token', ''), token)
+
+
+def profile_dir(app=None):
+    app = app or current_app
+    return app.config.get('PROFILE_DIR') or os.path.join(app.instance_path, 'profiles')
+
+
+def profile_path(profile_id, app=None):
+    """Path of a stored profile, or None for an id that is not well-formed"""
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    return os.path.join(profile_dir(app), f'{profile_id}.prof')
+
+
+def list_profiles(app=None):
+    """Stored profile ids, newest first"""
+    directory = profile_dir(app)
+    if not os.path.isdir(directory):
+        return []
+    names = (name[:-len('.prof')] for name in os.listdir(directory) if name.endswith('.prof'))
+    return sorted((name for name in names if PROFILE_ID_PATTERN.match(name)), reverse=True)
+
+
+def render_profile(path, sort='cumulative', limit=60):
+    """Text call tree: top functions by sort key, then who they call"""
+    output = io.StringIO()
+    stats = pstats.Stats(path, stream=output)
+    stats.strip_dirs().sort_stats(sort)
+    stats.print_stats(limit)
+    stats.print_callees(limit // 3)
+    return output.getvalue()
+
+
+def init_profiling(app):
+    """Install the ?__profile=1 request hooks on an app"""
+
+    @app.before_request
+    def _start_profile():
+        if request.args.get('__profile') != '1' or not is_authorized():
+            return
+        if not _profiler_lock.acquire(blocking=False):
+            g.profile_skipped = True
+            return
+        profiler = cProfile.Profile()
+        g.profiler = profiler
+        profiler.enable()
+
+    @app.after_request
+    def _finish_profile(response):
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            if g.pop('profile_skipped', False):
+                response.headers['X-Profile-Skipped'] = 'another request is being profiled'
+            return response
+
+        endpoint = (request.endpoint or 'unmatched').lower()
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{endpoint}-{uuid.uuid4().hex[:8]}"
+        os.makedirs(profile_dir(), exist_ok=True)
+        path = profile_path(profile_id)
+
+        def save():
+            profiler.disable()
+            _profiler_lock.release()
+            profiler.dump_stats(path)
+
+        if response.is_streamed:
+            # Keep profiling while the body is encoded; save once it is closed
+            response.call_on_close(save)
+        else:
+            save()
+
+        response.headers['X-Profile-Id'] = profile_id
+        return response
+
+    @app.teardown_request
+    def _abandon_profile(exc):
+        # after_request does not run when the handler raises
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            _profiler_lock.release()
+
+    return app
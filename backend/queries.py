@@ -0,0 +1,344 @@
+"""
+SQL Server Queries
+==================
+
+Parameterised queries against the external SQL Server.
+
+Every statement is sent through sp_executesql with typed parameters, so the
+statement text SQL Server sees never changes between quarters or managers.
+The server can reuse one cached plan per query, and values are never spliced
+into the SQL.
+
+The servicing queries join the CollectionCategoryClassification lookup
+table. Before the first of them runs, the process checks that the table
+holds every row of the current CLASSIFICATION_VERSION, and raises
+ClassificationTableError otherwise.
+"""
+
+import time
+
+import collection_categories
+import metrics
+from slow_queries import slow_query_log
+
+# sp_executesql parameter declarations
+PARAMETER_TYPES = {
+    'start_date': 'date',
+    'end_date': 'date',
+    'asset_manager': 'nvarchar(200)',
+    'legal_manager': 'nvarchar(200)',
+    'version': 'int'
+}
+
+# Rows per fetchmany call when streaming a result set
+FETCH_BATCH_SIZE = 5000
+
+
+class PreparedQuery:
+    """A stable SQL statement executed with typed sp_executesql parameters"""
+
+    def __init__(self, name, sql, params, check=None):
+        self.name = name
+        self.sql = sql
+        self.params = list(params)
+        self.check = check  # Called with the cursor before the statement runs
+
+        declarations = ', '.join(f'@{param} {PARAMETER_TYPES[param]}' for param in self.params)
+        assignments = ', '.join(f'@{param} = %({param})s' for param in self.params)
+
+        # pymssql interpolates %(name)s client-side, so only the outer EXEC
+        # carries values; the inner statement text stays constant
+        inner = sql.strip().replace("'", "''").replace('%', '%%')
+        self.statement = f"EXEC sp_executesql N'{inner}', N'{declarations}', {assignments}"
+
+    def execute(self, cursor, **params):
+        """Execute on a pymssql (or stand-in) cursor"""
+        missing = [param for param in self.params if param not in params]
+        if missing:
+            raise ValueError(f'Missing query parameters for {self.name}: {", ".join(missing)}')
+        values = {param: params[param] for param in self.params}
+        if self.check is not None:
+            self.check(cursor)
+        if hasattr(cursor, 'execute_prepared'):
+            # Local stand-in (sql_server_standin.py) runs the inner statement
+            cursor.execute_prepared(self, values)
+        else:
+            cursor.execute(self.statement, values)
+        return cursor
+
+    def fetchall(self, cursor, **params):
+        """Execute and fetch every row, recording latency and slow queries"""
+        start = time.perf_counter()
+        rows = self.execute(cursor, **params).fetchall()
+        self._observe(cursor, params, time.perf_counter() - start, rows)
+        return rows
+
+    def fetchone(self, cursor, **params):
+        """Execute and fetch the first row, recording latency and slow queries"""
+        start = time.perf_counter()
+        row = self.execute(cursor, **params).fetchone()
+        self._observe(cursor, params, time.perf_counter() - start, [] if row is None else [row])
+        return row
+
+    def iter_batches(self, cursor, batch_size=FETCH_BATCH_SIZE, **params):
+        """Execute and yield rows in fetchmany batches, for results too large to hold"""
+        # Only time spent in the driver counts as query latency, not the time
+        # the caller spends between batches (e.g. writing to a slow client)
+        start = time.perf_counter()
+        self.execute(cursor, **params)
+        seconds = time.perf_counter() - start
+        row_count = 0
+        try:
+            while True:
+                start = time.perf_counter()
+                batch = cursor.fetchmany(batch_size)
+                seconds += time.perf_counter() - start
+                if not batch:
+                    break
+                row_count += len(batch)
+                yield batch
+        finally:
+            # Also when the caller stops early (a client that disconnects)
+            metrics.observe_sql_server_query(self.name, seconds, row_count)
+            slow_query_log.observe(self, cursor, params, seconds, (), row_count=row_count)
+
+    def _observe(self, cursor, params, seconds, rows):
+        metrics.observe_sql_server_query(self.name, seconds, len(rows))
+        slow_query_log.observe(self, cursor, params, seconds, rows)
+
+
+# Collections behind the Servicing aggregates, one row per collection.
+# CF types come from the CollectionCategoryClassification lookup table (see
+# collection_categories.py); a NULL CollectionCategory counts as Non-CF.
+# The {placeholders} are filled in once below, never per request.
+COLLECTION_DETAIL_TEMPLATE = """
+    SELECT 
+        cd.ReceivedDate, 
+        cd.TotalAmount, 
+        cd.CashFlowType, 
+        cd.CollectionCategory,
+        cd.FlagColumn,
+        cc.CategoryGroupID,
+        CASE WHEN cd.CollectionCategory IS NULL THEN {non_cf} ELSE cc.CFTypeID END AS CFTypeID,
+        cd.CollectionID,
+        cd.AssetManager
+    FROM 
+        CollectionDetail AS cd
+        LEFT JOIN {lookup_table} AS cc
+            ON cc.CollectionCategory = cd.CollectionCategory
+            AND cc.Version = {version}
+    WHERE 
+        cd.Country = 'ESPANA'
+        AND cd.ReceivedDate BETWEEN @start_date AND @end_date{asset_manager_filter}
+"""
+
+# Servicing Team Query - Aggregated for Bonus Calculation
+SERVICING_TEAM_TEMPLATE = """
+SELECT 
+    AssetManager,
+    COUNT(*) as total_collections,
+    SUM(TotalAmount) as total_amount,
+    SUM(CASE WHEN CFTypeID IN ({cf}, {ssa}) THEN TotalAmount ELSE 0 END) as cash_flow_amount,
+    SUM(CASE WHEN CFTypeID = {cf} THEN TotalAmount ELSE 0 END) as cf_amount,
+    SUM(CASE WHEN CFTypeID = {ssa} THEN TotalAmount ELSE 0 END) as ssa_amount,
+    SUM(CASE WHEN CFTypeID = {legal} THEN TotalAmount ELSE 0 END) as legal_amount,
+    SUM(CASE WHEN CFTypeID = {non_cf} THEN TotalAmount ELSE 0 END) as non_cf_amount,
+    COUNT(CASE WHEN CFTypeID IN ({cf}, {ssa}) THEN 1 END) as cf_collections_count,
+    COUNT(CASE WHEN CFTypeID = {cf} THEN 1 END) as cf_count,
+    COUNT(CASE WHEN CFTypeID = {ssa} THEN 1 END) as ssa_count,
+    COUNT(CASE WHEN CFTypeID = {legal} THEN 1 END) as legal_count,
+    COUNT(CASE WHEN CFTypeID = {non_cf} THEN 1 END) as non_cf_count,
+    COUNT(CASE WHEN CFTypeID = {non_cf} AND FlagColumn = 0 THEN 1 END) as ncf_count
+FROM (""" + COLLECTION_DETAIL_TEMPLATE.rstrip('\n') + """
+) AS subquery
+GROUP BY AssetManager
+ORDER BY 
+    AssetManager;
+"""
+
+_CLASSIFICATION_KEYS = {
+    'cf': collection_categories.CF,
+    'ssa': collection_categories.SSA,
+    'legal': collection_categories.LEGAL,
+    'non_cf': collection_categories.NON_CF,
+    'lookup_table': collection_categories.LOOKUP_TABLE,
+    'version': collection_categories.CLASSIFICATION_VERSION
+}
+
+SERVICING_TEAM_SQL = SERVICING_TEAM_TEMPLATE.format(asset_manager_filter='', **_CLASSIFICATION_KEYS)
+
+# Single Asset Manager variant. The predicate sits inside the CollectionDetail
+# scan so SQL Server can seek on an index such as:
+#   CREATE INDEX IX_CollectionDetail_AssetManager_ReceivedDate
+#       ON CollectionDetail (AssetManager, ReceivedDate)
+#       INCLUDE (Country, TotalAmount, CollectionCategory, FlagColumn)
+SERVICING_MANAGER_SQL = SERVICING_TEAM_TEMPLATE.format(
+    asset_manager_filter='\n        AND cd.AssetManager = @asset_manager',
+    **_CLASSIFICATION_KEYS
+)
+
+# Raw collections for the Servicing detail export (team-wide / one manager)
+SERVICING_COLLECTIONS_SQL = COLLECTION_DETAIL_TEMPLATE.format(asset_manager_filter='', **_CLASSIFICATION_KEYS)
+SERVICING_MANAGER_COLLECTIONS_SQL = COLLECTION_DETAIL_TEMPLATE.format(
+    asset_manager_filter='\n        AND cd.AssetManager = @asset_manager',
+    **_CLASSIFICATION_KEYS
+)
+
+# Servicing collections per category group and month, for the refresh's
+# category distribution and monthly trend
+SERVICING_BREAKDOWN_SQL = """
+SELECT 
+    CategoryGroupID,
+    MONTH(ReceivedDate) as received_month,
+    COUNT(*) as collections
+FROM (""" + SERVICING_COLLECTIONS_SQL.rstrip('\n') + """
+) AS subquery
+GROUP BY CategoryGroupID, MONTH(ReceivedDate);
+"""
+
+# Legal Team Query - individual legal acts in the period
+LEGAL_TEAM_SELECT = """
+SELECT DISTINCT 
+    l.InternalLawyerName, 
+    act.LegalStage, 
+    prop.PropertyID, 
+    prop.LastValuationAmount, 
+    act.Portfolio, 
+    act.PortfolioID, 
+    act.JudicialProcessID,
+    act.LegalActID, 
+    act.LegalActCode, 
+    act.ActDate, 
+    act.ActAmount,
+    act.CreationUser,
+    act.CreationDate,
+    CASE 
+        WHEN act.LegalActCode = 'Auction Start Date and Official ID' THEN 'Auction'
+        WHEN act.LegalActCode = 'Assigment of awarding celebrated' THEN 'Assigment of awarding'
+        WHEN act.LegalActCode IN (
+            'Cash In Court Third Party - Secured', 
+            'Cash In Court Third Party - Unsecured'
+        ) THEN 'Cash In Court'
+        WHEN act.LegalActCode = 'Awarding Title' THEN 'Testimony'
+        WHEN act.LegalActCode = 'Lawsuit Presentation Date' THEN 'Demands'
+        WHEN act.LegalActCode = 'OutCome - Judicial Possession of Keys' THEN 'Possession'
+    END AS Bucket
+FROM 
+    legalactactivity AS act
+    INNER JOIN legal AS l ON act.JudicialProcessID = l.JudicialProcessID
+    LEFT JOIN Property AS prop ON act.PropertyID = prop.PropertyID
+WHERE 
+    act.countryID = 2
+    AND act.ActDate >= @start_date AND act.ActDate < @end_date
+    AND act.CreationDate >= @start_date
+    AND act.LegalActID IN (8, 23, 61, 71, 98, 134, 214, 258)
+"""
+
+LEGAL_TEAM_SQL = LEGAL_TEAM_SELECT + """ORDER BY 
+    l.InternalLawyerName, 
+    act.LegalStage;
+"""
+
+# The five columns the Legal Team refresh aggregates, from the same distinct
+# acts. Fetching these instead of all fourteen skips decoding the unused
+# values. Same ordering as LEGAL_TEAM_SQL, so counts keep that first-seen order
+LEGAL_TEAM_COUNTS_SQL = """
+SELECT 
+    legal_data.InternalLawyerName,
+    legal_data.LegalStage,
+    legal_data.Bucket,
+    legal_data.ActAmount,
+    legal_data.ActDate
+FROM (
+""" + LEGAL_TEAM_SELECT + """
+) AS legal_data
+ORDER BY 
+    legal_data.InternalLawyerName, 
+    legal_data.LegalStage;
+"""
+
+# Aggregated Legal performance for a single Legal Manager
+LEGAL_MANAGER_PERFORMANCE_SQL = """
+SELECT 
+    legal_data.InternalLawyerName,
+    -- Lawsuit Presentation count
+    COUNT(CASE WHEN legal_data.Bucket = 'Demands' THEN 1 END) as lawsuit_presentation_count,
+    -- Auction amount
+    SUM(CASE WHEN legal_data.Bucket = 'Auction' THEN legal_data.ActAmount ELSE 0 END) as auction_amount,
+    -- CDR amount (Assigment of awarding)
+    SUM(CASE WHEN legal_data.Bucket = 'Assigment of awarding' THEN legal_data.ActAmount ELSE 0 END) as cdr_amount,
+    -- Testimonies amount
+    SUM(CASE WHEN legal_data.Bucket = 'Testimony' THEN legal_data.ActAmount ELSE 0 END) as testimonies_amount,
+    -- Possessions amount
+    SUM(CASE WHEN legal_data.Bucket = 'Possession' THEN legal_data.ActAmount ELSE 0 END) as possessions_amount,
+    -- CIC amount (Cash In Court)
+    SUM(CASE WHEN legal_data.Bucket = 'Cash In Court' THEN legal_data.ActAmount ELSE 0 END) as cic_amount,
+    -- Total legal acts
+    COUNT(*) as total_legal_acts
+FROM (
+""" + LEGAL_TEAM_SELECT + """
+) AS legal_data
+WHERE legal_data.InternalLawyerName = @legal_manager
+GROUP BY legal_data.InternalLawyerName
+"""
+
+# Rows of the classification lookup table for one version
+CLASSIFICATION_COUNT_SQL = f"""
+SELECT COUNT(*) FROM {collection_categories.LOOKUP_TABLE} WHERE Version = @version
+"""
+
+
+class ClassificationTableError(RuntimeError):
+    """The SQL Server lookup table does not hold the current classification version"""
+
+
+CLASSIFICATION_COUNT_QUERY = PreparedQuery('classification_count', CLASSIFICATION_COUNT_SQL, ['version'])
+_classification_checked = False
+
+
+def check_classification_table(cursor):
+    """Fail loudly, once per process, unless the lookup table matches CLASSIFICATIONS"""
+    global _classification_checked
+    if _classification_checked:
+        return
+
+    # A missing or stale table would not fail the servicing queries: the LEFT
+    # JOIN yields NULL CFTypeIDs and the CF/SSA amounts silently come out as 0
+    table = collection_categories.LOOKUP_TABLE
+    version = collection_categories.CLASSIFICATION_VERSION
+    expected = len(collection_categories.CLASSIFICATIONS)
+    fix = 'run `flask sync-collection-categories` against this SQL Server'
+    try:
+        count = CLASSIFICATION_COUNT_QUERY.fetchone(cursor, version=version)[0]
+    except Exception as e:
+        raise ClassificationTableError(f'{table} could not be read ({e}); {fix}') from e
+    if count != expected:
+        raise ClassificationTableError(
+            f'{table} has {count} rows for version {version}, expected {expected}; {fix}'
+        )
+    _classification_checked = True
+
+
+SERVICING_TEAM_QUERY = PreparedQuery(
+    'servicing_team', SERVICING_TEAM_SQL, ['start_date', 'end_date'], check=check_classification_table
+)
+SERVICING_MANAGER_QUERY = PreparedQuery(
+    'servicing_manager', SERVICING_MANAGER_SQL, ['start_date', 'end_date', 'asset_manager'],
+    check=check_classification_table
+)
+SERVICING_COLLECTIONS_QUERY = PreparedQuery(
+    'servicing_collections', SERVICING_COLLECTIONS_SQL, ['start_date', 'end_date'],
+    check=check_classification_table
+)
+SERVICING_MANAGER_COLLECTIONS_QUERY = PreparedQuery(
+    'servicing_manager_collections', SERVICING_MANAGER_COLLECTIONS_SQL, ['start_date', 'end_date', 'asset_manager'],
+    check=check_classification_table
+)
+SERVICING_BREAKDOWN_QUERY = PreparedQuery(
+    'servicing_breakdown', SERVICING_BREAKDOWN_SQL, ['start_date', 'end_date'], check=check_classification_table
+)
+LEGAL_TEAM_QUERY = PreparedQuery('legal_team', LEGAL_TEAM_SQL, ['start_date', 'end_date'])
+LEGAL_TEAM_COUNTS_QUERY = PreparedQuery('legal_team_counts', LEGAL_TEAM_COUNTS_SQL, ['start_date', 'end_date'])
+LEGAL_MANAGER_PERFORMANCE_QUERY = PreparedQuery(
+    'legal_manager_performance', LEGAL_MANAGER_PERFORMANCE_SQL, ['start_date', 'end_date', 'legal_manager']
+)
@@ -0,0 +1,125 @@
+"""
+Read Replica Routing
+====================
+
+Sends the statements of read-only endpoints to a replica database and
+everything else to the primary.
+
+- DATABASE_REPLICA_URL (app config SQLALCHEMY_REPLICA_URI) adds a 'replica'
+  bind. Without it every statement goes to the primary, as before.
+- Views decorated with @read_replica read from the replica. Flushes, DML
+  statements and anything after a write in the same request still go to the
+  primary.
+- Read-your-writes: after a request commits a write, reads go to the primary
+  for READ_YOUR_WRITES_SECONDS, so the replica has time to catch up. The
+  window is kept per client (a cookie, which works across worker processes)
+  and per process (which also covers cached payloads such as the dashboard
+  snapshot, rebuilt after a local write). The frontend is another origin, so
+  the cookie needs credentialed CORS (CORS_ORIGINS) and fetches with
+  credentials: 'include' (frontend/lib/api.ts). Being SameSite=Lax, it is
+  only sent when frontend and API share a site, e.g. app.example.com and
+  api.example.com.
+"""
+
+import functools
+import time
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+from storage import engine_options
+
+REPLICA_BIND = 'replica'
+PRIMARY_COOKIE = 'db_primary_until'
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that sends read-only requests to the replica"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and not self.info.get('wrote')
+                and not getattr(clause, 'is_dml', False) and reads_from_replica()):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+# Track whether the current transaction wrote anything
+@event.listens_for(RoutingSession, 'after_flush')
+def _after_flush(session, flush_context):
+    session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _do_orm_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _after_commit(session):
+    if session.info.pop('wrote', False) and has_request_context():
+        state = current_app.extensions.get('read_replica')
+        if state is not None:
+            state['last_write'] = time.time()
+            g.db_primary_until = state['last_write'] + state['window']
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _after_rollback(session):
+    session.info.pop('wrote', None)
+
+
+def pinned_to_primary():
+    """True while this client or this process is inside a read-your-writes window"""
+    state = current_app.extensions.get('read_replica')
+    if state is None:
+        return True
+    now = time.time()
+    if now < state['last_write'] + state['window']:
+        return True
+    try:
+        return now < float(request.cookies.get(PRIMARY_COOKIE, 0))
+    except ValueError:
+        return False
+
+
+def reads_from_replica():
+    # A commit earlier in the request pins the rest of it to the primary too
+    return has_request_context() and g.get('read_replica', False) and g.get('db_primary_until') is None
+
+
+def read_replica(view):
+    """Serve a read-only view from the replica, unless pinned to the primary"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        g.read_replica = not pinned_to_primary()
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def init_read_replica(app):
+    """Add the replica bind and the stickiness cookie; call before db.init_app"""
+    uri = app.config.get('SQLALCHEMY_REPLICA_URI')
+    if not uri:
+        return app
+
+    binds = app.config.setdefault('SQLALCHEMY_BINDS', {})
+    binds[REPLICA_BIND] = {'url': uri, **engine_options(uri)}
+    app.extensions['read_replica'] = {
+        'window': float(app.config.get('READ_YOUR_WRITES_SECONDS', 5)),
+        'last_write': 0.0
+    }
+
+    @app.after_request
+    def _pin_client_to_primary(response):
+        primary_until = g.get('db_primary_until')
+        if primary_until is not None:
+            response.set_cookie(PRIMARY_COOKIE, f'{primary_until:.3f}',
+                                max_age=int(app.extensions['read_replica']['window']) + 1,
+                                httponly=True, samesite='Lax')
+        return response
+
+    return app
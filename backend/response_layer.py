@@ -0,0 +1,150 @@
+"""
+Response Layer
+==============
+
+Fast JSON encoding and response compression for the Flask app.
+
+- JSON goes through orjson when it is installed. It handles datetime, date
+  and Decimal natively and is several times faster than the stdlib encoder.
+  Without orjson, Flask's default provider is kept.
+- JSON and text bodies above a size threshold are compressed with brotli
+  (if installed) or gzip, depending on the client's Accept-Encoding.
+  Streamed bodies are compressed chunk by chunk, flushing after each chunk
+  so the client receives rows as they are produced.
+"""
+
+import gzip
+import zlib
+from decimal import Decimal
+
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+
+# Optional imports - will be imported only if available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Bodies smaller than this are not worth compressing
+COMPRESSION_MIN_SIZE = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/x-ndjson',
+    'text/plain',
+    'text/html',
+    'text/csv'
+}
+
+
+def _orjson_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson; loads stay on the stdlib path"""
+
+    option = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if ORJSON_AVAILABLE else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_orjson_default, option=self.option).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_orjson_default, option=self.option)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def choose_encoding(accept_encodings):
+    """Pick the best supported content coding from an Accept-Encoding header"""
+    if BROTLI_AVAILABLE and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress_stream(chunks, encoding):
+    """Compress an iterable of body chunks incrementally"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        compress, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+        compress, finish = compressor.compress, compressor.flush
+
+        def flush():
+            return compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compress(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+    finally:
+        # Closing the source ends stream_with_context and its request context
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def compress_response(response, accept_encodings, min_size=COMPRESSION_MIN_SIZE):
+    """Compress a response body in place when it is worth it"""
+    if (response.direct_passthrough
+            or response.status_code < 200 or response.status_code >= 300
+            or response.status_code == 204
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    encoding = choose_encoding(accept_encodings)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        # Size is unknown up front; streamed listings are large by design
+        response.response = compress_stream(response.response, encoding)
+    else:
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+        if encoding == 'br':
+            response.set_data(brotli.compress(body, quality=BROTLI_QUALITY))
+        else:
+            response.set_data(gzip.compress(body, compresslevel=GZIP_LEVEL))
+
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+
+    # The representation changed, so a strong validator would be wrong
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+    return response
+
+
+def init_response_layer(app, min_size=COMPRESSION_MIN_SIZE):
+    """Install the fast JSON provider and the compression hook on an app"""
+    if ORJSON_AVAILABLE:
+        app.json = OrjsonProvider(app)
+
+    @app.after_request
+    def _compress(response):
+        return compress_response(response, request.accept_encodings, min_size)
+
+    return app
@@ -0,0 +1,118 @@
+"""
+Slow Query Log
+==============
+
+Records external SQL Server queries that run longer than a threshold.
+
+Each record has the query template name, its parameters, the duration, the
+rows fetched and an estimate of the bytes fetched. Records go to the local
+slow_query table and can be read at /api/slow-queries. They hold parameter
+values (manager names, dates), so reading them needs SLOW_QUERY_TOKEN sent
+as X-Admin-Token; without a token the endpoints stay closed. SHOWPLAN_XML capture
+is optional. When it is on, the slow statement is compiled again under SET
+SHOWPLAN_XML ON, so SQL Server returns its estimated plan without running
+the statement a second time.
+
+Queries under the threshold cost one comparison. Offenders are written
+through the engine rather than db.session, so a record never gets mixed into
+the caller's transaction. That also makes it safe from the refresh thread
+pool.
+"""
+
+import hmac
+import json
+import logging
+
+from flask import current_app, request
+
+from models import SlowQuery, db
+
+logger = logging.getLogger(__name__)
+
+# Defaults; create_app overrides them from SLOW_QUERY_* settings
+SLOW_QUERY_THRESHOLD_MS = 1000
+SLOW_QUERY_CAPTURE_PLAN = False
+
+
+def is_authorized(req=None):
+    """True when SLOW_QUERY_TOKEN is set and the request carries it"""
+    req = req or request
+    token = current_app.config.get('SLOW_QUERY_TOKEN')
+    if not token:
+        return False
+    return hmac.compare_digest(req.headers.get('X-Admin-Token', ''), token)
+
+
+def estimate_bytes(rows):
+    """Approximate size of fetched rows: text/binary length, 8 bytes otherwise"""
+    total = 0
+    for row in rows:
+        for value in row:
+            if value is None:
+                continue
+            if isinstance(value, (str, bytes, bytearray)):
+                total += len(value)
+            else:
+                total += 8
+    return total
+
+
+def capture_showplan(query, cursor, params):
+    """Estimated SQL Server plan for a prepared query, without executing it"""
+    cursor.execute('SET SHOWPLAN_XML ON')
+    try:
+        query.execute(cursor, **params)
+        row = cursor.fetchone()
+        return row[0] if row else None
+    finally:
+        cursor.execute('SET SHOWPLAN_XML OFF')
+
+
+class SlowQueryLog:
+    """Threshold check and persistence for slow external queries"""
+
+    def __init__(self, threshold_ms=SLOW_QUERY_THRESHOLD_MS, capture_plan=SLOW_QUERY_CAPTURE_PLAN):
+        self.threshold_ms = threshold_ms
+        self.capture_plan = capture_plan
+        self.app = None  # Set by init_slow_query_log; nothing is recorded before that
+
+    def observe(self, query, cursor, params, seconds, rows, row_count=None):
+        """Record the query if it was slower than the threshold"""
+        # Streamed queries pass row_count instead of the rows; no byte estimate
+        duration_ms = seconds * 1000
+        if self.app is None or duration_ms < self.threshold_ms:
+            return
+
+        try:
+            showplan = None
+            if self.capture_plan:
+                try:
+                    showplan = capture_showplan(query, cursor, params)
+                except Exception as e:
+                    showplan = f'SHOWPLAN capture failed: {e}'
+
+            record = {
+                'query_name': query.name,
+                'parameters': json.dumps(params, default=str, sort_keys=True),
+                'duration_ms': round(duration_ms, 2),
+                'row_count': len(rows) if row_count is None else row_count,
+                'byte_count': estimate_bytes(rows) if row_count is None else None,
+                'showplan': showplan
+            }
+            with self.app.app_context():
+                with db.engine.begin() as conn:
+                    conn.execute(SlowQuery.__table__.insert(), record)
+        except Exception:
+            # The slow-query log must never fail the query it is observing
+            logger.exception('Could not record slow query %s', query.name)
+
+
+slow_query_log = SlowQueryLog()
+
+
+def init_slow_query_log(app):
+    """Enable slow-query recording into the app's database"""
+    slow_query_log.threshold_ms = app.config.get('SLOW_QUERY_THRESHOLD_MS', slow_query_log.threshold_ms)
+    slow_query_log.capture_plan = app.config.get('SLOW_QUERY_CAPTURE_PLAN', slow_query_log.capture_plan)
+    slow_query_log.app = app
+    return app
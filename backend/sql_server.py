@@ -0,0 +1,97 @@
+"""
+SQL Server
+==========
+
+Connection settings and helpers for the external SQL Server that holds the
+performance data. pymssql is only imported when a connection is opened.
+
+With SQL_SERVER_BACKEND=standin, connections go to a local SQLite file built
+by sql_server_standin.py instead, so the SQL Server code paths can be run and
+benchmarked offline.
+"""
+
+import importlib.util
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import click
+
+import collection_categories
+
+PYMSSQL_AVAILABLE = importlib.util.find_spec('pymssql') is not None
+
+# 'pymssql' (default) or 'standin' for the local SQLite stand-in
+SQL_SERVER_BACKEND = os.getenv('SQL_SERVER_BACKEND', 'pymssql').lower()
+SQL_SERVER_STANDIN_PATH = os.getenv('SQL_SERVER_STANDIN_PATH', 'sql_server_standin.db')
+SQL_SERVER_AVAILABLE = PYMSSQL_AVAILABLE or SQL_SERVER_BACKEND == 'standin'
+
+# SQL Server Configuration for Performance Data
+SQL_SERVER_CONFIG = {
+    'server': os.getenv('SQL_SERVER_HOST', 'your_sql_server_host'),
+    'database': os.getenv('SQL_SERVER_DATABASE', 'your_database_name'),
+    'username': os.getenv('SQL_SERVER_USERNAME', 'your_username'),
+    'password': os.getenv('SQL_SERVER_PASSWORD', 'your_password'),
+    'driver': os.getenv('SQL_SERVER_DRIVER', '{SQL Server}'),  # or '{ODBC Driver 17 for SQL Server}'
+    'port': os.getenv('SQL_SERVER_PORT', '1433')
+}
+
+# SQL Server Connection String Template
+SQL_SERVER_CONNECTION_STRING = (
+    f"DRIVER={SQL_SERVER_CONFIG['driver']};"
+    f"SERVER={SQL_SERVER_CONFIG['server']};"
+    f"DATABASE={SQL_SERVER_CONFIG['database']};"
+    f"UID={SQL_SERVER_CONFIG['username']};"
+    f"PWD={SQL_SERVER_CONFIG['password']};"
+    f"PORT={SQL_SERVER_CONFIG['port']};"
+)
+
+def connect_sql_server():
+    """Open a pymssql connection to the external SQL Server (or the stand-in)"""
+    if SQL_SERVER_BACKEND == 'standin':
+        import sql_server_standin
+        return sql_server_standin.StandinConnection(SQL_SERVER_STANDIN_PATH)
+    
+    import pymssql  # Imported on first use to keep startup light
+    
+    return pymssql.connect(
+        server=SQL_SERVER_CONFIG['server'],
+        database=SQL_SERVER_CONFIG['database'],
+        user=SQL_SERVER_CONFIG['username'],
+        password=SQL_SERVER_CONFIG['password'],
+        port=SQL_SERVER_CONFIG['port']
+    )
+
+# Bounded pool for concurrent SQL Server queries (one connection per task)
+SQL_SERVER_MAX_WORKERS = int(os.getenv('SQL_SERVER_MAX_WORKERS', '4'))
+_executor = None
+_executor_pid = None
+
+def sql_server_executor():
+    """This process's SQL Server thread pool, created on first use"""
+    global _executor, _executor_pid
+    # Threads do not survive fork, so a WSGI worker never reuses its parent's pool
+    if _executor is None or _executor_pid != os.getpid():
+        _executor = ThreadPoolExecutor(max_workers=SQL_SERVER_MAX_WORKERS, thread_name_prefix='sqlserver')
+        _executor_pid = os.getpid()
+    return _executor
+
+def quarter_date_params(start_date, end_date):
+    """Typed date parameters for the prepared SQL Server queries"""
+    return {
+        'start_date': date.fromisoformat(start_date),
+        'end_date': date.fromisoformat(end_date)
+    }
+
+@click.command('sync-collection-categories')
+def sync_collection_categories():
+    """Load the CollectionCategory classification lookup table into SQL Server"""
+    conn = connect_sql_server()
+    try:
+        cursor = conn.cursor()
+        collection_categories.sync_sql_server(cursor)
+        conn.commit()
+        click.echo(f"Synced {len(collection_categories.CLASSIFICATIONS)} collection categories "
+                   f"(version {collection_categories.CLASSIFICATION_VERSION})")
+    finally:
+        conn.close()
@@ -0,0 +1,274 @@
+"""
+SQL Server Stand-in
+===================
+
+Local SQLite schema mirroring the external SQL Server tables, with a seeded
+data generator and a pymssql-style adapter.
+
+The statements in queries.py only use syntax SQLite understands (including
+@name parameters), so their text can be run and their query plans inspected
+here without access to the production server. With SQL_SERVER_BACKEND=standin
+the app's SQL Server call sites (refreshes, cash flow, legal performance) run
+against a generated stand-in file instead:
+
+    python sql_server_standin.py standin.db --collections 200000 --legal-acts 100000
+"""
+
+import argparse
+import random
+import sqlite3
+from datetime import date, datetime, timedelta
+
+import collection_categories
+
+STANDIN_SCHEMA = """
+CREATE TABLE IF NOT EXISTS CollectionDetail (
+    CollectionID INTEGER PRIMARY KEY,
+    AssetManager TEXT,
+    Country TEXT,
+    ReceivedDate DATE,
+    TotalAmount REAL,
+    CashFlowType TEXT,
+    CollectionCategory TEXT,
+    FlagColumn INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS IX_CollectionDetail_AssetManager_ReceivedDate
+    ON CollectionDetail (AssetManager, ReceivedDate);
+
+CREATE TABLE IF NOT EXISTS CollectionCategoryClassification (
+    CategoryID INTEGER NOT NULL,
+    CollectionCategory TEXT NOT NULL,
+    CFTypeID INTEGER NOT NULL,
+    CategoryGroupID INTEGER,
+    Version INTEGER NOT NULL,
+    PRIMARY KEY (Version, CategoryID),
+    UNIQUE (Version, CollectionCategory)
+);
+
+CREATE TABLE IF NOT EXISTS legal (
+    JudicialProcessID INTEGER PRIMARY KEY,
+    InternalLawyerName TEXT
+);
+
+CREATE TABLE IF NOT EXISTS Property (
+    PropertyID INTEGER PRIMARY KEY,
+    LastValuationAmount REAL
+);
+
+CREATE TABLE IF NOT EXISTS legalactactivity (
+    LegalActActivityID INTEGER PRIMARY KEY,
+    countryID INTEGER,
+    LegalStage TEXT,
+    PropertyID INTEGER,
+    Portfolio TEXT,
+    PortfolioID INTEGER,
+    JudicialProcessID INTEGER,
+    LegalActID INTEGER,
+    LegalActCode TEXT,
+    ActDate DATE,
+    ActAmount REAL,
+    CreationUser TEXT,
+    CreationDate DATETIME
+);
+
+CREATE INDEX IF NOT EXISTS IX_legalactactivity_countryID_ActDate
+    ON legalactactivity (countryID, ActDate);
+"""
+
+# Legal act types: (LegalActID, LegalActCode). The first eight are the acts
+# LEGAL_TEAM_QUERY counts; the rest are filtered out by the query.
+LEGAL_ACTS = [
+    (8, 'Lawsuit Presentation Date'),
+    (23, 'Auction Start Date and Official ID'),
+    (61, 'Assigment of awarding celebrated'),
+    (71, 'Awarding Title'),
+    (98, 'OutCome - Judicial Possession of Keys'),
+    (134, 'Cash In Court Third Party - Secured'),
+    (214, 'Cash In Court Third Party - Unsecured'),
+    (258, 'Lawsuit Presentation Date'),
+    (5, 'Hearing Date'),
+    (12, 'Appeal Filed')
+]
+LEGAL_STAGES = ['Demand', 'Enforcement', 'Auction', 'Awarding', 'Possession', 'Closed']
+ASSET_MANAGERS = ['lezama'] + [f'asset_manager_{i:02d}' for i in range(1, 20)]
+LAWYERS = [f'Lawyer {i:02d}' for i in range(1, 31)]
+PORTFOLIOS = [(i, f'Portfolio {letter}') for i, letter in enumerate('ABCDEFGH', 1)]
+CASH_FLOW_TYPES = ['Cash', 'Transfer', 'Offset']
+
+
+def _adapt_date(value):
+    return value.isoformat()
+
+
+def _convert_date(value):
+    return date.fromisoformat(value.decode()[:10])
+
+
+def _convert_datetime(value):
+    return datetime.fromisoformat(value.decode())
+
+
+# pymssql returns date/datetime objects; mirror that on the stand-in
+sqlite3.register_adapter(date, _adapt_date)
+sqlite3.register_adapter(datetime, _adapt_date)
+sqlite3.register_converter('DATE', _convert_date)
+sqlite3.register_converter('DATETIME', _convert_datetime)
+
+
+def _month(value):
+    """SQL Server's MONTH() over the stand-in's ISO date strings"""
+    return int(value[5:7]) if value else None
+
+
+def _open(path):
+    conn = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES)
+    conn.create_function('MONTH', 1, _month, deterministic=True)
+    return conn
+
+
+def create_schema(conn):
+    """Create the stand-in tables and indexes and load the category lookup"""
+    conn.executescript(STANDIN_SCHEMA)
+    conn.executemany(
+        'INSERT OR REPLACE INTO CollectionCategoryClassification VALUES (?, ?, ?, ?, ?)',
+        collection_categories.lookup_rows()
+    )
+    conn.commit()
+
+
+def connect(path=':memory:'):
+    """Open a stand-in database with the schema in place"""
+    conn = _open(path)
+    create_schema(conn)
+    return conn
+
+
+def explain(conn, sql, params):
+    """Return the detail lines of SQLite's query plan for a statement"""
+    rows = conn.execute('EXPLAIN QUERY PLAN ' + sql.strip().rstrip(';'), params).fetchall()
+    return [row[-1] for row in rows]
+
+
+def _random_day(rng, year):
+    return date(year, 1, 1) + timedelta(days=rng.randrange(365))
+
+
+def populate(conn, collections=10000, legal_acts=5000, years=(2024,), seed=42):
+    """Fill the stand-in with seeded synthetic collections and legal acts"""
+    rng = random.Random(seed)
+    categories = [category for _, category, _, _ in collection_categories.CLASSIFICATIONS] + [None]
+
+    conn.executemany(
+        'INSERT INTO CollectionDetail VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        (
+            (
+                collection_id,
+                rng.choice(ASSET_MANAGERS),
+                'ESPANA' if rng.random() < 0.9 else 'PORTUGAL',
+                _random_day(rng, rng.choice(years)),
+                round(rng.lognormvariate(8, 1.2), 2),
+                rng.choice(CASH_FLOW_TYPES),
+                rng.choice(categories),
+                1 if rng.random() < 0.2 else 0
+            ) for collection_id in range(1, collections + 1)
+        )
+    )
+
+    processes = max(legal_acts // 5, 1)
+    properties = max(legal_acts // 3, 1)
+    conn.executemany('INSERT INTO legal VALUES (?, ?)',
+                     ((i, rng.choice(LAWYERS)) for i in range(1, processes + 1)))
+    conn.executemany('INSERT INTO Property VALUES (?, ?)',
+                     ((i, round(rng.uniform(40000, 900000), 2)) for i in range(1, properties + 1)))
+
+    def legal_act_rows():
+        for activity_id in range(1, legal_acts + 1):
+            act_id, act_code = rng.choice(LEGAL_ACTS)
+            portfolio_id, portfolio = rng.choice(PORTFOLIOS)
+            act_date = _random_day(rng, rng.choice(years))
+            yield (
+                activity_id,
+                2 if rng.random() < 0.9 else 1,
+                rng.choice(LEGAL_STAGES),
+                rng.randint(1, properties) if rng.random() < 0.8 else None,
+                portfolio,
+                portfolio_id,
+                rng.randint(1, processes),
+                act_id,
+                act_code,
+                act_date,
+                round(rng.uniform(1000, 250000), 2),
+                rng.choice(LAWYERS).lower().replace(' ', '.'),
+                datetime.combine(act_date, datetime.min.time()) + timedelta(hours=rng.randrange(24 * 30))
+            )
+
+    conn.executemany('INSERT INTO legalactactivity VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                     legal_act_rows())
+    conn.commit()
+
+
+class StandinCursor:
+    """pymssql-like cursor; prepared queries run their inner statement directly"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def execute_prepared(self, query, params):
+        self._cursor.execute(query.sql, params)
+        return self
+
+    def execute(self, sql, params=None):
+        self._cursor.execute(sql, params or ())
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size=1):
+        return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def close(self):
+        self._cursor.close()
+
+
+class StandinConnection:
+    """pymssql-like connection to a generated stand-in file"""
+
+    def __init__(self, path):
+        self._conn = _open(path)
+
+    def cursor(self):
+        return StandinCursor(self._conn.cursor())
+
+    def commit(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a SQL Server stand-in database')
+    parser.add_argument('path', help='SQLite file to create or extend')
+    parser.add_argument('--collections', type=int, default=10000)
+    parser.add_argument('--legal-acts', type=int, default=5000)
+    parser.add_argument('--years', type=int, nargs='+', default=[2024])
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    conn = connect(args.path)
+    populate(conn, args.collections, args.legal_acts, args.years, args.seed)
+    conn.close()
+    print(f'Wrote {args.collections} collections and {args.legal_acts} legal acts to {args.path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Storage Configuration
+=====================
+
+Engine settings for the local SQLAlchemy database.
+
+SQLite (the default store):
+- WAL journal, so readers keep reading the last committed state while an
+  upload transaction is writing, instead of blocking behind it.
+- synchronous=NORMAL, which is durable at each WAL checkpoint and avoids an
+  fsync on every commit.
+- mmap_size for memory-mapped reads, and a busy timeout so a writer waiting
+  on another writer retries instead of failing with "database is locked".
+- The pragmas run once per new DBAPI connection (the SQLAlchemy 'connect'
+  event), not on every pool checkout.
+
+Server databases (PostgreSQL, SQL Server, ...):
+- A sized QueuePool with overflow, pre-ping to drop dead connections after a
+  failover or idle timeout, and periodic recycling.
+"""
+
+import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# SQLite pragmas
+SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+
+# Connection pool for server databases
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '20'))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+
+
+def is_sqlite(url):
+    return make_url(url).get_backend_name() == 'sqlite'
+
+
+def is_memory_sqlite(url):
+    database = make_url(url).database
+    return not database or database == ':memory:'
+
+
+def engine_options(url):
+    """SQLALCHEMY_ENGINE_OPTIONS for a database URL"""
+    if is_sqlite(url):
+        # The driver-level timeout is the busy timeout for the first statement
+        return {'connect_args': {'timeout': SQLITE_BUSY_TIMEOUT_MS / 1000}}
+
+    return {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_pre_ping': True
+    }
+
+
+def sqlite_pragmas(journal_mode=None):
+    """PRAGMA statements run on every new SQLite connection"""
+    return [
+        f'PRAGMA journal_mode={journal_mode or SQLITE_JOURNAL_MODE}',
+        f'PRAGMA synchronous={SQLITE_SYNCHRONOUS}',
+        f'PRAGMA mmap_size={SQLITE_MMAP_SIZE}',
+        f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}'
+    ]
+
+
+def configure_engine(engine, journal_mode=None):
+    """Install the SQLite pragmas on an engine; server engines need nothing more"""
+    if engine.dialect.name != 'sqlite' or is_memory_sqlite(engine.url):
+        return engine
+
+    pragmas = sqlite_pragmas(journal_mode)
+
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return engine
+
+
+def init_storage(app, db):
+    """Apply the storage settings to every engine of an initialised app"""
+    with app.app_context():
+        for engine in db.engines.values():
+            configure_engine(engine, app.config.get('SQLITE_JOURNAL_MODE'))
+    return app
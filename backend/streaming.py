@@ -0,0 +1,101 @@
+"""
+Streaming Responses
+===================
+
+JSON bodies written while the rows are still being fetched.
+
+Large listings are read with yield_per (a server-side cursor where the
+driver supports one) and encoded one batch at a time. Memory stays constant
+in the number of rows, and the first bytes leave before the query has
+finished. Streamed bodies are compressed incrementally by response_layer.py.
+
+Raw SQL Server exports use NDJSON (one JSON object per line), fed from
+fetchmany batches. The WSGI server asks for the next chunk only once the
+previous one has been written, so a slow client slows the fetches down
+instead of rows piling up in memory.
+
+The first chunk always carries the first batch and is produced before the
+view returns. Query errors therefore still reach the view's error handling
+as a JSON 500. A failure after that cannot change the status any more. It
+is logged and the transfer is aborted, so the client sees an incomplete body
+rather than a well-formed short one. Request metrics and profiles of
+streamed responses are finished when the response is closed (metrics.py,
+profiling.py).
+"""
+
+from itertools import islice
+
+from flask import current_app, g, stream_with_context
+
+# Rows fetched and encoded per chunk
+STREAM_BATCH_SIZE = 1000
+
+
+def batches(rows, size=STREAM_BATCH_SIZE):
+    """Split an iterable into lists of at most `size` items"""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def json_array_chunks(rows, serialize, counter=None, batch_size=STREAM_BATCH_SIZE):
+    """Yield a JSON array of serialize(row), one chunk per batch of rows"""
+    dumps = current_app.json.dumps
+    count = 0
+    for batch in batches(rows, batch_size):
+        # One encoder call per batch; strip the list brackets
+        body = dumps([serialize(row) for row in batch])[1:-1]
+        yield ('[' if count == 0 else ',') + body
+        count += len(batch)
+    yield ']' if count else '[]'
+    if counter is not None:
+        counter['count'] = count
+
+
+def json_object_chunks(fields, array_key, rows, serialize, count_key=None, batch_size=STREAM_BATCH_SIZE):
+    """Yield {**fields, array_key: [...], count_key: n} with the array streamed"""
+    head = current_app.json.dumps(fields)
+    head = (head[:-1] + ',' if fields else '{') + current_app.json.dumps(array_key) + ':'
+    counter = {}
+    array = json_array_chunks(rows, serialize, counter, batch_size)
+    yield head + next(array)  # The envelope travels with the first batch
+    yield from array
+    if count_key:
+        yield f',{current_app.json.dumps(count_key)}:{counter["count"]}'
+    yield '}'
+
+
+def ndjson_chunks(batches, columns):
+    """Yield one JSON object per row, one chunk per batch of row tuples"""
+    dumps = current_app.json.dumps
+    for batch in batches:
+        yield ''.join([dumps(dict(zip(columns, row))) + '\n' for row in batch])
+
+
+def _prefetched(chunks):
+    chunks = iter(chunks)
+    first = next(chunks, None)  # Query errors raise here, inside the view
+    yield None
+    if first is None:
+        return
+    yield first
+    try:
+        yield from chunks
+    except Exception:
+        # The status line is gone; log, let metrics count a 500 and re-raise
+        # so the server drops the connection instead of ending the body
+        current_app.logger.exception('Streamed response failed after its first chunk')
+        g.stream_failed = True
+        raise
+
+
+def stream_response(chunks, mimetype='application/json'):
+    """Response that runs the chunk generator inside the request context"""
+    body = stream_with_context(_prefetched(chunks))
+    # Produce the first chunk now; the contexts stay pushed in the generator,
+    # so the session the query runs on survives the end of the view
+    next(body)
+    return current_app.response_class(body, mimetype=mimetype)
@@ -0,0 +1,261 @@
+"""
+Team Schemas
+============
+
+Declarative column schema for the per-team upload data.
+
+Each team type lists its Excel columns once: header name, ORM field, dtype,
+default and template sample value, plus any derived (calculated) fields. The
+upload validation, row coercion, template building and serialisation plans
+are all compiled from this registry when the module is imported, so requests
+only run the precomputed plan.
+
+Saved team members (TeamMemberData: inputs plus the incentives calculated by
+the frontend) are described here too. Their member columns drive the save
+mapping, the members serialisation and the Excel results export.
+"""
+
+from operator import attrgetter
+
+STRING = 'string'
+FLOAT = 'float'
+
+DEFAULTS = {
+    STRING: '',
+    FLOAT: 0.0
+}
+
+
+class Column:
+    """A single Excel column mapped to an ORM field"""
+
+    __slots__ = ('header', 'field', 'dtype', 'default', 'sample', 'key')
+
+    def __init__(self, header, field, dtype=FLOAT, sample=None, key=False, default=None):
+        self.header = header
+        self.field = field
+        self.dtype = dtype
+        self.default = DEFAULTS[dtype] if default is None else default
+        self.sample = sample
+        self.key = key  # Rows missing a key column are skipped
+
+
+class Derived:
+    """A calculated field computed from other fields of the same row"""
+
+    __slots__ = ('field', 'formula')
+
+    def __init__(self, field, formula):
+        self.field = field
+        self.formula = formula
+
+
+def ratio_percentage(numerator, denominator):
+    """Formula: numerator / denominator * 100, or 0 when the denominator is 0"""
+    def formula(values):
+        num = values[numerator]
+        den = values[denominator]
+        return (num / den.where(den != 0) * 100).fillna(0.0)
+    return formula
+
+
+class TeamSchema:
+    """Compiled plan for one team type"""
+
+    def __init__(self, team_type, columns, derived=(), template_calculated_columns=(), member_columns=()):
+        self.team_type = team_type
+        self.columns = list(columns)
+        self.derived = list(derived)
+        self.member_columns = COMMON_MEMBER_COLUMNS + list(member_columns)
+
+        # Validation plan
+        self.headers = [column.header for column in self.columns]
+        self.key_headers = [column.header for column in self.columns if column.key]
+
+        # Coercion plan
+        self.string_columns = [(c.header, c.field, c.default) for c in self.columns if c.dtype == STRING]
+        self.float_columns = [(c.header, c.field, c.default) for c in self.columns if c.dtype == FLOAT]
+
+        # Template plan
+        self.sample_data = [column.sample for column in self.columns]
+        self.template_calculated_columns = list(template_calculated_columns)
+
+        # Serialisation plan
+        self.fields = [column.field for column in self.columns]
+        self.output_fields = self.fields + [d.field for d in self.derived]
+        self._read_fields = attrgetter(*self.output_fields)
+
+        # Saved member plan: the name and code fields of the payload, and the
+        # results export columns
+        self.member_key_fields = [c.field for c in self.member_columns if c.key]
+        self.export_headers = [c.header for c in self.member_columns]
+        self.export_fields = [c.field for c in self.member_columns]
+
+    def missing_headers(self, available):
+        """Return required headers not present in the uploaded file"""
+        available = set(available)
+        return [header for header in self.headers if header not in available]
+
+    def decode_frame(self, df):
+        """Validate and coerce an uploaded DataFrame into ORM row mappings"""
+        import pandas as pd
+
+        # Skip empty rows
+        if self.key_headers:
+            df = df.dropna(subset=self.key_headers)
+
+        values = {}
+        for header, field, default in self.string_columns:
+            series = df[header]
+            values[field] = series.where(series.notna(), default).astype(str).str.strip()
+        for header, field, default in self.float_columns:
+            values[field] = pd.to_numeric(df[header]).fillna(default).astype(float)
+        for derived in self.derived:
+            values[derived.field] = derived.formula(values)
+
+        fields = list(values)
+        return [dict(zip(fields, row)) for row in zip(*(values[f].tolist() for f in fields))]
+
+    def encode(self, record):
+        """Serialise a team data record to a dict keyed by field name"""
+        data = dict(zip(self.output_fields, self._read_fields(record)))
+        data['created_at'] = record.created_at.isoformat() if record.created_at else None
+        data['updated_at'] = record.updated_at.isoformat() if record.updated_at else None
+        return data
+
+
+# TeamMemberData columns shared by every team type
+COMMON_MEMBER_COLUMNS = [
+    Column('Employee Name', 'employee_name', STRING),
+    Column('Employee Code', 'employee_code', STRING),
+    Column('Category', 'category', STRING),
+    Column('Team Leader', 'team_leader', STRING),
+]
+
+SCHEMAS = {
+    'legal': TeamSchema('legal', [
+        Column('Legal Manager', 'legal_manager', STRING, 'John Doe', key=True),
+        Column('Employee #', 'employee_number', STRING, 'L001', key=True),
+        Column('Category', 'category', STRING, 'Senior Legal'),
+        Column('Quarterly Incentive', 'quarterly_incentive', FLOAT, 120000),
+        Column('Team Leader', 'team_leader', STRING, 'Jane Smith'),
+        Column('Lawsuit Presentation Target (#)', 'lawsuit_presentation_target', FLOAT, 50),
+        Column('Auction Target (€)', 'auction_target', FLOAT, 100000),
+        Column('CDR Target (€)', 'cdr_target', FLOAT, 75000),
+        Column('Testimonies Target (€)', 'testimonies_target', FLOAT, 25000),
+        Column('Possessions Target (€)', 'possessions_target', FLOAT, 50000),
+        Column('CIC Target (€)', 'cic_target', FLOAT, 30000),
+    ], member_columns=[
+        # Inputs first, then calculated incentives
+        Column('Legal Manager', 'legal_manager', STRING, key=True),
+        Column('Employee #', 'employee_hash', STRING, key=True),
+        Column('Quarterly Incentive', 'quarterly_incentive'),
+        Column('Lawsuit Presentation Target (#)', 'lawsuit_presentation_target'),
+        Column('Auction Target (€)', 'auction_target'),
+        Column('CDR Target (€)', 'cdr_target'),
+        Column('Testimonies Target (€)', 'testimonies_target'),
+        Column('Possessions Target (€)', 'possessions_target'),
+        Column('CIC Target (€)', 'cic_target'),
+        Column('Lawsuit Presentation', 'lawsuit_presentation'),
+        Column('Lawsuit Presentation %', 'lawsuit_presentation_percentage'),
+        Column('Lawsuit Weight', 'lawsuit_weight'),
+        Column('Auction', 'auction'),
+        Column('Auction %', 'auction_percentage'),
+        Column('Auction Weight', 'auction_weight'),
+        Column('CDR', 'cdr'),
+        Column('CDR %', 'cdr_percentage'),
+        Column('CDR Weight', 'cdr_weight'),
+        Column('Testimonies', 'testimonies'),
+        Column('Testimonies %', 'testimonies_percentage'),
+        Column('Testimonies Weight', 'testimonies_weight'),
+        Column('Possessions', 'possessions'),
+        Column('Possessions %', 'possessions_percentage'),
+        Column('Possessions Weight', 'possessions_weight'),
+        Column('CIC', 'cic'),
+        Column('CIC %', 'cic_percentage'),
+        Column('CIC Weight', 'cic_weight'),
+        Column('Targets Fulfillment', 'targets_fulfillment'),
+        Column('Incentive %', 'incentive_percentage'),
+        Column('Data Quality', 'data_quality'),
+        Column('Q4 Incentive', 'q4_incentive'),
+    ]),
+    'loan': TeamSchema('loan', [
+        Column('Loan Manager', 'loan_manager', STRING, 'John Doe', key=True),
+        Column('Employee Number', 'employee_number', STRING, 'LOAN001', key=True),
+        Column('Category', 'category', STRING, 'Senior Analyst'),
+        Column('Quarter Incentive Base', 'quarter_incentive_base', FLOAT, 75000),
+        Column('Team Leader', 'team_leader', STRING, 'Jane Smith'),
+        Column('Portfolio', 'portfolio', STRING, 'Portfolio B'),
+        Column('Loan Amount', 'loan_amount', FLOAT, 500000),
+        Column('Loan Target', 'loan_target', FLOAT, 600000),
+        Column('NPL Amount', 'npl_amount', FLOAT, 100000),
+        Column('NPL Target', 'npl_target', FLOAT, 120000),
+        Column('Recovery Rate', 'recovery_rate', FLOAT, 85),
+        Column('Recovery Target', 'recovery_target', FLOAT, 90),
+    ], derived=[
+        Derived('loan_target_percentage', ratio_percentage('loan_amount', 'loan_target')),
+        Derived('npl_target_percentage', ratio_percentage('npl_amount', 'npl_target')),
+        Derived('recovery_target_percentage', ratio_percentage('recovery_rate', 'recovery_target')),
+    ], member_columns=[
+        # TeamMemberData has no loan input fields
+        Column('Total Incentive', 'total_incentive'),
+        Column('Data Quality', 'data_quality'),
+        Column('Q4 Incentive', 'q4_incentive'),
+    ]),
+    'servicing': TeamSchema('servicing', [
+        Column('Asset/Sales Manager', 'asset_sales_manager', STRING, 'John Doe', key=True),
+        Column('Employee Number', 'employee_number', STRING, 'EMP001', key=True),
+        Column('Category', 'category', STRING, 'Analyst'),
+        Column('Quarter Incentive Base', 'quarter_incentive_base', FLOAT, 50000),
+        Column('Team Leader', 'team_leader', STRING, 'Jane Smith'),
+        Column('Main Portfolio', 'main_portfolio', STRING, 'Portfolio A'),
+        Column('Cash Flow', 'cash_flow', FLOAT, 100000),
+        Column('Cash Flow Target', 'cash_flow_target', FLOAT, 120000),
+        Column('NCF', 'ncf', FLOAT, 50000),
+        Column('NCF Target', 'ncf_target', FLOAT, 60000),
+    ], template_calculated_columns=[9, 12, 13, 14, 15, 16, 17, 18], member_columns=[
+        Column('Asset/Sales Manager', 'asset_sales_manager', STRING, key=True),
+        Column('Employee Number', 'employee_number', STRING, key=True),
+        Column('Quarter Incentive Base', 'quarter_incentive_base'),
+        Column('Main Portfolio', 'main_portfolio', STRING),
+        Column('Cash Flow', 'cash_flow'),
+        Column('Cash Flow Target', 'cash_flow_target'),
+        Column('NCF', 'ncf'),
+        Column('NCF Target', 'ncf_target'),
+        Column('Cash Flow %', 'cash_flow_percentage'),
+        Column('NCF %', 'ncf_percentage'),
+        Column('Incentive % CF', 'incentive_cf'),
+        Column('Total Incentive', 'total_incentive'),
+        Column('Q1 Incentive', 'q1_incentive'),
+    ]),
+}
+
+# Every TeamMemberData field across team types (first declaration wins)
+MEMBER_COLUMNS = list({
+    column.field: column for schema in SCHEMAS.values() for column in schema.member_columns
+}.values())
+MEMBER_FIELDS = ['id'] + [column.field for column in MEMBER_COLUMNS]
+_read_member_fields = attrgetter(*MEMBER_FIELDS)
+
+
+def member_values(emp_data):
+    """TeamMemberData field values from a saved member payload, with defaults"""
+    return {column.field: emp_data.get(column.field, column.default) for column in MEMBER_COLUMNS}
+
+
+def encode_member(record):
+    """Serialise a TeamMemberData row to a dict keyed by field name"""
+    data = dict(zip(MEMBER_FIELDS, _read_member_fields(record)))
+    data['created_at'] = record.created_at.isoformat() if record.created_at else None
+    data['updated_at'] = record.updated_at.isoformat() if record.updated_at else None
+    return data
+
+
+def normalize_team_type(team_name):
+    """Map a team name such as 'Legal Team' to its schema key ('legal')"""
+    return team_name.lower().replace(' team', '')
+
+
+def get_schema(team_name):
+    """Return the schema for a team name, or None for unknown team types"""
+    return SCHEMAS.get(normalize_team_type(team_name))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the employee dimension cache
+"""
+
+from app import create_app
+from employee_cache import employee_cache
+from models import db, Team, Employee, TeamMemberData
+
+
+def make_app(tmp_path, **config):
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "employees.db"}',
+        'METRICS_ENABLED': False,
+        **config
+    })
+    with app.app_context():
+        db.create_all()
+        team = Team(name='Servicing Team', description='Servicing Team')
+        db.session.add(team)
+        db.session.flush()
+        db.session.add_all([
+            Employee(name=f'Name{i}', surname=f'Surname{i}', employee_code=f'E{i}',
+                     category='Associate', team_id=team.id)
+            for i in range(10)
+        ])
+        db.session.commit()
+    return app
+
+
+def test_bulk_lookup_is_bounded_and_invalidated_on_commit(tmp_path):
+    app = make_app(tmp_path, EMPLOYEE_CACHE_SIZE=5)
+    with app.app_context():
+        infos = employee_cache.get_many_by_code([f'E{i}' for i in range(10)])
+        assert len(infos) == 10
+        assert infos['E3'].full_name == 'Name3 Surname3'
+        assert infos['E3'].team_name == 'Servicing Team'
+        assert len(employee_cache._entries) == 5
+
+        employee = Employee.query.filter_by(employee_code='E9').one()
+        employee.surname = 'Renamed'
+        db.session.commit()
+        assert employee_cache.get(employee.id).surname == 'Renamed'
+
+
+def test_save_members_updates_cached_employees(tmp_path):
+    app = make_app(tmp_path)
+    client = app.test_client()
+    with app.app_context():
+        team_id = Team.query.one().id
+        employee_id = employee_cache.get_by_code('E1').id
+
+    payload = {'employees': [
+        {'asset_sales_manager': 'Ana Lopez', 'employee_number': 'E1', 'category': 'Director'},
+        {'asset_sales_manager': 'New Person', 'employee_number': 'N1'}
+    ], 'quarter': 'Q4', 'year': 2024}
+    response = client.post(f'/api/teams/{team_id}/save-members', json=payload)
+    assert response.status_code == 200
+
+    with app.app_context():
+        updated = employee_cache.get(employee_id)
+        assert (updated.full_name, updated.category) == ('Ana Lopez', 'Director')
+        assert employee_cache.get_by_code('N1').full_name == 'New Person'
+        assert Employee.query.count() == 11
+
+
+def test_save_members_reads_legal_payloads_by_their_own_fields(tmp_path):
+    app = make_app(tmp_path)
+    client = app.test_client()
+    with app.app_context():
+        team = Team(name='Legal', description='Legal Team')  # As /api/seed-data names it
+        db.session.add(team)
+        db.session.commit()
+        team_id = team.id
+
+    payload = {'employees': [
+        {'legal_manager': 'Ana Lopez', 'employee_hash': 'L1'},
+        {'legal_manager': 'Juan Perez', 'employee_hash': 'L2'},
+        {'legal_manager': 'No Code', 'employee_hash': ''}
+    ], 'quarter': 'Q4', 'year': 2024}
+    response = client.post(f'/api/teams/{team_id}/save-members', json=payload)
+    assert response.status_code == 200
+    assert response.get_json()['saved_count'] == 3
+
+    with app.app_context():
+        assert employee_cache.get_by_code('L1').full_name == 'Ana Lopez'
+        assert employee_cache.get_by_code('L2').full_name == 'Juan Perez'
+        assert Employee.query.count() == 12
+        members = TeamMemberData.query.filter_by(team_id=team_id).order_by(TeamMemberData.id)
+        assert [m.employee_code for m in members] == ['L1', 'L2', '']
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Tests for multi-process metric aggregation
+"""
+
+import json
+import os
+
+import metrics
+
+
+def write_process(path, pid, requests):
+    registry = metrics.Registry()
+    counter = registry.register(metrics.REQUESTS_TOTAL.empty())
+    counter.inc('GET', '/api/teams', '200', amount=requests)
+    with open(os.path.join(path, f'process_{pid}.json'), 'w') as f:
+        json.dump(registry.snapshot(), f)
+
+
+def teams_requests(body):
+    line = 'http_requests_total{method="GET",route="/api/teams",status="200"} '
+    return int(next(row for row in body.splitlines() if row.startswith(line))[len(line):])
+
+
+def test_totals_span_processes_and_survive_worker_exit(tmp_path, monkeypatch):
+    path = str(tmp_path)
+    monkeypatch.setitem(metrics._multiproc, 'dir', path)
+    monkeypatch.setattr(metrics, 'REGISTRY', metrics.REGISTRY.merged([]))  # This process: empty
+    write_process(path, 101, 7)
+    write_process(path, 102, 5)
+
+    assert teams_requests(metrics.render()) == 12
+
+    metrics.mark_process_dead(path, 101)
+    assert not os.path.exists(os.path.join(path, 'process_101.json'))
+    assert teams_requests(metrics.render()) == 12
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQL Server queries, run against the local SQLite stand-in
+"""
+
+import pytest
+
+import collection_categories
+import metrics
+import queries
+import sql_server_standin
+from queries import (
+    LEGAL_MANAGER_PERFORMANCE_QUERY, LEGAL_TEAM_COUNTS_QUERY, LEGAL_TEAM_QUERY,
+    SERVICING_MANAGER_COLLECTIONS_QUERY, SERVICING_MANAGER_QUERY, SERVICING_TEAM_QUERY
+)
+
+PARAMS = {
+    'start_date': '2024-10-01',
+    'end_date': '2024-12-31',
+    'asset_manager': 'lezama'
+}
+
+
+def build_collections(conn):
+    """Three managers with in-period, out-of-period and foreign collections"""
+    rows = []
+    collection_id = 1
+    for manager in ('lezama', 'john_doe', 'jane_smith'):
+        for day in range(1, 29):
+            for received_date, country in (
+                (f'2024-11-{day:02d}', 'ESPANA'),
+                (f'2024-06-{day:02d}', 'ESPANA'),
+                (f'2024-11-{day:02d}', 'PORTUGAL'),
+            ):
+                rows.append((collection_id, manager, country, received_date, 100.0, None, 'Rent', 0))
+                collection_id += 1
+    conn.executemany('INSERT INTO CollectionDetail VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+
+def test_servicing_manager_query_seeks_on_asset_manager_index():
+    conn = sql_server_standin.connect()
+    build_collections(conn)
+
+    plan = sql_server_standin.explain(conn, SERVICING_MANAGER_QUERY.sql, PARAMS)
+
+    assert any(
+        'USING INDEX IX_CollectionDetail_AssetManager_ReceivedDate (AssetManager=? AND ReceivedDate>? AND ReceivedDate<?)'
+        in line for line in plan
+    ), plan
+    assert not any(line.startswith('SCAN cd') for line in plan), plan
+
+
+def test_servicing_manager_query_matches_team_query_row():
+    conn = sql_server_standin.connect()
+    build_collections(conn)
+
+    team_rows = conn.execute(SERVICING_TEAM_QUERY.sql, PARAMS).fetchall()
+    manager_rows = conn.execute(SERVICING_MANAGER_QUERY.sql, PARAMS).fetchall()
+
+    assert len(team_rows) == 3
+    assert manager_rows == [row for row in team_rows if row[0] == 'lezama']
+    assert manager_rows[0][1] == 28  # Only in-period ESPANA collections
+
+
+def test_servicing_query_classification_matches_python_classify():
+    conn = sql_server_standin.connect()
+    categories = [category for _, category, _, _ in collection_categories.CLASSIFICATIONS] + [None]
+    conn.executemany(
+        'INSERT INTO CollectionDetail VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        [(i, 'lezama', 'ESPANA', '2024-11-15', 1.0, None, category, 0) for i, category in enumerate(categories, 1)]
+    )
+
+    row = conn.execute(SERVICING_TEAM_QUERY.sql, PARAMS).fetchone()
+    cf_types = [collection_categories.classify(category)[0] for category in categories]
+
+    assert row[1] == len(categories)
+    assert row[9:13] == tuple(cf_types.count(cf_type) for cf_type in ('CF', 'SSA', 'Legal', 'Non-CF'))
+
+
+def test_legal_manager_query_matches_legal_team_rows():
+    conn = sql_server_standin.connect()
+    sql_server_standin.populate(conn, collections=0, legal_acts=2000)
+    params = {'start_date': '2024-10-01', 'end_date': '2024-12-31', 'legal_manager': 'Lawyer 01'}
+
+    cursor = sql_server_standin.StandinCursor(conn.cursor())
+    team_rows = LEGAL_TEAM_QUERY.execute(cursor, **params).fetchall()
+    manager_row = LEGAL_MANAGER_PERFORMANCE_QUERY.execute(cursor, **params).fetchone()
+
+    lawyer_rows = [row for row in team_rows if row[0] == 'Lawyer 01']
+    assert lawyer_rows and all(row[13] is not None for row in lawyer_rows)
+    assert manager_row[-1] == len(lawyer_rows)
+    assert manager_row[1] == sum(1 for row in lawyer_rows if row[13] == 'Demands')
+
+
+def test_legal_counts_query_projects_legal_team_rows():
+    conn = sql_server_standin.connect()
+    sql_server_standin.populate(conn, collections=0, legal_acts=2000)
+    params = {'start_date': '2024-10-01', 'end_date': '2024-12-31'}
+
+    cursor = sql_server_standin.StandinCursor(conn.cursor())
+    team_rows = LEGAL_TEAM_QUERY.execute(cursor, **params).fetchall()
+    count_rows = [row for batch in LEGAL_TEAM_COUNTS_QUERY.iter_batches(cursor, batch_size=100, **params)
+                  for row in batch]
+
+    assert sorted(count_rows) == sorted((row[0], row[1], row[13], row[10], row[9]) for row in team_rows)
+    assert [row[:2] for row in count_rows] == [row[:2] for row in team_rows]  # Same ordering
+
+
+def test_collection_detail_rows_add_up_to_the_manager_aggregate():
+    conn = sql_server_standin.connect()
+    build_collections(conn)
+    cursor = sql_server_standin.StandinCursor(conn.cursor())
+
+    batches = list(SERVICING_MANAGER_COLLECTIONS_QUERY.iter_batches(cursor, batch_size=10, **PARAMS))
+    aggregate = SERVICING_MANAGER_QUERY.execute(cursor, **PARAMS).fetchone()
+
+    assert [len(batch) for batch in batches] == [10, 10, 8]
+    rows = [row for batch in batches for row in batch]
+    assert {row[8] for row in rows} == {'lezama'}
+    assert len(rows) == aggregate[1]
+    assert sum(row[1] for row in rows) == aggregate[2]
+
+
+def test_sp_executesql_text_is_the_same_every_quarter():
+    """Only the outer EXEC carries values, so SQL Server can reuse one plan"""
+    def sent(query, start_date, end_date):
+        values = {**PARAMS, 'legal_manager': 'lezama', 'version': 1, 'start_date': start_date, 'end_date': end_date}
+        # pymssql-style client-side interpolation
+        statement = query.statement % {param: f"'{values[param]}'" for param in query.params}
+        return statement[:statement.index("', N'@")]
+
+    prepared = [q for q in vars(queries).values() if isinstance(q, queries.PreparedQuery)]
+    assert len(prepared) >= 7
+    for query in prepared:
+        q3 = sent(query, '2024-07-01', '2024-09-30')
+        assert q3 == sent(query, '2024-10-01', '2024-12-31'), query.name
+        assert '2024' not in q3, query.name
+
+
+def test_servicing_queries_refuse_a_stale_classification_table(monkeypatch):
+    conn = sql_server_standin.connect()
+    build_collections(conn)
+    cursor = sql_server_standin.StandinCursor(conn.cursor())
+    monkeypatch.setattr(queries, '_classification_checked', False)
+    conn.execute('DELETE FROM CollectionCategoryClassification WHERE CategoryID > 3')
+
+    with pytest.raises(queries.ClassificationTableError, match='has 3 rows for version'):
+        SERVICING_TEAM_QUERY.fetchall(cursor, **PARAMS)
+
+    sql_server_standin.create_schema(conn)  # Re-sync the lookup rows
+    assert len(SERVICING_TEAM_QUERY.fetchall(cursor, **PARAMS)) == 3
+
+
+def test_servicing_refresh_breaks_collections_down_by_group_and_month(tmp_path, monkeypatch):
+    import sql_server
+    from endpoints.performance_endpoints import query_team_performance
+
+    path = str(tmp_path / 'standin.db')
+    conn = sql_server_standin.connect(path)
+    build_collections(conn)
+    conn.commit()
+    monkeypatch.setattr(sql_server, 'SQL_SERVER_BACKEND', 'standin')
+    monkeypatch.setattr(sql_server, 'SQL_SERVER_STANDIN_PATH', path)
+
+    data = query_team_performance(3, 'Servicing Team', 'Q4', 2024)
+
+    assert data['total_collections'] == 84
+    assert data['category_distribution'] == {'Real Estate': 84}
+    assert data['asset_manager_distribution'] == {'jane_smith': 28, 'john_doe': 28, 'lezama': 28}
+    assert data['quarterly_trend'] == [
+        {'month': 'Oct', 'collections': 0}, {'month': 'Nov', 'collections': 84}, {'month': 'Dec', 'collections': 0}
+    ]
+
+
+def test_abandoned_batch_stream_is_still_recorded():
+    conn = sql_server_standin.connect()
+    build_collections(conn)
+    cursor = sql_server_standin.StandinCursor(conn.cursor())
+    name = SERVICING_MANAGER_COLLECTIONS_QUERY.name
+    rows_before = metrics.SQL_SERVER_ROWS_TOTAL._values.get((name,), 0)
+
+    batches = SERVICING_MANAGER_COLLECTIONS_QUERY.iter_batches(cursor, batch_size=10, **PARAMS)
+    next(batches)
+    batches.close()  # As when the client of a streamed export disconnects
+
+    assert metrics.SQL_SERVER_ROWS_TOTAL._values[(name,)] - rows_before == 10
+
+if __name__ == "__main__":
+    test_servicing_manager_query_seeks_on_asset_manager_index()
+    test_servicing_manager_query_matches_team_query_row()
+    test_servicing_query_classification_matches_python_classify()
+    test_legal_manager_query_matches_legal_team_rows()
+    test_legal_counts_query_projects_legal_team_rows()
+    test_collection_detail_rows_add_up_to_the_manager_aggregate()
+    test_sp_executesql_text_is_the_same_every_quarter()
+    test_abandoned_batch_stream_is_still_recorded()
+    print("🎉 All tests passed!")
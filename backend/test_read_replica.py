@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for read replica routing, with two SQLite files as primary and replica
+"""
+
+from app import create_app
+from models import db, Team
+
+
+def make_app(tmp_path):
+    primary = tmp_path / 'primary.db'
+    replica = tmp_path / 'replica.db'
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{primary}',
+        'SQLALCHEMY_REPLICA_URI': f'sqlite:///{replica}',
+        'READ_YOUR_WRITES_SECONDS': 60,
+        'METRICS_ENABLED': False
+    })
+    with app.app_context():
+        db.create_all()
+        # A lagging replica: same schema, but it has not seen the team yet
+        db.metadata.create_all(db.engines['replica'])
+        db.session.add(Team(name='Legal', description='Legal Team'))
+        db.session.commit()
+    return app
+
+
+def team_names(client):
+    response = client.get('/api/teams')
+    assert response.status_code == 200
+    return [team['name'] for team in response.get_json()]
+
+
+def test_read_only_endpoints_use_the_replica(tmp_path):
+    app = make_app(tmp_path)
+
+    assert team_names(app.test_client()) == []
+
+
+def test_reads_after_a_write_go_to_the_primary(tmp_path):
+    app = make_app(tmp_path)
+    writer = app.test_client()
+
+    response = writer.post('/api/incentives', json={'team': 'Legal', 'category': 'Analyst', 'base_salary': 40000,
+                                                     'quarter': 'Q4', 'year': 2024})
+    assert response.status_code == 201
+    assert team_names(writer) == ['Legal']
+
+    # Another worker process: only the client's cookie pins it to the primary
+    app.extensions['read_replica']['last_write'] = 0.0
+    assert team_names(writer) == ['Legal']
+    assert team_names(app.test_client()) == []
+
+
+def test_cross_origin_frontend_keeps_the_primary_pin(tmp_path, caplog):
+    """The browser path: credentialed CORS from the frontend origin, no cookie jar"""
+    app = make_app(tmp_path)
+    browser = app.test_client(use_cookies=False)
+    origin = {'Origin': 'http://localhost:3000'}
+
+    preflight = browser.options('/api/incentives', headers={
+        **origin, 'Access-Control-Request-Method': 'POST', 'Access-Control-Request-Headers': 'Content-Type'
+    })
+    assert preflight.headers['Access-Control-Allow-Origin'] == 'http://localhost:3000'
+    assert preflight.headers['Access-Control-Allow-Credentials'] == 'true'
+
+    response = browser.post('/api/incentives', headers=origin, json={
+        'team': 'Legal', 'category': 'Analyst', 'base_salary': 40000, 'quarter': 'Q4', 'year': 2024
+    })
+    assert response.headers['Access-Control-Allow-Credentials'] == 'true'
+    cookie = response.headers['Set-Cookie'].split(';', 1)[0]
+    assert cookie.startswith('db_primary_until=')
+
+    # Another worker: only the cookie the browser sends back pins it
+    app.extensions['read_replica']['last_write'] = 0.0
+
+    def teams(headers):
+        response = browser.get('/api/teams', headers=headers)
+        assert response.headers['Access-Control-Allow-Origin'] == 'http://localhost:3000'
+        return [team['name'] for team in response.get_json()]
+
+    assert teams({**origin, 'Cookie': cookie}) == ['Legal']
+    assert teams(origin) == []
+
+    # Other origins get no credentialed CORS grant
+    other = browser.get('/api/teams', headers={'Origin': 'http://evil.example'})
+    assert 'Access-Control-Allow-Origin' not in other.headers
+    assert 'origin http://evil.example is not in CORS_ORIGINS' in caplog.text
+
+
+def test_wildcard_cors_origins_restore_any_origin_without_cookies(tmp_path, monkeypatch):
+    monkeypatch.setenv('CORS_ORIGINS', '*')
+    response = make_app(tmp_path).test_client().get('/api/teams', headers={'Origin': 'http://other.example'})
+    assert response.headers['Access-Control-Allow-Origin'] == 'http://other.example'
+    assert 'Access-Control-Allow-Credentials' not in response.headers
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for streamed JSON listings and their incremental compression
+"""
+
+import gzip
+import json
+import re
+
+from flask import Flask, jsonify
+import pytest
+
+import metrics
+from app import create_app
+from models import db, Team, TeamMemberData
+from response_layer import compress_stream
+from streaming import json_array_chunks, json_object_chunks, stream_response
+
+
+def test_streamed_json_matches_a_buffered_encode():
+    app = Flask(__name__)
+    rows = [(i, f'member {i}') for i in range(2500)]
+
+    def serialize(row):
+        return {'id': row[0], 'name': row[1]}
+
+    with app.app_context():
+        array = ''.join(json_array_chunks(rows, serialize, batch_size=1000))
+        empty = ''.join(json_array_chunks([], serialize))
+        envelope = ''.join(json_object_chunks({'team_id': 3}, 'members', rows, serialize, count_key='count'))
+
+    assert json.loads(array) == [serialize(row) for row in rows]
+    assert json.loads(empty) == []
+    assert json.loads(envelope) == {'team_id': 3, 'members': [serialize(row) for row in rows], 'count': 2500}
+
+
+def test_compressed_stream_flushes_each_chunk():
+    chunks = ['[', '1,2,3', ',4,5', ']']
+    compressed = list(compress_stream(iter(chunks), 'gzip'))
+
+    # One flushed block per input chunk, then the gzip trailer
+    assert len(compressed) == len(chunks) + 1
+    assert gzip.decompress(b''.join(compressed)) == b'[1,2,3,4,5]'
+
+
+def route_sum(name, route):
+    match = re.search(re.escape(f'{name}_sum{{route="{route}"}} ') + r'(\S+)', metrics.render())
+    return float(match.group(1)) if match else 0.0
+
+
+def test_streamed_rows_are_counted_once_the_body_is_sent(tmp_path):
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "stream.db"}'})
+    with app.app_context():
+        db.create_all(bind_key=None)  # db.metadatas keeps the replica bind of earlier apps
+        team = Team(name='Servicing Team', description='Servicing Team')
+        db.session.add(team)
+        db.session.flush()
+        team_id = team.id
+        db.session.add_all([TeamMemberData(team_id=team_id, quarter='Q4', year=2024,
+                                           employee_name=f'Member {i}', employee_code=f'E{i}')
+                            for i in range(1200)])
+        db.session.commit()
+
+    route = '/api/teams/<int:team_id>/members'
+    rows_before = route_sum('db_rows_per_request', route)
+    response = app.test_client().get(f'/api/teams/{team_id}/members?quarter=Q4&year=2024')
+    assert len(response.get_json()['members']) == 1200
+    response.close()
+    # The team lookup plus every member encoded after the view returned
+    assert route_sum('db_rows_per_request', route) - rows_before == 1201
+
+
+def test_stream_errors_before_and_after_the_first_chunk():
+    app = Flask(__name__)
+
+    def rows(fail_at):
+        for i in range(5):
+            if i == fail_at:
+                raise RuntimeError('connection lost')
+            yield i
+
+    @app.route('/rows/<int:fail_at>')
+    def stream_rows(fail_at):
+        try:
+            return stream_response(json_array_chunks(rows(fail_at), int, batch_size=2))
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    client = app.test_client()
+    response = client.get('/rows/0')
+    assert (response.status_code, response.get_json()) == (500, {'error': 'connection lost'})
+
+    # Past the first batch the status is sent; the body must not end cleanly
+    response = client.get('/rows/3', buffered=False)
+    assert response.status_code == 200
+    with pytest.raises(RuntimeError):
+        response.get_data()
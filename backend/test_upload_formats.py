@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Tests for reading uploaded team member files
+"""
+
+import io
+
+from app import create_app
+from models import db, Team, ServicingTeamData
+
+HEADER = ('Asset/Sales Manager,Employee Number,Category,Quarter Incentive Base,Team Leader,'
+          'Main Portfolio,Cash Flow,Cash Flow Target,NCF,NCF Target\n')
+
+
+def test_csv_upload_keeps_leading_zeros_in_codes(tmp_path):
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "upload.db"}', 'METRICS_ENABLED': False})
+    with app.app_context():
+        db.create_all(bind_key=None)
+        team = Team(name='Servicing', description='Servicing Team')
+        db.session.add(team)
+        db.session.commit()
+        team_id = team.id
+
+    body = HEADER + 'Ana Lopez,00123,Analyst,50000,Jane Smith,Portfolio A,100000,120000,50000,60000\n'
+    response = app.test_client().post(f'/api/teams/{team_id}/upload-members', data={
+        'file': (io.BytesIO(body.encode()), 'members.csv')
+    })
+    assert response.status_code == 200, response.get_json()
+
+    with app.app_context():
+        row = ServicingTeamData.query.one()
+        assert (row.employee_number, row.cash_flow) == ('00123', 100000.0)
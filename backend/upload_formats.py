@@ -0,0 +1,78 @@
+"""
+Upload Formats
+==============
+
+Readers turning an uploaded team members file into a pandas DataFrame.
+
+Excel (.xlsx), CSV (.csv) and Parquet (.parquet) files all produce the same
+DataFrame shape, so they go through the same schema validation and ingest.
+CSV is parsed with pyarrow's multithreaded reader when pyarrow is installed;
+Parquet requires pyarrow.
+
+The schema's string columns are read as text rather than inferred, so an
+all-digit employee code such as 00123 keeps its leading zeros.
+"""
+
+import importlib.util
+import os
+
+import pandas as pd
+
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+
+class UnsupportedUploadFormat(ValueError):
+    """Raised when an uploaded file can't be read"""
+
+
+def string_dtypes(schema):
+    """dtype map reading every string column of a team schema as text"""
+    return {header: str for header, _, _ in schema.string_columns}
+
+
+def read_xlsx(file, dtype):
+    return pd.read_excel(file, dtype=dtype)
+
+
+def read_csv(file, dtype):
+    # utf-8-sig strips the BOM Excel adds when saving "CSV UTF-8"
+    if PYARROW_AVAILABLE:
+        # pandas would only cast after pyarrow has inferred the types, so the
+        # string columns are set on pyarrow's own convert options instead
+        from pyarrow import csv, string
+        convert_options = csv.ConvertOptions(
+            column_types={header: string() for header in dtype},
+            strings_can_be_null=True  # Empty cells stay missing, as with pandas
+        )
+        return csv.read_csv(file, convert_options=convert_options).to_pandas()
+    return pd.read_csv(file, encoding='utf-8-sig', dtype=dtype)
+
+
+def read_parquet(file, dtype):
+    if not PYARROW_AVAILABLE:
+        raise UnsupportedUploadFormat('Parquet upload not available. Please install pyarrow.')
+    df = pd.read_parquet(file, engine='pyarrow')
+    # Parquet files carry their own types; bring string columns in line
+    for header in dtype:
+        if header in df.columns:
+            series = df[header]
+            if pd.api.types.is_float_dtype(series) and (series.dropna() % 1 == 0).all():
+                series = series.astype('Int64')  # 123.0 -> 123
+            df[header] = series.astype(object).where(series.isna(), series.astype(str))
+    return df
+
+
+UPLOAD_READERS = {
+    '.xlsx': read_xlsx,
+    '.csv': read_csv,
+    '.parquet': read_parquet
+}
+
+
+def read_upload(file, schema):
+    """Read an uploaded file into a DataFrame based on its extension"""
+    extension = os.path.splitext(file.filename)[1].lower()
+    reader = UPLOAD_READERS.get(extension)
+    if reader is None:
+        raise UnsupportedUploadFormat('Please upload an Excel (.xlsx), CSV (.csv) or Parquet (.parquet) file')
+    return reader(file, string_dtypes(schema))
@@ -0,0 +1,12 @@
+"""
+WSGI entry point for production servers.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Tables are not created here. Create them before serving, either with your
+migrations or by running `python app.py` once.
+"""
+
+from app import create_app
+
+app = create_app()
@@ -10,6 +10,7 @@ import {
   User
 } from 'lucide-react'
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, PieChart, Pie, Cell } from 'recharts'
+import { apiFetch } from '@/lib/api'
 
 interface DashboardData {
   total_employees: number
@@ -42,7 +43,7 @@ const Dashboard: React.FC = () => {
 
   const fetchDashboardData = async () => {
     try {
-      const response = await fetch('http://localhost:5000/api/dashboard')
+      const response = await apiFetch('/api/dashboard')
       const data = await response.json()
       setDashboardData(data)
     } catch (error) {
@@ -4,6 +4,7 @@ import React, { useState, useEffect } from 'react';
 import { Download, Upload, Save, X, Plus, Edit, Trash2 } from 'lucide-react';
 import * as XLSX from 'xlsx';
 import type { JSX } from 'react';
+import { apiFetch } from '@/lib/api';
 
 interface IncentiveParameter {
   id: number;
@@ -40,7 +41,7 @@ const IncentiveParameters: React.FC = () => {
 
   const fetchParameters = async () => {
     try {
-      const response = await fetch('http://localhost:5001/api/incentives');
+      const response = await apiFetch('/api/incentives');
       if (!response.ok) {
         throw new Error('Failed to fetch parameters');
       }
@@ -65,7 +66,7 @@ const IncentiveParameters: React.FC = () => {
         return;
       }
 
-      const response = await fetch('http://localhost:5001/api/incentives', {
+      const response = await apiFetch('/api/incentives', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify(newParameter)
@@ -92,7 +93,7 @@ const IncentiveParameters: React.FC = () => {
         setError(null);
         setSuccess(null);
 
-        const response = await fetch(`http://localhost:5001/api/incentives/${id}`, {
+        const response = await apiFetch(`/api/incentives/${id}`, {
           method: 'DELETE'
         });
 
@@ -2,6 +2,7 @@
 
 import { useState, useEffect } from 'react'
 import { RefreshCw } from 'lucide-react'
+import { apiFetch } from '@/lib/api'
 
 interface TeamData {
   team_id: number;
@@ -55,7 +56,7 @@ export default function PerformanceData({ activeTeam }: PerformanceDataProps) {
 
   const fetchTeams = async () => {
     try {
-      const response = await fetch('http://localhost:5001/api/teams')
+      const response = await apiFetch('/api/teams')
       if (response.ok) {
         const data = await response.json()
         setTeams(data)
@@ -79,8 +80,8 @@ export default function PerformanceData({ activeTeam }: PerformanceDataProps) {
       setLoading(true)
       setError(null)
       
-      const response = await fetch(
-        `http://localhost:5001/api/performance/team/${teamId}?quarter=${selectedQuarter}&year=${selectedYear}`
+      const response = await apiFetch(
+        `/api/performance/team/${teamId}?quarter=${selectedQuarter}&year=${selectedYear}`
       )
       
       if (response.ok) {
@@ -106,8 +107,8 @@ export default function PerformanceData({ activeTeam }: PerformanceDataProps) {
       setRefreshing(true)
       setError(null)
       
-      const response = await fetch(
-        `http://localhost:5001/api/performance/team/${teamId}/refresh?quarter=${selectedQuarter}&year=${selectedYear}`
+      const response = await apiFetch(
+        `/api/performance/team/${teamId}/refresh?quarter=${selectedQuarter}&year=${selectedYear}`
       )
       
       if (response.ok) {
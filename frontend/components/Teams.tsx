@@ -2,6 +2,7 @@
 
 import { useState, useEffect, useRef } from 'react'
 import { Download, Upload } from 'lucide-react'
+import { apiFetch } from '@/lib/api'
 
 interface Team {
   id: number;
@@ -34,7 +35,7 @@ export default function Teams({ activeTeam, setActiveTeam }: TeamsProps) {
 
   const fetchTeams = async () => {
     try {
-      const response = await fetch('http://localhost:5001/api/teams');
+      const response = await apiFetch('/api/teams');
       if (response.ok) {
         const data = await response.json();
         setTeams(data);
@@ -55,7 +56,7 @@ export default function Teams({ activeTeam, setActiveTeam }: TeamsProps) {
     if (!teamId) return;
     
     try {
-      const response = await fetch(`http://localhost:5001/api/teams/${teamId}/uploaded-data`);
+      const response = await apiFetch(`/api/teams/${teamId}/uploaded-data`);
       if (response.ok) {
         const data = await response.json();
         setUploadedData(data.data || []);
@@ -83,7 +84,7 @@ export default function Teams({ activeTeam, setActiveTeam }: TeamsProps) {
       const formData = new FormData();
       formData.append('file', file);
       
-      const response = await fetch(`http://localhost:5001/api/teams/${teamId}/upload-members`, {
+      const response = await apiFetch(`/api/teams/${teamId}/upload-members`, {
         method: 'POST',
         body: formData
       });
@@ -116,7 +117,7 @@ export default function Teams({ activeTeam, setActiveTeam }: TeamsProps) {
       setLoading(true);
       setError(null);
       
-      const response = await fetch(`http://localhost:5001/api/teams/${teamId}/download-template`);
+      const response = await apiFetch(`/api/teams/${teamId}/download-template`);
       
       if (response.ok) {
         const blob = await response.blob();
@@ -0,0 +1,9 @@
+// Base URL of the Flask API (gunicorn or `python app.py`), overridable per environment
+export const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:5001'
+
+// fetch() against the API. The frontend and API are different origins, so
+// credentials: 'include' is needed for the browser to store and send the
+// API's cookies, e.g. the read-your-writes pin to the primary database.
+export function apiFetch(path: string, init: RequestInit = {}): Promise<Response> {
+  return fetch(`${API_BASE_URL}${path}`, { credentials: 'include', ...init })
+}